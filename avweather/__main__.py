@@ -0,0 +1,214 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Aviation Weather
+
+Copyright (C) 2018  Pedro Rodrigues <prodrigues1990@gmail.com>
+
+This file is part of Aviation Weather.
+
+Aviation Weather is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, version 2 of the License.
+
+Aviation Weather is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Aviation Weather.  If not, see <http://www.gnu.org/licenses/>.
+
+Command line METAR and SPECI ingester
+
+Usage: python -m avweather [options] [file ...]
+
+Reads raw reports from files, plain or gzip compressed, or stdin, split as
+in metar.iter_file, and writes one NDJSON object or CSV row per parsed
+report, with the fields of metar.parse_columns.
+"""
+import argparse
+import csv
+import gzip
+import io
+import json
+import sys
+import time
+
+from . import _archive, _columns, instrument, metar
+from .records import ParseFailure
+
+FIELDS = tuple(name for name, _ in _columns.COLUMNS)
+FORMATS = ('ndjson', 'csv')
+
+_GZIP_MAGIC = b'\x1f\x8b'
+
+def _decompressed(source):
+    """Returns source, or a gzip file reading it for gzip input"""
+    if not hasattr(source, 'peek'):
+        source = io.BufferedReader(source)
+    if source.peek(2)[:2] == _GZIP_MAGIC:
+        return gzip.GzipFile(fileobj=source)
+    return source
+
+def reports(paths):
+    """Yields the text of every report in the files at paths, '-' for
+    stdin"""
+    for path in paths:
+        source = sys.stdin.buffer if path == '-' else open(path, 'rb')
+        try:
+            splitter = _archive.Splitter()
+            for line in _decompressed(source):
+                for _, _, text in splitter.line(line, 0, len(line)):
+                    yield text
+            for _, _, text in splitter.flush():
+                yield text
+        finally:
+            if path != '-':
+                source.close()
+
+def _rows(metars, fields):
+    """Returns the list of field values lists of parsed reports, None for
+    missing values"""
+    columns = _columns.build(metars, use_numpy=False)
+    selected = []
+    for field in fields:
+        column = columns[field]
+        if field in ('wind_variable', 'cavok'):
+            column = [bool(value) for value in column]
+        elif not isinstance(column, list):
+            column = [None if value == _columns.MISSING else value
+                      for value in column]
+        selected.append(column)
+    return list(zip(*selected))
+
+def _writer(output, output_format, fields):
+    """Returns a function writing a list of rows to output"""
+    if output_format == 'csv':
+        writer = csv.writer(output, lineterminator='\n')
+        writer.writerow(fields)
+        return writer.writerows
+
+    dumps = json.JSONEncoder(separators=(',', ':')).encode
+    def write(rows):
+        """Writes rows as NDJSON objects"""
+        output.write(''.join(dumps(dict(zip(fields, row))) + '\n'
+                             for row in rows))
+    return write
+
+def _fields(value):
+    """Returns the tuple of fields of a comma separated list"""
+    fields = tuple(field.strip() for field in value.split(',')
+                   if field.strip())
+    unknown = [field for field in fields if field not in FIELDS]
+    if unknown or not fields:
+        raise argparse.ArgumentTypeError(
+            'unknown fields %s, expected some of %s' %
+            (', '.join(unknown) or '(none)', ', '.join(FIELDS)))
+    return fields
+
+def _positive(value):
+    """Returns the positive int of value"""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError('must be a positive integer')
+    return number
+
+def parser():
+    """Returns the command line argument parser"""
+    arguments = argparse.ArgumentParser(
+        prog='avweather',
+        description='Parses METAR and SPECI reports into NDJSON or CSV.')
+    arguments.add_argument(
+        'files', nargs='*', default=['-'],
+        help='report archives, plain or gzip, - or none for stdin')
+    arguments.add_argument('-o', '--output',
+                           help='output file, defaults to stdout')
+    arguments.add_argument('-f', '--format', choices=FORMATS,
+                           default='ndjson')
+    arguments.add_argument(
+        '--fields', type=_fields, default=FIELDS,
+        help='comma separated output fields, of %s' % ', '.join(FIELDS))
+    arguments.add_argument('--engine', choices=metar.ENGINES,
+                           default='regex')
+    arguments.add_argument('--workers', type=_positive,
+                           help='parse in a pool of N processes')
+    arguments.add_argument('--chunksize', type=_positive, default=1000,
+                           help='reports per chunk, default 1000')
+    arguments.add_argument(
+        '--stats', action='store_true',
+        help='print reports per second, failures and per group parser '
+        'timing to stderr')
+    return arguments
+
+def main(argv=None):
+    """Runs the command line ingester, returns the exit status"""
+    args = parser().parse_args(argv)
+    try:
+        return _run(args)
+    except OSError as error:
+        sys.stderr.write('avweather: %s\n' % error)
+        return 1
+
+def _run(args):
+    """Parses the reports of the files of args, returns the exit status"""
+    output = sys.stdout
+    if args.output:
+        output = open(args.output, 'w', newline='')
+    recorder = instrument.Recorder()
+    # per group timing of the parsers running in this process only
+    timing = args.stats and args.workers is None
+
+    count = failures = 0
+    started = time.perf_counter()
+    try:
+        write = _writer(output, args.format, args.fields)
+        with instrument.instrumented(recorder) if timing else _nothing():
+            for results in metar.parse_chunks(
+                    reports(args.files), 'collect', args.engine, args.workers,
+                    args.chunksize):
+                metars = [result for result in results
+                          if not isinstance(result, ParseFailure)]
+                count += len(results)
+                failures += len(results) - len(metars)
+                write(_rows(metars, args.fields))
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    seconds = time.perf_counter() - started
+
+    if args.stats:
+        _print_stats(count, failures, seconds,
+                     recorder.snapshot() if timing else None)
+    return 0
+
+class _nothing(object):
+    """Context manager doing nothing"""
+    # pylint: disable=invalid-name
+
+    def __enter__(self):
+        return None
+
+    def __exit__(self, *exc_info):
+        return False
+
+def _print_stats(count, failures, seconds, groups):
+    """Prints the run statistics to stderr"""
+    write = sys.stderr.write
+    write('reports:  %d\n' % count)
+    write('failures: %d\n' % failures)
+    write('seconds:  %.3f\n' % seconds)
+    write('rate:     %.0f reports/s\n' % (count / seconds if seconds else 0))
+    if groups is None:
+        write('group timing is not recorded with --workers\n')
+        return
+    for name in instrument.GROUPS:
+        stats = groups.get(name)
+        if stats is None or not stats.calls:
+            continue
+        write('%-16s %9d calls %8.0f ns/call %9d matches %7d errors\n' % (
+            name, stats.calls, stats.nanoseconds / stats.calls,
+            stats.matches, stats.errors))
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,119 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Aviation Weather
+
+Copyright (C) 2018  Pedro Rodrigues <prodrigues1990@gmail.com>
+
+This file is part of Aviation Weather.
+
+Aviation Weather is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, version 2 of the License.
+
+Aviation Weather is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Aviation Weather.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import mmap
+import re
+
+# lines that open a new report, a report type or a station and time header
+_REPORT_START = re.compile(
+    br'(?:METAR|SPECI|TAF)\b|[A-Z][A-Z0-9]{3}\s\d{6}Z')
+_TYPES = frozenset((b'METAR', b'SPECI', b'METAR COR', b'SPECI COR', b'TAF',
+                    b'TAF AMD', b'TAF COR'))
+
+class Splitter(object):
+    """Splits lines of text into reports, reports end at '=' terminators,
+    blank lines, or lines opening a new report, reports wrapped across lines
+    are joined by a single space.
+    """
+
+    def __init__(self):
+        self.report = []
+        self.start = self.end = 0
+
+    def line(self, buf, pos, eol):
+        """Returns the list of (start, end, text) for the reports completed by
+        the line buf[pos:eol] of a bytes-like buffer, start and end are the
+        byte offsets of a report in the buffers fed.
+        """
+        done = []
+        report = self.report
+        segment = pos
+        while True:
+            terminator = buf.find(b'=', segment, eol)
+            stop = eol if terminator < 0 else terminator
+            raw = buf[segment:stop]
+            text = raw.strip()
+            if text:
+                if (report and _REPORT_START.match(text) and
+                        not (len(report) == 1 and report[0] in _TYPES)):
+                    done.append(self._complete())
+                    report = self.report
+                first = segment + len(raw) - len(raw.lstrip())
+                if not report:
+                    self.start = first
+                report.append(text)
+                self.end = first + len(text)
+            elif report and terminator < 0 and segment == pos:
+                # blank line
+                done.append(self._complete())
+                report = self.report
+            if terminator < 0:
+                return done
+            if report:
+                done.append(self._complete())
+                report = self.report
+            segment = terminator + 1
+
+    def flush(self):
+        """Returns the list of (start, end, text) for the last report"""
+        return [self._complete()] if self.report else []
+
+    def _complete(self):
+        """Returns the (start, end, text) of the report and starts a new one"""
+        report = self.start, self.end, _join(self.report)
+        self.report = []
+        return report
+
+def reports(buf, pos=0, size=None):
+    """Yields (start, end, text) for every report in a bytes-like buffer,
+    from pos up to size, where start and end are the byte offsets of the
+    report in buf, see Splitter.
+    """
+    splitter = Splitter()
+    if size is None:
+        size = len(buf)
+    find = buf.find
+    while pos < size:
+        eol = find(b'\n', pos, size)
+        if eol < 0:
+            eol = size
+        for report in splitter.line(buf, pos, eol):
+            yield report
+        pos = eol + 1
+    for report in splitter.flush():
+        yield report
+
+def _join(lines):
+    """Returns the text of a report wrapped across lines"""
+    return b' '.join(lines).decode('ascii', 'replace')
+
+def file_reports(path):
+    """Yields (start, end, text) for every report in a text archive file,
+    memory mapped, see reports"""
+    with open(path, 'rb') as archive:
+        try:
+            buf = mmap.mmap(archive.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # empty files can not be mapped
+            return
+        with buf:
+            for report in reports(buf):
+                yield report
@@ -0,0 +1,70 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Aviation Weather
+
+Copyright (C) 2018  Pedro Rodrigues <prodrigues1990@gmail.com>
+
+This file is part of Aviation Weather.
+
+Aviation Weather is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, version 2 of the License.
+
+Aviation Weather is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Aviation Weather.  If not, see <http://www.gnu.org/licenses/>.
+
+Code tables of the coded values held by parsed reports
+
+Coded fields, report types, units, cloud amounts and types, weather
+phenomena and the like, come from small fixed vocabularies, every parsed
+value is replaced by the single string of its code table, so that millions
+of parsed reports share a handful of strings instead of holding a new one
+each. Locations and runway designators are open vocabularies, interned.
+"""
+from sys import intern
+
+TYPES = ('METAR', 'SPECI', 'METAR COR', 'SPECI COR', 'TAF', 'TAF AMD',
+         'TAF COR')
+REPORT_TYPES = ('AUTO', 'NIL', 'CNL')
+WIND_DIRECTIONS = ('VRB', '///')
+WIND_SPEEDS = ('//',)
+WIND_UNITS = ('KT', 'KMH')
+COMPASS = ('N', 'NE', 'E', 'SE', 'S', 'SW', 'W', 'NW')
+RVR_MODIFIERS = ('P', 'M')
+RVR_TENDENCIES = ('U', 'D', 'N')
+INTENSITIES = ('', '+', '-', 'VC')
+PRECIPITATION = (
+    'DZ', 'RA', 'SN', 'SG', 'PL', 'DS', 'SS', 'FZDZ', 'FZRA', 'FZUP', 'SHGR',
+    'SHGS', 'SHRA', 'SHSN', 'TSGR', 'TSGS', 'TSPL', 'TSRA', 'TSSN', 'UP')
+OBSCURATION = (
+    'IC', 'FG', 'BR', 'SA', 'DU', 'HZ', 'FU', 'VA', 'SQ', 'PO', 'FC', 'TS',
+    'BCFG', 'BLDU', 'BLSA', 'BLSN', 'DRDU', 'DRSA', 'DRSN', 'FZFG', 'MIFG',
+    'PRFG')
+OTHER_PHENOMENA = (
+    'FG', 'PO', 'FC', 'DS', 'SS', 'TS', 'SH', 'BLSN', 'BLSA', 'BLDU', 'VA')
+CLOUD_AMOUNTS = ('FEW', 'SCT', 'BKN', 'OVC')
+CLOUD_TYPES = ('CB', 'TCU', '///')
+SKY_CLEAR = ('SKC', 'NSC', 'NCD')
+WINDSHEAR = ('ALL',)
+FORECAST = ('FM', 'BECMG', 'TEMPO', 'PROB', 'TX', 'TN')
+
+_TABLE = dict((value, value) for table in (
+    TYPES, REPORT_TYPES, WIND_DIRECTIONS, WIND_SPEEDS, WIND_UNITS, COMPASS,
+    RVR_MODIFIERS, RVR_TENDENCIES, INTENSITIES, PRECIPITATION, OBSCURATION,
+    OTHER_PHENOMENA, CLOUD_AMOUNTS, CLOUD_TYPES, SKY_CLEAR, WINDSHEAR,
+    FORECAST) for value in table)
+
+def code(value):
+    """Returns the code table string equal to value, value itself when in no
+    code table, or None for None"""
+    return _TABLE.get(value, value)
+
+def name(value):
+    """Returns the interned value, or None for None"""
+    return None if value is None else intern(value)
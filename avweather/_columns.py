@@ -0,0 +1,132 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Aviation Weather
+
+Copyright (C) 2018  Pedro Rodrigues <prodrigues1990@gmail.com>
+
+This file is part of Aviation Weather.
+
+Aviation Weather is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, version 2 of the License.
+
+Aviation Weather is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Aviation Weather.  If not, see <http://www.gnu.org/licenses/>.
+"""
+from array import array
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
+from ._units import ceiling as _ceiling
+
+# value of integer columns for fields missing from a report
+MISSING = -9999
+
+# column name and array typecode, locations and units are lists of strings
+COLUMNS = (
+    ('location', None),
+    ('day', 'h'),
+    ('hour', 'h'),
+    ('minute', 'h'),
+    ('wind_direction', 'h'),
+    ('wind_variable', 'b'),
+    ('wind_speed', 'h'),
+    ('wind_gust', 'h'),
+    ('wind_unit', None),
+    ('cavok', 'b'),
+    ('visibility', 'i'),
+    ('ceiling', 'h'),
+    ('air', 'h'),
+    ('dewpoint', 'h'),
+    ('pressure', 'h'),
+)
+
+def _int(value):
+    """Returns value for ints or MISSING"""
+    return value if isinstance(value, int) else MISSING
+
+def build(metars, use_numpy=None):
+    """Returns a dict of column name to column for an iterable of Metar
+    records, consumed one at a time.
+
+    Integer columns are array.array, or numpy arrays when use_numpy is True,
+    or None and numpy is installed, with MISSING for missing fields.
+    """
+    # pylint: disable=too-many-locals
+    if use_numpy is None:
+        use_numpy = numpy is not None
+    elif use_numpy and numpy is None:
+        raise ImportError('numpy is required for numpy columns')
+
+    columns = dict((name, [] if typecode is None else array(typecode))
+                   for name, typecode in COLUMNS)
+    location = columns['location'].append
+    day = columns['day'].append
+    hour = columns['hour'].append
+    minute = columns['minute'].append
+    wind_direction = columns['wind_direction'].append
+    wind_variable = columns['wind_variable'].append
+    wind_speed = columns['wind_speed'].append
+    wind_gust = columns['wind_gust'].append
+    wind_unit = columns['wind_unit'].append
+    cavok = columns['cavok'].append
+    visibility = columns['visibility'].append
+    ceiling = columns['ceiling'].append
+    air = columns['air'].append
+    dewpoint = columns['dewpoint'].append
+    pressure = columns['pressure'].append
+
+    for metar in metars:
+        location(metar.location)
+        time = metar.time
+        if time is None:
+            day(MISSING)
+            hour(MISSING)
+            minute(MISSING)
+        else:
+            day(time.day)
+            hour(time.hour)
+            minute(time.minute)
+
+        report = metar.report
+        wind = report and report.wind
+        if wind is None:
+            wind_direction(MISSING)
+            wind_variable(0)
+            wind_speed(MISSING)
+            wind_gust(MISSING)
+            wind_unit(None)
+        else:
+            wind_direction(_int(wind.direction))
+            wind_variable(wind.direction == 'VRB')
+            wind_speed(_int(wind.speed))
+            wind_gust(_int(wind.gust))
+            wind_unit(wind.unit)
+
+        sky = report and report.sky
+        cavok(report is not None and sky is None)
+        visibility(sky.visibility.distance if sky else MISSING)
+        ceiling(_int(_ceiling(sky)) if sky else MISSING)
+
+        temperature = report and report.temperature
+        air(temperature.air if temperature else MISSING)
+        dewpoint(temperature.dewpoint if temperature else MISSING)
+        pressure(_int(report and report.pressure))
+
+    if use_numpy:
+        for name, typecode in COLUMNS:
+            if typecode is None:
+                columns[name] = numpy.array(columns[name], dtype=object)
+            else:
+                columns[name] = numpy.frombuffer(columns[name],
+                                                 dtype=typecode)
+    return columns
@@ -19,22 +19,23 @@ GNU General Public License for more details.
 You should have received a copy of the GNU General Public License
 along with Aviation Weather.  If not, see <http://www.gnu.org/licenses/>.
 """
-from collections import namedtuple
-from avweather._parsers import search, occurs
+from avweather._parsers import search, occurs, positional
+from avweather import records
+from avweather._codes import code, name
 
 @search(r"""
-    (?P<type>METAR|SPECI|METAR\sCOR|SPECI\sCOR)
+    (?P<type>METAR\sCOR\b|SPECI\sCOR\b|METAR|SPECI)
 """)
 def ptype(metartype):
     """Returns a string with the METAR type or None"""
-    return metartype['type']
+    return code(metartype['type'])
 
 @search(r"""
     (?P<location>[A-Z][A-Z0-9]{3})
 """)
 def plocation(location):
     """Retuns a string with the METAR location ICAO code or None"""
-    return location['location']
+    return name(location['location'])
 
 @search(r"""
     (?P<time>[0-9]{6})Z
@@ -43,20 +44,19 @@ def ptime(time):
     """Returns a tuple with (day, hour, minute) with the METAR observation
     time or (None, None, None) if time pattern not found
     """
-    tmetar_obs_time = namedtuple('MetarObsTime', 'day hour minute')
     time = time['time']
     day = int(time[:2])
     hour = int(time[2:4])
     minute = int(time[4:])
 
-    return tmetar_obs_time(day, hour, minute)
+    return records.MetarObsTime(day, hour, minute)
 
 @search(r"""
     (?P<reporttype>AUTO|NIL)?
 """)
 def preporttype(reporttype):
     """Retuns a string with the METAR report type or None"""
-    return reporttype['reporttype']
+    return code(reporttype['reporttype'])
 
 @search(r"""
     (?P<direction>[0-9]{2}0|VRB|///)
@@ -73,24 +73,27 @@ def pwind(wind):
     (int, int, int, string, int, int) or (None*6) for any matching wind report
     information.
     """
-    twind = namedtuple('Wind', 'direction speed gust unit variable_from variable_to')
     direction = wind['direction']
     if direction.isnumeric():
         direction = int(direction)
+    else:
+        direction = code(direction)
     speed = wind['speed']
     if speed.isnumeric():
         speed = int(speed)
+    else:
+        speed = code(speed)
     gust = wind['gust']
     if gust and gust.isnumeric():
         gust = int(gust)
-    unit = wind['unit']
+    unit = code(wind['unit'])
     variable_from = wind['variable_from']
     if variable_from and variable_from.isnumeric():
         variable_from = int(variable_from)
     variable_to = wind['variable_to']
     if variable_to and variable_to.isnumeric():
         variable_to = int(variable_to)
-    return twind(
+    return records.Wind(
         direction,
         speed,
         gust,
@@ -112,8 +115,6 @@ def pvis(item):
     (int, bool, int, int) or (None*4) for the visibility information in the
     METAR report.
     """
-    tvisibility = namedtuple('Visibility', 'distance ndv min_distance min_direction')
-
     distance = int(item['distance'])
     if distance == 9999:
         distance += 1
@@ -121,11 +122,11 @@ def pvis(item):
     min_distance = item['min_distance']
     if min_distance is not None:
         min_distance = int(min_distance)
-    return tvisibility(
+    return records.Visibility(
         distance,
         ndv,
         min_distance,
-        item['min_direction'],
+        code(item['min_direction']),
     )
 
 @occurs(10)
@@ -142,45 +143,49 @@ def prvr(rvr):
     of ((int, string, int, string, string),) or () for runway visual range
     information in the METAR report.
     """
-    trvr = namedtuple('Rvr', 'distance modifier variation variation_modifier tendency')
     if None in (rvr['rwy'], rvr['rvr']):
         return None
-    return rvr['rwy'], trvr(
+    return name(rvr['rwy']), records.Rvr(
         int(rvr['rvr']),
-        rvr['rvrmod'],
+        code(rvr['rvrmod']),
         int(rvr['var']) if rvr['var'] is not None else None,
-        rvr['varmod'],
-        rvr['tend'],
+        code(rvr['varmod']),
+        code(rvr['tend']),
     )
 
 @search(r'(?P<intensity>\+|-|VC)?')
 def pintensity(item):
     """Returns a string matching a '-' or '='"""
-    return item['intensity']
+    return code(item['intensity'])
 
-def ppercipitation(string):
+@occurs(10)
+@search(r"""(?P<phenomena>
+    DZ|RA|SN|SG|PL|DS|SS|FZDZ|FZRA|FZUP|SHGR|SHGS|SHRA|SHSN|TSGR|TSGS|TSPL|
+    TSRA|TSSN|UP
+)""")
+def _ppercipitation_phenomena(item):
+    """Returns the percipitation phenomena tuple"""
+    return code(item['phenomena'])
+
+@positional
+def ppercipitation(buf, pos=0):
     """Returns (intensity, (phenomena,)) of (string, (string,)) where phenomena is a
     string for each percipitation reported in the METAR report.
     """
-    tpercipitation = namedtuple('Percipitation', 'intensity phenomena')
-
-    @occurs(10)
-    @search(r"""(?P<phenomena>
-        DZ|RA|SN|SG|PL|DS|SS|FZDZ|FZRA|FZUP|SHGR|SHGS|SHRA|SHSN|TSGR|TSGS|TSPL|
-        TSRA|TSSN|UP
-    )""")
-    def pphenomena(item):
-        """Returns the phenomena tuple"""
-        return item['phenomena']
-
-    intensity, tail = pintensity(string)
+    intensity, pos = pintensity.match(buf, pos)
     if intensity is None:
         intensity = ''
-    phenomena, tail = pphenomena(tail)
+    phenomena, pos = _ppercipitation_phenomena.match(buf, pos)
 
     if not phenomena:
-        return None, tail
-    return tpercipitation(intensity, phenomena), tail
+        return None, pos
+    return records.Percipitation(intensity, phenomena), pos
+
+def _ppercipitation_span(buf, pos=0):
+    """Returns the end of ppercipitation, without decoding it"""
+    return _ppercipitation_phenomena.span(buf, pintensity.span(buf, pos))
+
+ppercipitation.span = _ppercipitation_span
 
 @occurs(10)
 @search(r"""
@@ -193,30 +198,35 @@ def pobscuration(obscuration):
     """Returns (obscuration,) of (string,) for all obscuration phenomena
     report in the METAR report.
     """
-    return obscuration['obscuration']
+    return code(obscuration['obscuration'])
 
-def potherphenomena(string):
+@occurs(10)
+@search(r"""(?P<phenomena>
+    FG|PO|FC|DS|SS|TS|SH|BLSN|BLSA|BLDU|VA
+)""")
+def _potherphenomena_phenomena(item):
+    """Returns the other phenomena tuple"""
+    return code(item['phenomena'])
+
+@positional
+def potherphenomena(buf, pos=0):
     """Returns (intensity, (phenomena,)) of (string, (string,)) where
     phenomena is a string for every other phenomena that is not percipitation
     or obscuration reported in the METAR report.
     """
-    tother_phenomena = namedtuple('OtherPhenomena', 'intensity phenomena')
+    intensity, pos = pintensity.match(buf, pos)
+    phenomena, pos = _potherphenomena_phenomena.match(buf, pos)
 
-    @occurs(10)
-    @search(r"""(?P<phenomena>
-        FG|PO|FC|DS|SS|TS|SH|BLSN|BLSA|BLDU|VA
-    )""")
-    def pphenomena(item):
-        """Returns the phenomena tuple"""
-        return item['phenomena']
+    if not phenomena:
+        return None, pos
 
-    intensity, tail = pintensity(string)
-    phenomena, tail = pphenomena(tail)
+    return records.OtherPhenomena(intensity, phenomena), pos
 
-    if not phenomena:
-        return None, tail
+def _potherphenomena_span(buf, pos=0):
+    """Returns the end of potherphenomena, without decoding it"""
+    return _potherphenomena_phenomena.span(buf, pintensity.span(buf, pos))
 
-    return tother_phenomena(intensity, phenomena), tail
+potherphenomena.span = _potherphenomena_span
 
 @occurs(4)
 @search(r"""
@@ -227,13 +237,12 @@ def potherphenomena(string):
 def pclouds(item):
     """Returns ((amount, height, type),) of ((string, int, string),) for
     clouds or ()"""
-    tcloud = namedtuple('Cloud', 'amount height type')
     height = item['height']
     if height == '///':
         height = -1
     else:
         height = int(height)
-    return tcloud(item['amount'], height, item['type'])
+    return records.Cloud(code(item['amount']), height, code(item['type']))
 
 @search(r"""
     VV(?P<verticalvis>[\d]{3}|///)
@@ -249,49 +258,65 @@ def pverticalvis(item):
 @search(r'(?P<skyclear>SKC|NSC|NCD)')
 def pskyclear(item):
     """Returns 'skyclear' or None"""
-    return item['skyclear']
+    return code(item['skyclear'])
 
-def psky(string):
+@search(r'(?P<cavok>CAVOK)?')
+def pcavok(item):
+    """Returns CAVOK or None"""
+    return item['cavok']
+
+@positional
+def psky(buf, pos=0):
     """Returns (visibility rvr weather clouds) for all the function returns
     above.
     """
-    tsky_conditions = namedtuple(
-        'SkyConditions',
-        'visibility rvr weather clouds verticalvis clear')
-
-    @search(r'(?P<cavok>CAVOK)?')
-    def pcavok(item):
-        """Returns CAVOK or None"""
-        return item['cavok']
-
-    cavok, string = pcavok(string)
+    cavok, pos = pcavok.match(buf, pos)
 
     if cavok is not None:
-        return None, string
+        return None, pos
 
-    visibility, string = pvis(string)
+    visibility, pos = pvis.match(buf, pos)
     if visibility is None:
         raise ValueError('Missing required field visibility in metar %s' %
-                         string)
-
-    rvr, string = prvr(string)
-
-    tweather = namedtuple('Weather', 'precipitation obscuration other')
-    precipitation, string = ppercipitation(string)
-    obscuration, string = pobscuration(string)
-    other, string = potherphenomena(string)
-    current_weather = tweather(precipitation, obscuration, other)
-
-    clouds, string = pclouds(string)
-    verticalvis, string = pverticalvis(string)
-    clear, string = pskyclear(string)
+                         buf[pos:])
+
+    rvr, pos = prvr.match(buf, pos)
+
+    precipitation, pos = ppercipitation.match(buf, pos)
+    obscuration, pos = pobscuration.match(buf, pos)
+    other, pos = potherphenomena.match(buf, pos)
+    current_weather = records.Weather(precipitation, obscuration, other)
+
+    clouds, pos = pclouds.match(buf, pos)
+    verticalvis, pos = pverticalvis.match(buf, pos)
+    clear, pos = pskyclear.match(buf, pos)
+
+    return records.SkyConditions(visibility,
+                                 rvr,
+                                 current_weather,
+                                 clouds,
+                                 verticalvis,
+                                 clear), pos
+
+def _psky_span(buf, pos=0):
+    """Returns the end of psky, without decoding it"""
+    end = pcavok.span(buf, pos)
+    if end != pos:
+        return end
+
+    end = pvis.span(buf, pos)
+    if end == pos:
+        raise ValueError('Missing required field visibility in metar %s' %
+                         buf[pos:])
+    pos = prvr.span(buf, end)
+    pos = ppercipitation.span(buf, pos)
+    pos = pobscuration.span(buf, pos)
+    pos = potherphenomena.span(buf, pos)
+    pos = pclouds.span(buf, pos)
+    pos = pverticalvis.span(buf, pos)
+    return pskyclear.span(buf, pos)
 
-    return tsky_conditions(visibility,
-                           rvr,
-                           current_weather,
-                           clouds,
-                           verticalvis,
-                           clear), string
+psky.span = _psky_span
 
 @search(r"""
     (?P<air_signal>M)?
@@ -302,8 +327,6 @@ def psky(string):
 def ptemperature(item):
     """Returns (air, dewpoint) as (int, int) for air and dewpoint temperatures
     """
-    ttemperature = namedtuple('Temperature', 'air dewpoint')
-
     air = int(item['air'])
     if item['air_signal'] is not None:
         air = 0 - air
@@ -311,71 +334,104 @@ def ptemperature(item):
     if item['dewpoint_signal'] is not None:
         dewpoint = 0 - dewpoint
 
-    return ttemperature(air, dewpoint)
+    return records.Temperature(air, dewpoint)
 
 @search(r'Q(?P<pressure>[\d]{4})')
 def ppressure(item):
     """Returns pressure as int in hectopascals"""
     return int(item['pressure'])
 
-def precentweather(string):
+@search(r'(?P<header>RE)')
+def _precentweather_header(items):
+    """Recent Weather identifier"""
+    return items['header']
+
+@positional
+def precentweather(buf, pos=0):
     """Returns a tuple with percipitation, obscuration, or other phenomena
     reported in recent weather (RE)"""
 
-    @search(r'(?P<header>RE)')
-    def pheader(items):
-        """Recent Weather identifier"""
-        return items['header']
-
-    header, string = pheader(string)
+    header, pos = _precentweather_header.match(buf, pos)
     if header:
         phenomena = []
 
         # not sure if reported phenomena follows this order mandatory
         # there is no indication otherwise, and their only ever referenced
         # in this order; its is unfundamented assumption
-        percipitation, string = ppercipitation(string)
+        percipitation, pos = ppercipitation.match(buf, pos)
         if percipitation:
             phenomena.append(percipitation.phenomena)
 
-        obscuration, string = pobscuration(string)
+        obscuration, pos = pobscuration.match(buf, pos)
         if obscuration:
             phenomena.append(obscuration)
 
-        other, string = potherphenomena(string)
+        other, pos = potherphenomena.match(buf, pos)
         if other:
             phenomena.append(other)
 
-        return tuple(phenomena), string
+        return tuple(phenomena), pos
     else:
-        return (), string
+        return (), pos
+
+def _precentweather_span(buf, pos=0):
+    """Returns the end of precentweather, without decoding it"""
+    end = _precentweather_header.span(buf, pos)
+    if end == pos:
+        return pos
+    pos = ppercipitation.span(buf, end)
+    pos = pobscuration.span(buf, pos)
+    return potherphenomena.span(buf, pos)
+
+precentweather.span = _precentweather_span
+
+@search(r"""
+    (?P<header>WS)
+""")
+def _pwindshear_header(items):
+    """Windshear identifier"""
+    return items['header']
+
+@search(r"""
+    (?P<all>ALL\sRWYS)
+""")
+def _pwindshear_all(items):
+    """Windshear on all runways identifier"""
+    return 'ALL' if items['all'] else None
 
-def pwindshear(string):
+@occurs(10)
+@search(r"""
+    RWY(?P<rwy>[\d]{2}(L|C|R)?)
+""")
+def _pwindshear_rwys(items):
+    """Returns the windshear runways tuple"""
+    return name(items['rwy'])
+
+@positional
+def pwindshear(buf, pos=0):
     """Returns a tuple with all runways reported having windshear or 'ALL'"""
 
-    @search(r"""
-        (?P<header>WS)
-    """)
-    def pheader(items):
-        """Windshear identifier"""
-        return items['header']
-
-    @occurs(10)
-    @search(r"""
-        RWY(?P<rwy>[\d]{2}(L|C|R)?)
-    """)
-    def prwys(items):
-        """Returns the windshear runways tuple"""
-        return items['rwy']
-
-    is_windshear, string = pheader(string)
+    is_windshear, pos = _pwindshear_header.match(buf, pos)
     if not is_windshear:
-        return None, string
+        return None, pos
 
-    if string[1:9] == 'ALL RWYS':
-        return 'ALL', string[9:]
+    windshear_all, pos = _pwindshear_all.match(buf, pos)
+    if windshear_all:
+        return windshear_all, pos
 
-    return prwys(string)
+    return _pwindshear_rwys.match(buf, pos)
+
+def _pwindshear_span(buf, pos=0):
+    """Returns the end of pwindshear, without decoding it"""
+    end = _pwindshear_header.span(buf, pos)
+    if end == pos:
+        return pos
+    pos = _pwindshear_all.span(buf, end)
+    if pos != end:
+        return pos
+    return _pwindshear_rwys.span(buf, pos)
+
+pwindshear.span = _pwindshear_span
 
 @search(r"""
     W(?P<temperature_signal>M)?
@@ -385,28 +441,31 @@ def pwindshear(string):
 def psea(items):
     """Returns a tuple (int, int) for sea temperature and state
     respectively"""
-
-    temperaturetuple = namedtuple('Sea', 'temperature state')
     temperature = int(items['temperature'])
     if items['temperature_signal'] is not None:
         temperature = 0 - temperature
     state = int(items['state'])
-    return temperaturetuple(temperature, state)
+    return records.Sea(temperature, state)
 
-def psupplementary(string):
+@positional
+def psupplementary(buf, pos=0):
     """Returns the supplementary information tuple"""
 
-    supplementarytuple = namedtuple(
-        'SupplementaryInfo',
-        'recent_weather windshear sea rwy_state')
-
-    recent_weather, string = precentweather(string)
-    windshear, string = pwindshear(string)
-    sea, string = psea(string)
+    recent_weather, pos = precentweather.match(buf, pos)
+    windshear, pos = pwindshear.match(buf, pos)
+    sea, pos = psea.match(buf, pos)
     rwy_state = None # Not implemented
     return (
-        supplementarytuple(recent_weather,
-                           windshear,
-                           sea,
-                           rwy_state),
-        string)
+        records.SupplementaryInfo(recent_weather,
+                                  windshear,
+                                  sea,
+                                  rwy_state),
+        pos)
+
+def _psupplementary_span(buf, pos=0):
+    """Returns the end of psupplementary, without decoding it"""
+    pos = precentweather.span(buf, pos)
+    pos = pwindshear.span(buf, pos)
+    return psea.span(buf, pos)
+
+psupplementary.span = _psupplementary_span
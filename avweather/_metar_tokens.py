@@ -0,0 +1,430 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Aviation Weather
+
+Copyright (C) 2018  Pedro Rodrigues <prodrigues1990@gmail.com>
+
+This file is part of Aviation Weather.
+
+Aviation Weather is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, version 2 of the License.
+
+Aviation Weather is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Aviation Weather.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import re
+
+from avweather import _metar_parsers as _p
+from avweather._codes import code, name
+from avweather.records import (
+    Cloud, Metar, MetarObsTime, Report, SkyConditions, SupplementaryInfo,
+    Temperature, Visibility, Weather, Wind)
+
+# Stages of the regex pipeline in metar.parse, in the order it tries them. A
+# report is decoded token by token only while every token is the exact, whole
+# token form of the group the regex pipeline would match at that point,
+# anything else declines and the regex pipeline decodes the report instead.
+WIND = 4
+CAVOK = 5
+VIS = 6
+RVR = 7
+WEATHER = 8
+CLOUDS = 9
+VERTICALVIS = 10
+SKYCLEAR = 11
+TEMPERATURE = 12
+PRESSURE = 13
+RECENTWEATHER = 14
+WINDSHEAR = 15
+SEA = 16
+END = 17
+
+# tokens no group parser matches, the report is left unmatched from there
+TERMINATORS = frozenset(('NOSIG', 'RMK', 'TEMPO', 'BECMG'))
+
+_NONASCII = re.compile(r'[^\x00-\x7f]')
+
+_DIRECTIONS = frozenset(('NE', 'SE', 'SW', 'NW', 'N', 'E', 'S', 'W'))
+_AMOUNTS = frozenset(('FEW', 'SCT', 'BKN', 'OVC'))
+_CLOUDTYPES = frozenset(('', 'CB', 'TCU', '///'))
+_SKYCLEAR = frozenset(('SKC', 'NSC', 'NCD'))
+_WEATHER = frozenset((
+    'DZ', 'RA', 'SN', 'SG', 'PL', 'DS', 'SS', 'FZ', 'SH', 'TS', 'UP', 'IC',
+    'FG', 'BR', 'SA', 'DU', 'HZ', 'FU', 'VA', 'SQ', 'PO', 'FC', 'BC', 'BL',
+    'DR', 'MI', 'PR', 'VC'))
+
+def _twodigits(string):
+    """Returns the int for a 'M'-signed two digits temperature, or None"""
+    if len(string) == 3 and string[0] == 'M' and string[1:].isdigit():
+        return 0 - int(string[1:])
+    if len(string) == 2 and string.isdigit():
+        return int(string)
+    return None
+
+def dwind(token):
+    """Returns a Wind for an exact wind token or None"""
+    if token.endswith('KT'):
+        unit = 'KT'
+        body = token[:-2]
+    elif token.endswith('KMH'):
+        unit = 'KMH'
+        body = token[:-3]
+    else:
+        return None
+
+    direction = body[:3]
+    if direction.isdigit() and direction[2] == '0':
+        direction = int(direction)
+    elif direction in ('VRB', '///'):
+        direction = code(direction)
+    else:
+        return None
+
+    speed, separator, gust = body[3:].partition('G')
+    if speed[:1] == 'P':
+        speed = speed[1:]
+    if speed.isdigit() and len(speed) in (2, 3):
+        speed = int(speed)
+    elif speed == '//':
+        speed = code(speed)
+    else:
+        return None
+
+    if separator:
+        if gust[:1] == 'P':
+            gust = gust[1:]
+        if not (gust.isdigit() and len(gust) in (2, 3)):
+            return None
+        gust = int(gust)
+    else:
+        gust = None
+
+    return Wind(direction, speed, gust, unit, None, None)
+
+def _dvariable(token):
+    """Returns (variable_from, variable_to) for an exact variable wind
+    direction token or None"""
+    if (len(token) == 7 and token[3] == 'V' and token[2] == token[6] == '0'
+            and token[:3].isdigit() and token[4:].isdigit()):
+        return int(token[:3]), int(token[4:])
+    return None
+
+def dcavok(token):
+    """Returns True for CAVOK or None"""
+    return True if token == 'CAVOK' else None
+
+def dvis(token):
+    """Returns a Visibility for an exact prevailing visibility token or None
+    """
+    distance = token[:4]
+    ndv = token[4:]
+    if not (distance.isdigit() and len(distance) == 4):
+        return None
+    if ndv not in ('', 'NDV'):
+        return None
+    distance = int(distance)
+    if distance == 9999:
+        distance += 1
+    return Visibility(distance, ndv == 'NDV', None, None)
+
+def _dminvis(token):
+    """True for an exact minimum visibility token"""
+    return (len(token) > 4 and token[:4].isdigit() and
+            token[4:] in _DIRECTIONS)
+
+def drvr(token):
+    """Returns the RVR parser for a RVR token or None"""
+    if len(token) > 1 and token[1].isdigit():
+        return _p.prvr
+    return None
+
+def dweather(token):
+    """Returns True for a present weather token or None"""
+    if token[0] in '+-' or token[:2] in _WEATHER:
+        return True
+    return None
+
+def dcloud(token):
+    """Returns a Cloud for an exact cloud token or None"""
+    amount = token[:3]
+    height = token[3:6]
+    cloudtype = token[6:]
+    if amount not in _AMOUNTS or cloudtype not in _CLOUDTYPES:
+        return None
+    if height == '///':
+        height = -1
+    elif height.isdigit() and len(height) == 3:
+        height = int(height)
+    else:
+        return None
+    return Cloud(code(amount), height, code(cloudtype) or None)
+
+def dverticalvis(token):
+    """Returns the vertical visibility for an exact VV token or None"""
+    if len(token) != 5 or token[:2] != 'VV':
+        return None
+    if token[2:] == '///':
+        return -1
+    if token[2:].isdigit():
+        return int(token[2:])
+    return None
+
+def dskyclear(token):
+    """Returns the sky clear code or None"""
+    return code(token) if token in _SKYCLEAR else None
+
+def dtemperature(token):
+    """Returns a Temperature for an exact temperature token or None"""
+    air, separator, dewpoint = token.partition('/')
+    if not separator:
+        return None
+    air = _twodigits(air)
+    dewpoint = _twodigits(dewpoint)
+    if air is None or dewpoint is None:
+        return None
+    return Temperature(air, dewpoint)
+
+def dpressure(token):
+    """Returns the pressure for an exact QNH token or None"""
+    if len(token) == 5 and token[1:].isdigit():
+        return int(token[1:])
+    return None
+
+def drecentweather(token):
+    """Returns the recent weather parser for a RE token or None"""
+    return _p.precentweather if token[:2] == 'RE' else None
+
+def dwindshear(token):
+    """Returns the windshear parser for a WS token or None"""
+    return _p.pwindshear if token == 'WS' else None
+
+def dsea(token):
+    """Returns the sea parser for a sea token or None"""
+    if len(token) > 1 and (token[1] == 'M' or token[1].isdigit()):
+        return _p.psea
+    return None
+
+def _table(*entries):
+    """Builds the first character dispatch table"""
+    table = {}
+    for characters, candidates in entries:
+        for character in characters:
+            table[character] = table.get(character, ()) + candidates
+    return table
+
+# first character of a token to the (stage, decoder) candidates, in order
+DISPATCH = _table(
+    ('0123456789', ((VIS, dvis), (WIND, dwind), (TEMPERATURE, dtemperature))),
+    ('/', ((WIND, dwind),)),
+    ('V', ((WIND, dwind), (VERTICALVIS, dverticalvis),
+           (WEATHER, dweather))),
+    ('C', ((CAVOK, dcavok),)),
+    ('R', ((RVR, drvr), (RECENTWEATHER, drecentweather),
+           (WEATHER, dweather))),
+    ('FSBO', ((CLOUDS, dcloud),)),
+    ('SN', ((SKYCLEAR, dskyclear),)),
+    ('+-DSFTUIBHPM', ((WEATHER, dweather),)),
+    ('M', ((TEMPERATURE, dtemperature),)),
+    ('Q', ((PRESSURE, dpressure),)),
+    ('W', ((WINDSHEAR, dwindshear), (SEA, dsea))),
+)
+
+def _resync(tokens, i, start, pos):
+    """Returns the (index, offset) of the first token after pos, counting from
+    token i at offset start, or (None, None) when pos falls within a token
+    """
+    count = len(tokens)
+    while start < pos and i < count:
+        start += len(tokens[i]) + 1
+        i += 1
+    if start != pos + 1:
+        return None, None
+    return i, start
+
+def parse(string):
+    """Returns the Metar for a stripped and upper cased METAR or SPECI text
+    report, or None when the report must be decoded by the regex pipeline.
+    """
+    # pylint: disable=too-many-locals,too-many-branches,too-many-statements
+    # pylint: disable=too-many-return-statements
+    tokens = string.split()
+    count = len(tokens)
+    if count < 3 or tokens[0] not in ('METAR', 'SPECI'):
+        return None
+    # single spaced ASCII reports only, token offsets are then implied
+    if ' '.join(tokens) != string or _NONASCII.search(string):
+        return None
+
+    # offset of tokens[i], the last consumed token ends right before it
+    metartype = code(tokens[0])
+    i = 1
+    start = 6
+    if tokens[1] == 'COR':
+        metartype = code(metartype + ' COR')
+        i = 2
+        start = 10
+    if count < i + 2:
+        return None
+
+    location, time = tokens[i], tokens[i + 1]
+    if not (len(location) == 4 and location.isalnum() and
+            location[0].isalpha()):
+        return None
+    if not (len(time) == 7 and time[6] == 'Z' and time[:6].isdigit()):
+        return None
+    location = name(location)
+    time = MetarObsTime(int(time[:2]), int(time[2:4]), int(time[4:6]))
+
+    i += 2
+    start += 13
+    reporttype = tokens[i] if count > i else None
+    if reporttype in ('AUTO', 'NIL'):
+        reporttype = code(reporttype)
+        i += 1
+        start += len(reporttype) + 1
+    elif reporttype is not None and reporttype.startswith(('AUTO', 'NIL')):
+        return None
+    else:
+        reporttype = None
+
+    if reporttype == 'NIL':
+        return Metar(metartype, location, time, reporttype, None,
+                     string[start - 1:])
+
+    wind = visibility = verticalvis = skyclear = None
+    temperature = pressure = sea = windshear = None
+    precipitation = other = None
+    rvr = obscuration = recent_weather = ()
+    clouds = []
+    cavok = False
+    stage = WIND
+
+    while i < count:
+        token = tokens[i]
+        for kind, decoder in DISPATCH.get(token[0], ()):
+            value = decoder(token)
+            if value is not None:
+                break
+        else:
+            if stage > VIS and token in TERMINATORS:
+                break
+            return None
+
+        # groups must come in order, and after visibility, or CAVOK
+        if kind < stage or (kind > VIS and stage <= VIS):
+            return None
+
+        if kind == CLOUDS:
+            if len(clouds) == 4:
+                return None
+            clouds.append(value)
+            stage = CLOUDS
+        elif kind == TEMPERATURE:
+            temperature = value
+            stage = PRESSURE
+        elif kind == PRESSURE:
+            pressure = value
+            stage = RECENTWEATHER
+        elif kind == VIS:
+            following = tokens[i + 1] if i + 1 < count else ''
+            if _dminvis(following):
+                value, pos = _p.pvis.match(string, start)
+                i, start = _resync(tokens, i, start, pos)
+                if value is None or i is None:
+                    return None
+                visibility = value
+                stage = RVR
+                continue
+            visibility = value
+            stage = RVR
+        elif kind == WIND:
+            following = tokens[i + 1] if i + 1 < count else ''
+            variable = _dvariable(following)
+            if variable is not None:
+                wind = Wind(*(value[:4] + variable))
+                stage = CAVOK
+                start += len(token) + len(following) + 2
+                i += 2
+                continue
+            if following[:1].isdigit() and 'V' in following:
+                value, pos = _p.pwind.match(string, start)
+                i, start = _resync(tokens, i, start, pos)
+                if value is None or i is None:
+                    return None
+                wind = value
+                stage = CAVOK
+                continue
+            wind = value
+            stage = CAVOK
+        elif kind == CAVOK:
+            cavok = True
+            stage = TEMPERATURE
+        elif kind == VERTICALVIS:
+            verticalvis = value
+            stage = SKYCLEAR
+        elif kind == SKYCLEAR:
+            skyclear = value
+            stage = TEMPERATURE
+        elif kind == WEATHER:
+            precipitation, pos = _p.ppercipitation.match(string, start)
+            obscuration, pos = _p.pobscuration.match(string, pos)
+            other, pos = _p.potherphenomena.match(string, pos)
+            if pos == start:
+                return None
+            i, start = _resync(tokens, i, start, pos)
+            if i is None:
+                return None
+            stage = CLOUDS
+            continue
+        else:
+            # RVR, RE, WS and sea groups, decoded by their regex parsers
+            value, pos = value.match(string, start)
+            if pos == start:
+                return None
+            i, start = _resync(tokens, i, start, pos)
+            if i is None:
+                return None
+            if kind == RVR:
+                rvr = value
+                stage = WEATHER
+            elif kind == RECENTWEATHER:
+                recent_weather = value
+                stage = WINDSHEAR
+            elif kind == WINDSHEAR:
+                windshear = value
+                stage = SEA
+            else:
+                sea = value
+                stage = END
+            continue
+        start += len(token) + 1
+        i += 1
+
+    if stage <= VIS:
+        return None
+
+    sky = None
+    if not cavok:
+        sky = SkyConditions(
+            visibility,
+            rvr,
+            Weather(precipitation, obscuration, other),
+            tuple(clouds),
+            verticalvis,
+            skyclear)
+    report = Report(
+        wind,
+        sky,
+        temperature,
+        pressure,
+        SupplementaryInfo(recent_weather, windshear, sea, None),
+        None)
+    return Metar(metartype, location, time, reporttype, report,
+                 string[start - 1:])
@@ -19,10 +19,38 @@ GNU General Public License for more details.
 You should have received a copy of the GNU General Public License
 along with Aviation Weather.  If not, see <http://www.gnu.org/licenses/>.
 """
+import functools
 import re
 
+def positional(match_func):
+    """Gives a position based ``match_func(buf, pos) -> (item, pos)`` the
+    string based ``func(tail) -> (item, tail)`` interface, the former remains
+    available as the ``match`` attribute of the returned function
+    >>> @positional
+    ... def getletter(buf, pos=0):
+    ...     return buf[pos], pos + 1
+    ...
+    >>> getletter('ABC')
+    ('A', 'BC')
+    >>> getletter.match('ABC', 1)
+    ('B', 2)
+    """
+    @functools.wraps(match_func)
+    def func_wrapper(tail):
+        """Returns the decorated string wrapper"""
+        item, pos = match_func(tail, 0)
+        if pos == 0:
+            return item, tail
+        return item, tail[pos:].rstrip()
+
+    func_wrapper.match = match_func
+    return func_wrapper
+
 def search(regex):
     """Searches a given regex parameterized query into a dict
+
+    The pattern is compiled once, when decorating, and matched in place at a
+    given position, leading whitespace is skipped.
     >>> @search('(?P<letter>[A-Z])?')
     ... def getletter(string):
     ...     return string['letter']
@@ -31,20 +59,38 @@ def search(regex):
     ('A', 'BC')
     >>> getletter('0BC')
     (None, '0BC')
+    >>> getletter.match('0BC', 1)
+    ('B', 2)
+    >>> getletter.span('0BC', 1)
+    2
     """
+    pattern = re.compile(r'\s*(?:' + regex + '\n)', re.I | re.X)
+
     def decorator(parse_func):
         """Returns the search decorator"""
 
-        def func_wrapper(tail):
-            """Returns the decorated search wrapper"""
-            match = re.search('^' + regex, tail.strip(), re.I | re.X)
-            if match is None:
-                return None, tail
-            item = parse_func(match.groupdict())
-            if item is not None:
-                tail = tail.strip()[match.end():]
-            return item, tail
+        @functools.wraps(parse_func)
+        def match(buf, pos=0):
+            """Returns the decorated search match"""
+            found = pattern.match(buf, pos)
+            if found is None:
+                return None, pos
+            item = parse_func(found.groupdict())
+            if item is None:
+                return None, pos
+            return item, found.end()
 
+        def span(buf, pos=0):
+            """Returns the end of the decorated match, without decoding it,
+            or pos when parse_func would return None, that is when none of
+            the pattern groups matched"""
+            found = pattern.match(buf, pos)
+            if found is None or found.lastindex is None:
+                return pos
+            return found.end()
+
+        func_wrapper = positional(match)
+        func_wrapper.span = span
         return func_wrapper
     return decorator
 
@@ -52,7 +98,7 @@ def occurs(times):
     """Searches a given regex parameterized query into a tuple of dicts for
     every match
     >>> @occurs(2)
-    >>> @search('(?P<letter>[A-Z])?')
+    ... @search('(?P<letter>[A-Z])?')
     ... def get2letters(string):
     ...     return string['letter']
     ...
@@ -66,16 +112,33 @@ def occurs(times):
         raise ValueError('times must be a positive integer.')
     def decorator(search_func):
         """Returns the occurs decorator"""
-        def func_wrapper(tail):
-            """Returns the decorated occurs wrapper"""
+        search_match = search_func.match
+
+        @functools.wraps(search_match)
+        def match(buf, pos=0):
+            """Returns the decorated occurs match"""
             items = []
-            item, tail = search_func(tail)
+            item, pos = search_match(buf, pos)
             while item is not None:
                 items.append(item)
                 if len(items) == times:
                     break
-                item, tail = search_func(tail)
-            return tuple(items), tail
+                item, pos = search_match(buf, pos)
+            return tuple(items), pos
+
+        search_span = search_func.span
+
+        def span(buf, pos=0):
+            """Returns the end of the decorated occurs match, without
+            decoding it"""
+            for _ in range(times):
+                end = search_span(buf, pos)
+                if end == pos:
+                    break
+                pos = end
+            return pos
 
+        func_wrapper = positional(match)
+        func_wrapper.span = span
         return func_wrapper
     return decorator
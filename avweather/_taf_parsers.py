@@ -0,0 +1,139 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Aviation Weather
+
+Copyright (C) 2018  Pedro Rodrigues <prodrigues1990@gmail.com>
+
+This file is part of Aviation Weather.
+
+Aviation Weather is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, version 2 of the License.
+
+Aviation Weather is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Aviation Weather.  If not, see <http://www.gnu.org/licenses/>.
+"""
+from avweather._parsers import search, occurs, positional
+from avweather import _metar_parsers as _p
+from avweather import records
+from avweather._codes import code
+
+@search(r"""
+    (?P<type>TAF\sAMD\b|TAF\sCOR\b|TAF)
+""")
+def ptaftype(taftype):
+    """Returns a string with the TAF type or None"""
+    return code(taftype['type'])
+
+@search(r"""
+    (?P<from_day>[0-9]{2})(?P<from_hour>[0-9]{2})
+    /(?P<to_day>[0-9]{2})(?P<to_hour>[0-9]{2})
+""")
+def pperiod(period):
+    """Returns the (start, end) Period of times of a validity period"""
+    return records.Period(
+        records.MetarObsTime(int(period['from_day']),
+                             int(period['from_hour']), 0),
+        records.MetarObsTime(int(period['to_day']), int(period['to_hour']),
+                             0))
+
+@search(r'(?P<cancelled>CNL)')
+def pcancelled(item):
+    """Returns 'CNL' for a cancelled TAF or None"""
+    return code(item['cancelled'])
+
+@search(r'(?P<nsw>NSW)')
+def pnsw(item):
+    """Returns 'NSW', no significant weather, or None"""
+    return item['nsw']
+
+@occurs(4)
+@search(r"""
+    (?P<kind>TX|TN)
+    (?P<signal>M)?(?P<air>[\d]{2})/
+    (?P<day>[\d]{2})(?P<hour>[\d]{2})Z
+""")
+def ptemperatures(item):
+    """Returns ((kind, air, time),) of ((string, int, MetarObsTime),) for
+    forecast maximum and minimum temperatures"""
+    air = int(item['air'])
+    if item['signal'] is not None:
+        air = 0 - air
+    return records.ForecastTemperature(
+        code(item['kind']), air,
+        records.MetarObsTime(int(item['day']), int(item['hour']), 0))
+
+@positional
+def pforecast(buf, pos=0):
+    """Returns the Forecast of the base forecast or of a change group, any of
+    its groups may be missing"""
+    wind, pos = _p.pwind.match(buf, pos)
+    cavok, pos = _p.pcavok.match(buf, pos)
+    visibility, pos = _p.pvis.match(buf, pos)
+
+    precipitation, pos = _p.ppercipitation.match(buf, pos)
+    obscuration, pos = _p.pobscuration.match(buf, pos)
+    other, pos = _p.potherphenomena.match(buf, pos)
+    weather = None
+    if precipitation or obscuration or other:
+        weather = records.Weather(precipitation, obscuration, other)
+    nsw, pos = pnsw.match(buf, pos)
+
+    clouds, pos = _p.pclouds.match(buf, pos)
+    verticalvis, pos = _p.pverticalvis.match(buf, pos)
+    clear, pos = _p.pskyclear.match(buf, pos)
+    temperatures, pos = ptemperatures.match(buf, pos)
+
+    return records.Forecast(wind,
+                            cavok is not None,
+                            visibility,
+                            weather,
+                            nsw is not None,
+                            clouds,
+                            verticalvis,
+                            clear,
+                            temperatures), pos
+
+@search(r"""
+    FM(?P<day>[0-9]{2})(?P<hour>[0-9]{2})(?P<minute>[0-9]{2})
+""")
+def _pchange_from(item):
+    """Returns the start time of a FM change group"""
+    return records.MetarObsTime(int(item['day']), int(item['hour']),
+                                int(item['minute']))
+
+@search(r'PROB(?P<probability>[0-9]{2})')
+def _pchange_probability(item):
+    """Returns the probability of a PROB change group"""
+    return int(item['probability'])
+
+@search(r'(?P<kind>BECMG|TEMPO)')
+def _pchange_kind(item):
+    """Returns the kind of a BECMG or TEMPO change group"""
+    return code(item['kind'])
+
+@positional
+def pchange(buf, pos=0):
+    """Returns the (kind, probability, period, forecast) TafChange of a FM,
+    BECMG, TEMPO or PROB change group, a FM period has no end.
+    """
+    start, end = _pchange_from.match(buf, pos)
+    if start is not None:
+        forecast, end = pforecast.match(buf, end)
+        return records.TafChange('FM', None, records.Period(start, None),
+                                 forecast), end
+
+    probability, end = _pchange_probability.match(buf, pos)
+    kind, end = _pchange_kind.match(buf, end)
+    if probability is None and kind is None:
+        return None, pos
+    period, end = pperiod.match(buf, end)
+    forecast, end = pforecast.match(buf, end)
+    return records.TafChange(kind or 'PROB', probability, period,
+                             forecast), end
@@ -0,0 +1,48 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Aviation Weather
+
+Copyright (C) 2018  Pedro Rodrigues <prodrigues1990@gmail.com>
+
+This file is part of Aviation Weather.
+
+Aviation Weather is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, version 2 of the License.
+
+Aviation Weather is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Aviation Weather.  If not, see <http://www.gnu.org/licenses/>.
+
+Quantities shared by the columns and the values derived from reports, in
+the units reports are decoded in.
+"""
+# visibility reported with CAVOK, in metres
+CAVOK_VISIBILITY = 10000
+
+KMH_PER_KT = 1.852
+
+def knots(speed, unit):
+    """Returns a wind speed in knots, not rounded, or None"""
+    if not isinstance(speed, int):
+        return None
+    if unit == 'KMH':
+        return speed / KMH_PER_KT
+    return speed
+
+def ceiling(sky):
+    """Returns the lowest broken or overcast layer or vertical visibility,
+    in hundreds of feet, or None"""
+    lowest = None
+    if sky.verticalvis is not None and sky.verticalvis >= 0:
+        lowest = sky.verticalvis
+    for cloud in sky.clouds:
+        if (cloud.amount in ('BKN', 'OVC') and cloud.height >= 0 and
+                (lowest is None or cloud.height < lowest)):
+            lowest = cloud.height
+    return lowest
@@ -0,0 +1,115 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Aviation Weather
+
+Copyright (C) 2018  Pedro Rodrigues <prodrigues1990@gmail.com>
+
+This file is part of Aviation Weather.
+
+Aviation Weather is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, version 2 of the License.
+
+Aviation Weather is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Aviation Weather.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import asyncio
+from functools import partial
+
+from . import _archive
+from . import taf
+from .metar import _check_errors, _iparse, _parser
+
+# marks the end of the reports queue
+_EOF = object()
+
+async def parse_stream(source, errors='raise', engine='regex', maxsize=1024,
+                       executor=None, batch_size=256):
+    """Yields parsed reports read from an asyncio.StreamReader, or any async
+    iterable of bytes or str lines.
+
+    Reports are split as in metar.iter_file and handed over through a queue
+    of at most maxsize reports, the source is not read further while it is
+    full. Reports are parsed in batches of up to batch_size, in the executor
+    when given, or inline. errors and engine as in metar.parse_many.
+    """
+    # pylint: disable=too-many-arguments
+    _check_errors(errors)
+    async for result in _stream(source, errors, _parser(engine, errors),
+                                maxsize, executor, batch_size):
+        yield result
+
+async def parse_taf_stream(source, errors='raise', maxsize=1024,
+                           executor=None, batch_size=256):
+    """Yields parsed TAF reports read from source, as parse_stream does for
+    METAR reports, errors as in taf.parse_many"""
+    _check_errors(errors, taf.ERRORS)
+    # reports are stripped and upper cased by _iparse already
+    parser = partial(taf.parse, upper=False)
+    async for result in _stream(source, errors, parser, maxsize, executor,
+                                batch_size):
+        yield result
+
+async def _stream(source, errors, parser, maxsize, executor, batch_size):
+    """Yields the results of parser for the reports read from source, see
+    parse_stream"""
+    # pylint: disable=too-many-arguments
+    loop = asyncio.get_event_loop()
+    queue = asyncio.Queue(maxsize)
+    producer = asyncio.ensure_future(_produce(source, queue))
+    index = 0
+    try:
+        while True:
+            text = await queue.get()
+            if text is _EOF:
+                break
+            batch = [text]
+            while len(batch) < batch_size and not queue.empty():
+                text = queue.get_nowait()
+                if text is _EOF:
+                    queue.put_nowait(_EOF)
+                    break
+                batch.append(text)
+
+            if executor is None:
+                results = list(_iparse(batch, errors, parser, index))
+            else:
+                results = await loop.run_in_executor(
+                    executor, _parse_batch, batch, errors, parser, index)
+            index += len(batch)
+            for result in results:
+                yield result
+        # raises any error reading the source
+        await producer
+    finally:
+        producer.cancel()
+
+def _parse_batch(batch, errors, parser, start):
+    """Returns the list of parse results of a batch, in an executor"""
+    return list(_iparse(batch, errors, parser, start))
+
+async def _produce(source, queue):
+    """Puts the reports read from source in queue, followed by _EOF"""
+    splitter = _archive.Splitter()
+    cancelled = False
+    try:
+        async for line in source:
+            if isinstance(line, str):
+                line = line.encode('ascii', 'replace')
+            for _, _, text in splitter.line(line, 0, len(line)):
+                await queue.put(text)
+        for _, _, text in splitter.flush():
+            await queue.put(text)
+    except asyncio.CancelledError:
+        cancelled = True
+        raise
+    finally:
+        # wakes the consumer up, which then awaits this task for errors
+        if not cancelled:
+            await queue.put(_EOF)
@@ -0,0 +1,467 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Aviation Weather
+
+Copyright (C) 2018  Pedro Rodrigues <prodrigues1990@gmail.com>
+
+This file is part of Aviation Weather.
+
+Aviation Weather is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, version 2 of the License.
+
+Aviation Weather is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Aviation Weather.  If not, see <http://www.gnu.org/licenses/>.
+
+Compact binary files of parsed reports
+
+    >>> import os, tempfile
+    >>> from avweather import binary, metar
+    >>> path = os.path.join(tempfile.mkdtemp(), 'reports.bin')
+    >>> count = binary.dump([metar.parse('METAR LPPT 011200Z NIL')], path)
+    >>> with binary.Reader(path) as reader:
+    ...     reader[0].location
+    'LPPT'
+
+Version 1 layout, little endian:
+
+    header   FILE, magic, version, record and item sizes, record, item and
+             code counts, section offsets
+    records  RECORD, fixed width, one per report in written order
+    items    ITEM, fixed width, RVR (two items each), weather, cloud,
+             recent weather and windshear entries of the records, in this
+             order, each record keeps its first item and the count of each
+    codes    code table, an unsigned short length and UTF-8 text per code
+    texts    UTF-8 unmatched text of the records, by offset and length,
+             records with the same unmatched text share it
+
+Short strings, types, locations, units, phenomena and so on, are stored as
+an index in the code table, 0 for None. Integers are signed shorts, NONE for
+None. Wind direction and speed, an int or a string, take both.
+"""
+from itertools import islice
+import mmap
+import struct
+
+from .records import (
+    Cloud, Metar, MetarObsTime, OtherPhenomena, Percipitation, Report, Rvr,
+    Sea, SkyConditions, SupplementaryInfo, Temperature, Visibility, Weather,
+    Wind)
+
+MAGIC = b'AVWB'
+VERSION = 1
+
+FILE = struct.Struct('<4sHHHHIIIQQQ')
+RECORD = struct.Struct('<HHHbbbHIHhHhHhHhhhhHhHHHhhhHhhIBBBBBBB')
+ITEM = struct.Struct('<BHhH')
+
+# value of signed short fields for None
+NONE = -0x8000
+
+# records are decoded with the tuple constructor, skipping the argument
+# handling of the namedtuple constructors
+_new = tuple.__new__
+
+# record flags
+_TIME = 0x1
+_REPORT = 0x2
+_WIND = 0x4
+_SKY = 0x8
+_NDV = 0x10
+_PRECIPITATION = 0x20
+_OTHER = 0x40
+_TEMPERATURE = 0x80
+_SEA = 0x100
+_WINDSHEAR_RUNWAYS = 0x200
+
+# item tag of recent weather other phenomena, or'ed with the group index
+# shifted left by one
+_RECENT_OTHER = 0x1
+
+# RECORD fields, from wind direction to sea state, of a report missing them
+_DEFAULTS = (
+    NONE, 0, NONE, 0, NONE, 0, NONE, NONE,
+    NONE, NONE, 0, NONE, 0, 0, 0,
+    NONE, NONE, NONE, 0, NONE, NONE,
+)
+
+def _int(value):
+    """Returns the signed short field of an int or None"""
+    return NONE if value is None else value
+
+def _mixed(value, code):
+    """Returns the (int, code) fields of an int, a string or None"""
+    if isinstance(value, str):
+        return NONE, code(value)
+    return _int(value), 0
+
+class Writer(object):
+    """Writes parsed reports, Metar records, to a binary file at path, the
+    file is complete once closed. count is the number of records written.
+    """
+
+    def __init__(self, path):
+        self._file = open(path, 'wb')
+        self._file.write(bytes(FILE.size))
+        self.count = 0
+        self._items = bytearray()
+        self._item_count = 0
+        self._texts = bytearray()
+        self._text_offsets = {}
+        self._codes = {None: 0}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _code(self, string):
+        """Returns the code table index of string"""
+        try:
+            return self._codes[string]
+        except KeyError:
+            index = len(self._codes)
+            if index > 0xffff:
+                raise ValueError('Code table full')
+            self._codes[string] = index
+            return index
+
+    def _item(self, string, number=None, other=None, tag=0):
+        """Appends an item"""
+        code = self._code
+        self._items += ITEM.pack(tag, code(string), _int(number), code(other))
+        self._item_count += 1
+
+    def write(self, metar):
+        """Writes a Metar"""
+        # pylint: disable=too-many-locals,too-many-branches
+        # pylint: disable=too-many-statements
+        code = self._code
+        item = self._item
+        first = self._item_count
+        counts = [0] * 7
+        flags = 0
+
+        day = hour = minute = 0
+        if metar.time is not None:
+            flags |= _TIME
+            day, hour, minute = metar.time
+
+        unmatched = (metar.unmatched or '').encode('utf-8')
+        text = self._text_offsets.get(unmatched)
+        if text is None:
+            text = self._text_offsets[unmatched] = len(self._texts)
+            self._texts += unmatched
+
+        fields = list(_DEFAULTS)
+
+        report = metar.report
+        if report is not None:
+            flags |= _REPORT
+            wind = report.wind
+            if wind is not None:
+                flags |= _WIND
+                fields[0:2] = _mixed(wind.direction, code)
+                fields[2:4] = _mixed(wind.speed, code)
+                fields[4:8] = (_int(wind.gust), code(wind.unit),
+                               _int(wind.variable_from),
+                               _int(wind.variable_to))
+
+            sky = report.sky
+            if sky is not None:
+                flags |= _SKY
+                visibility = sky.visibility
+                if visibility.ndv:
+                    flags |= _NDV
+                for runway, rvr in sky.rvr:
+                    item(runway, rvr.distance, rvr.modifier)
+                    item(rvr.tendency, rvr.variation, rvr.variation_modifier)
+                counts[0] = len(sky.rvr)
+                weather = sky.weather
+                precipitation = weather.precipitation
+                precipitation_intensity = other_intensity = 0
+                if precipitation is not None:
+                    flags |= _PRECIPITATION
+                    precipitation_intensity = code(precipitation.intensity)
+                    for phenomenon in precipitation.phenomena:
+                        item(phenomenon)
+                    counts[1] = len(precipitation.phenomena)
+                for phenomenon in weather.obscuration:
+                    item(phenomenon)
+                counts[2] = len(weather.obscuration)
+                other = weather.other
+                if other is not None:
+                    flags |= _OTHER
+                    other_intensity = code(other.intensity)
+                    for phenomenon in other.phenomena:
+                        item(phenomenon)
+                    counts[3] = len(other.phenomena)
+                for cloud in sky.clouds:
+                    item(cloud.amount, cloud.height, cloud.type)
+                counts[4] = len(sky.clouds)
+                fields[8:15] = (
+                    _int(visibility.distance),
+                    _int(visibility.min_distance),
+                    code(visibility.min_direction),
+                    _int(sky.verticalvis),
+                    code(sky.clear),
+                    precipitation_intensity,
+                    other_intensity)
+
+            temperature = report.temperature
+            if temperature is not None:
+                flags |= _TEMPERATURE
+                fields[15:17] = temperature
+            fields[17] = _int(report.pressure)
+
+            supplementary = report.supplementary
+            recent = self._item_count
+            for group, phenomena in enumerate(supplementary.recent_weather):
+                if isinstance(phenomena, OtherPhenomena):
+                    for phenomenon in phenomena.phenomena:
+                        item(phenomenon, None, phenomena.intensity,
+                             group << 1 | _RECENT_OTHER)
+                else:
+                    for phenomenon in phenomena:
+                        item(phenomenon, tag=group << 1)
+            counts[5] = self._item_count - recent
+            windshear = supplementary.windshear
+            if isinstance(windshear, tuple):
+                flags |= _WINDSHEAR_RUNWAYS
+                for runway in windshear:
+                    item(runway)
+                counts[6] = len(windshear)
+            else:
+                fields[18] = code(windshear)
+            sea = supplementary.sea
+            if sea is not None:
+                flags |= _SEA
+                fields[19:21] = sea
+
+        self._file.write(RECORD.pack(
+            code(metar.metartype), code(metar.location),
+            code(metar.reporttype), day, hour, minute, flags,
+            text, len(unmatched), *(fields + [first] + counts)))
+        self.count += 1
+
+    def close(self):
+        """Writes the items, code table and texts, then the file header"""
+        output = self._file
+        if output.closed:
+            return
+        items = output.tell()
+        output.write(self._items)
+        codes = output.tell()
+        for string in sorted(self._codes, key=self._codes.get)[1:]:
+            encoded = string.encode('utf-8')
+            output.write(struct.pack('<H', len(encoded)) + encoded)
+        texts = output.tell()
+        output.write(self._texts)
+        output.seek(0)
+        output.write(FILE.pack(MAGIC, VERSION, RECORD.size, ITEM.size, 0,
+                               self.count, self._item_count,
+                               len(self._codes) - 1, items, codes, texts))
+        output.close()
+
+def dump(metars, path):
+    """Writes an iterable of Metar records to path, returns their count"""
+    with Writer(path) as writer:
+        for metar in metars:
+            writer.write(metar)
+        return writer.count
+
+class Reader(object):
+    """Memory maps a binary file at path, records are decoded into Metar
+    records on access, by index or iterating.
+    """
+
+    def __init__(self, path):
+        with open(path, 'rb') as source:
+            self._buf = mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._open()
+        except (ValueError, struct.error):
+            self._buf.close()
+            raise
+
+    def _open(self):
+        """Reads the file header and code table"""
+        buf = self._buf
+        if len(buf) < FILE.size:
+            raise ValueError('Not an avweather binary file')
+        (magic, version, record_size, item_size, _, self._count,
+         self._item_count, code_count, self._items, codes,
+         self._texts) = FILE.unpack_from(buf)
+        if magic != MAGIC:
+            raise ValueError('Not an avweather binary file')
+        if version != VERSION or (record_size, item_size) != (RECORD.size,
+                                                              ITEM.size):
+            raise ValueError('Unsupported avweather binary file version %d' %
+                             version)
+        self._codes = [None]
+        pos = codes
+        for _ in range(code_count):
+            length, = struct.unpack_from('<H', buf, pos)
+            pos += 2
+            self._codes.append(buf[pos:pos + length].decode('utf-8'))
+            pos += length
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        return self._count
+
+    def __iter__(self):
+        for index in range(self._count):
+            yield self[index]
+
+    def __getitem__(self, index):
+        # pylint: disable=too-many-locals,too-many-branches
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError('record index out of range')
+        buf = self._buf
+        codes = self._codes
+        (metartype, location, reporttype, day, hour, minute, flags, text,
+         length, direction, direction_code, speed, speed_code, gust, unit,
+         variable_from, variable_to, distance, min_distance, min_direction,
+         verticalvis, clear, precipitation_intensity, other_intensity, air,
+         dewpoint, pressure, windshear, sea_temperature, sea_state, first,
+         rvr, precipitation, obscuration, other, clouds, recent,
+         runways) = RECORD.unpack_from(buf, FILE.size + index * RECORD.size)
+
+        time = None
+        if flags & _TIME:
+            time = _new(MetarObsTime, (day, hour, minute))
+        text += self._texts
+        unmatched = buf[text:text + length].decode('utf-8')
+        if not flags & _REPORT:
+            return _new(Metar, (codes[metartype], codes[location], time,
+                                codes[reporttype], None, unmatched))
+
+        count = 2 * rvr + precipitation + obscuration + other + clouds
+        count += recent + runways
+        items = ()
+        if count:
+            pos = self._items + first * ITEM.size
+            items = ITEM.iter_unpack(buf[pos:pos + count * ITEM.size])
+
+        wind = None
+        if flags & _WIND:
+            wind = _new(Wind, (
+                codes[direction_code] if direction_code else
+                None if direction == NONE else direction,
+                codes[speed_code] if speed_code else
+                None if speed == NONE else speed,
+                None if gust == NONE else gust,
+                codes[unit],
+                None if variable_from == NONE else variable_from,
+                None if variable_to == NONE else variable_to))
+
+        sky = None
+        if flags & _SKY:
+            if rvr:
+                pairs = islice(items, 2 * rvr)
+                rvr = tuple([
+                    (codes[runway], _new(Rvr, (
+                        None if distance == NONE else distance,
+                        codes[modifier],
+                        None if variation == NONE else variation,
+                        codes[variation_modifier], codes[tendency])))
+                    for ((_, runway, distance, modifier),
+                         (_, tendency, variation, variation_modifier))
+                    in zip(pairs, pairs)])
+            else:
+                rvr = ()
+            if flags & _PRECIPITATION:
+                precipitation = _new(Percipitation, (
+                    codes[precipitation_intensity],
+                    _phenomena(codes, items, precipitation)))
+            else:
+                precipitation = None
+            obscuration = _phenomena(codes, items, obscuration)
+            if flags & _OTHER:
+                other = _new(OtherPhenomena, (
+                    codes[other_intensity], _phenomena(codes, items, other)))
+            else:
+                other = None
+            if clouds:
+                clouds = tuple([
+                    _new(Cloud, (codes[amount],
+                                 None if height == NONE else height,
+                                 codes[cloudtype]))
+                    for _, amount, height, cloudtype in islice(items,
+                                                               clouds)])
+            else:
+                clouds = ()
+            sky = _new(SkyConditions, (
+                _new(Visibility, (
+                    None if distance == NONE else distance,
+                    bool(flags & _NDV),
+                    None if min_distance == NONE else min_distance,
+                    codes[min_direction])),
+                rvr,
+                _new(Weather, (precipitation, obscuration, other)),
+                clouds,
+                None if verticalvis == NONE else verticalvis,
+                codes[clear]))
+
+        temperature = None
+        if flags & _TEMPERATURE:
+            temperature = _new(Temperature, (air, dewpoint))
+        recent = _recent(codes, items, recent) if recent else ()
+        if flags & _WINDSHEAR_RUNWAYS:
+            windshear = _phenomena(codes, items, runways)
+        else:
+            windshear = codes[windshear]
+        sea = None
+        if flags & _SEA:
+            sea = _new(Sea, (sea_temperature, sea_state))
+
+        report = _new(Report, (
+            wind, sky, temperature, None if pressure == NONE else pressure,
+            _new(SupplementaryInfo, (recent, windshear, sea, None)),
+            None))
+        return _new(Metar, (codes[metartype], codes[location], time,
+                            codes[reporttype], report, unmatched))
+
+    def close(self):
+        """Unmaps the file"""
+        self._buf.close()
+
+def _phenomena(codes, items, count):
+    """Returns the tuple of the code of the next count items"""
+    if not count:
+        return ()
+    return tuple([codes[item[1]] for item in islice(items, count)])
+
+def _recent(codes, items, count):
+    """Returns the recent weather tuple of the next count items"""
+    recent = []
+    group = None
+    for tag, phenomenon, _, intensity in islice(items, count):
+        if tag != group:
+            group = tag
+            recent.append((tag, codes[intensity], []))
+        recent[-1][2].append(codes[phenomenon])
+    return tuple([
+        _new(OtherPhenomena, (intensity, tuple(phenomena)))
+        if tag & _RECENT_OTHER else tuple(phenomena)
+        for tag, intensity, phenomena in recent])
+
+def load(path):
+    """Returns the list of Metar records in a binary file at path"""
+    with Reader(path) as reader:
+        return list(reader)
@@ -0,0 +1,176 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Aviation Weather
+
+Copyright (C) 2018  Pedro Rodrigues <prodrigues1990@gmail.com>
+
+This file is part of Aviation Weather.
+
+Aviation Weather is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, version 2 of the License.
+
+Aviation Weather is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Aviation Weather.  If not, see <http://www.gnu.org/licenses/>.
+
+Significant weather changes between consecutive reports of a station
+
+    >>> from avweather.changes import ChangeDetector
+    >>> from avweather.metar import parse
+    >>> detector = ChangeDetector()
+    >>> detector.feed(parse('METAR LPPT 011200Z 34010KT 9999 12/10 Q1013'))
+    []
+    >>> [change.kind for change in detector.feed(parse(
+    ...     'METAR LPPT 011230Z 34010KT 2000 -RA 12/10 Q1013'))]
+    ['visibility', 'precipitation']
+
+Each report is reduced to a small state tuple, wind direction and speed in
+knots, visibility, ceiling, precipitation and thunderstorm, and compared
+with the state of the previous report of the same location, in constant time
+per report.
+"""
+from bisect import bisect_right
+from collections import namedtuple
+
+from . import _units
+
+Thresholds = namedtuple(
+    'Thresholds',
+    'wind_direction wind_direction_speed wind_speed visibility ceiling')
+
+# Annex 3 SPECI criteria, mean direction change of 60 degrees or more at 10
+# knots or more, mean speed change of 10 knots or more, visibility passing
+# 800, 1500, 3000 or 5000 metres and ceiling passing 100, 200, 500, 1000 or
+# 1500 feet, in hundreds of feet as reported
+DEFAULT_THRESHOLDS = Thresholds(60, 10, 10, (800, 1500, 3000, 5000),
+                                (1, 2, 5, 10, 15))
+
+Change = namedtuple('Change', 'location time kind old new')
+
+# state tuple fields
+_DIRECTION = 0
+_SPEED = 1
+_VISIBILITY = 2
+_CEILING = 3
+_PRECIPITATION = 4
+_THUNDERSTORM = 5
+
+def _thunderstorm(weather):
+    """True for a present weather reporting a thunderstorm"""
+    if weather.precipitation is not None:
+        for phenomenon in weather.precipitation.phenomena:
+            if phenomenon.startswith('TS'):
+                return True
+    if 'TS' in weather.obscuration:
+        return True
+    return weather.other is not None and 'TS' in weather.other.phenomena
+
+def state(metar):
+    """Returns the (direction, speed, visibility, ceiling, precipitation,
+    thunderstorm) state of a Metar with a report, direction and speed None
+    when not reported, ceiling in hundreds of feet, None when there is no
+    broken or overcast layer nor vertical visibility.
+    """
+    report = metar.report
+    direction = speed = None
+    wind = report.wind
+    if wind is not None:
+        speed = _units.knots(wind.speed, wind.unit)
+        if speed is not None:
+            speed = int(round(speed))
+        if isinstance(wind.direction, int):
+            direction = wind.direction
+
+    sky = report.sky
+    if sky is None:
+        return (direction, speed, _units.CAVOK_VISIBILITY, None, False, False)
+
+    weather = sky.weather
+    return (direction, speed, sky.visibility.distance, _units.ceiling(sky),
+            weather.precipitation is not None, _thunderstorm(weather))
+
+class ChangeDetector(object):
+    """Keeps the state of the last report fed per location, and returns the
+    significant changes of every new report, see Thresholds.
+
+    Reports without location or report, NIL ones, are ignored, the first
+    report of a location has no changes.
+    """
+
+    def __init__(self, thresholds=DEFAULT_THRESHOLDS):
+        self.thresholds = thresholds
+        self._visibility = tuple(sorted(thresholds.visibility))
+        self._ceiling = tuple(sorted(thresholds.ceiling))
+        self._states = {}
+
+    def __len__(self):
+        return len(self._states)
+
+    def reset(self):
+        """Forgets every location"""
+        self._states.clear()
+
+    def feed(self, metar):
+        """Returns the list of Change events of a Metar against the previous
+        report of its location"""
+        location = metar.location
+        if location is None or metar.report is None:
+            return []
+        new = state(metar)
+        old = self._states.get(location)
+        self._states[location] = new
+        if old is None or old == new:
+            return []
+        return self._changes(location, metar.time, old, new)
+
+    def _changes(self, location, time, old, new):
+        """Returns the list of Change events between two states"""
+        # pylint: disable=too-many-arguments
+        thresholds = self.thresholds
+        changes = []
+
+        old_speed, new_speed = old[_SPEED], new[_SPEED]
+        old_direction, new_direction = old[_DIRECTION], new[_DIRECTION]
+        if (old_direction is not None and new_direction is not None and
+                old_speed is not None and new_speed is not None and
+                min(old_speed, new_speed) >=
+                thresholds.wind_direction_speed):
+            shift = abs(old_direction - new_direction) % 360
+            if min(shift, 360 - shift) >= thresholds.wind_direction:
+                changes.append(Change(location, time, 'wind_direction',
+                                      old_direction, new_direction))
+        if (old_speed is not None and new_speed is not None and
+                abs(old_speed - new_speed) >= thresholds.wind_speed):
+            changes.append(Change(location, time, 'wind_speed', old_speed,
+                                  new_speed))
+
+        old_visibility, new_visibility = old[_VISIBILITY], new[_VISIBILITY]
+        if (old_visibility is not None and new_visibility is not None and
+                bisect_right(self._visibility, old_visibility) !=
+                bisect_right(self._visibility, new_visibility)):
+            changes.append(Change(location, time, 'visibility',
+                                  old_visibility, new_visibility))
+
+        if self._band(old[_CEILING]) != self._band(new[_CEILING]):
+            changes.append(Change(location, time, 'ceiling', old[_CEILING],
+                                  new[_CEILING]))
+
+        if old[_PRECIPITATION] != new[_PRECIPITATION]:
+            changes.append(Change(location, time, 'precipitation',
+                                  old[_PRECIPITATION], new[_PRECIPITATION]))
+        if old[_THUNDERSTORM] != new[_THUNDERSTORM]:
+            changes.append(Change(location, time, 'thunderstorm',
+                                  old[_THUNDERSTORM], new[_THUNDERSTORM]))
+        return changes
+
+    def _band(self, ceiling):
+        """Returns the ceiling threshold band, no ceiling above them all"""
+        if ceiling is None:
+            return len(self._ceiling)
+        return bisect_right(self._ceiling, ceiling)
@@ -0,0 +1,196 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Aviation Weather
+
+Copyright (C) 2018  Pedro Rodrigues <prodrigues1990@gmail.com>
+
+This file is part of Aviation Weather.
+
+Aviation Weather is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, version 2 of the License.
+
+Aviation Weather is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Aviation Weather.  If not, see <http://www.gnu.org/licenses/>.
+
+Derived quantities over whole columns of parsed reports
+
+    >>> from avweather.metar import parse_columns
+    >>> from avweather.derived import derive
+    >>> columns = parse_columns(['METAR LPPT 011200Z 34010KT 9999 BKN008 '
+    ...                          '12/10 Q1013'], use_numpy=False)
+    >>> derived = derive(columns)
+    >>> list(derived['spread']), list(derived['flight_category'])
+    ([2], [2])
+
+Every function takes the columns of metar.parse_columns, numpy arrays or
+array.array, and returns a column of the same kind, computed with numpy
+array operations or a single Python loop, MISSING or nan where any of its
+fields is missing.
+"""
+from array import array
+import math
+
+from ._columns import MISSING, numpy
+from ._units import CAVOK_VISIBILITY, KMH_PER_KT
+
+# flight categories, flight_category values index this tuple
+CATEGORIES = ('VFR', 'MVFR', 'IFR', 'LIFR')
+VFR, MVFR, IFR, LIFR = range(len(CATEGORIES))
+
+# lowest ceiling, in hundreds of feet, and visibility, in metres, of every
+# category but LIFR, 3000 feet and 5 statute miles for VFR, 1000 feet and 3
+# statute miles for MVFR, 500 feet and 1 statute mile for IFR
+_CATEGORY_CEILING = (31, 10, 5)
+_CATEGORY_VISIBILITY = (8047, 4828, 1609)
+
+# Magnus formula coefficients for saturation vapour pressure over water
+_MAGNUS_B = 17.625
+_MAGNUS_C = 243.04
+
+# ICAO standard atmosphere pressure altitude, in feet, for a QNH in
+# hectopascals
+_STANDARD_PRESSURE = 1013.25
+_PRESSURE_EXPONENT = 0.190284
+_PRESSURE_FEET = 145366.45
+
+def derive(columns, elevation=0):
+    """Returns a dict of derived column name to column, relative_humidity,
+    spread, wind_speed_kt, wind_gust_kt, pressure_altitude and
+    flight_category, see the functions of the same names.
+    """
+    return {
+        'relative_humidity': relative_humidity(columns['air'],
+                                               columns['dewpoint']),
+        'spread': spread(columns['air'], columns['dewpoint']),
+        'wind_speed_kt': knots(columns['wind_speed'], columns['wind_unit']),
+        'wind_gust_kt': knots(columns['wind_gust'], columns['wind_unit']),
+        'pressure_altitude': pressure_altitude(columns['pressure'],
+                                               elevation),
+        'flight_category': flight_category(columns['visibility'],
+                                           columns['ceiling'],
+                                           columns['cavok']),
+    }
+
+def _is_numpy(column):
+    """True for numpy columns"""
+    return numpy is not None and isinstance(column, numpy.ndarray)
+
+def relative_humidity(air, dewpoint):
+    """Returns the float column of relative humidity, in percent, for air and
+    dewpoint temperature columns, with the Magnus formula"""
+    if _is_numpy(air):
+        missing = (air == MISSING) | (dewpoint == MISSING)
+        air = air.astype('d')
+        dewpoint = dewpoint.astype('d')
+        humidity = 100 * numpy.exp(
+            _MAGNUS_B * dewpoint / (_MAGNUS_C + dewpoint) -
+            _MAGNUS_B * air / (_MAGNUS_C + air))
+        humidity[missing] = numpy.nan
+        return humidity
+
+    column = array('d')
+    append = column.append
+    exp = math.exp
+    for air_value, dewpoint_value in zip(air, dewpoint):
+        if air_value == MISSING or dewpoint_value == MISSING:
+            append(math.nan)
+        else:
+            append(100 * exp(
+                _MAGNUS_B * dewpoint_value / (_MAGNUS_C + dewpoint_value) -
+                _MAGNUS_B * air_value / (_MAGNUS_C + air_value)))
+    return column
+
+def spread(air, dewpoint):
+    """Returns the integer column of air and dewpoint temperature spread, in
+    degrees Celsius"""
+    if _is_numpy(air):
+        missing = (air == MISSING) | (dewpoint == MISSING)
+        return numpy.where(missing, MISSING, air - dewpoint).astype('h')
+
+    return array('h', (
+        MISSING if air_value == MISSING or dewpoint_value == MISSING
+        else air_value - dewpoint_value
+        for air_value, dewpoint_value in zip(air, dewpoint)))
+
+def knots(speed, unit):
+    """Returns the integer column of wind speeds, or gusts, in knots, for a
+    speed column in the units of the wind_unit column, rounded"""
+    if _is_numpy(speed):
+        kmh = numpy.asarray(unit, dtype=object) == 'KMH'
+        converted = numpy.rint(speed / KMH_PER_KT).astype('h')
+        return numpy.where((speed != MISSING) & kmh, converted,
+                           speed).astype('h')
+
+    return array('h', (
+        int(round(value / KMH_PER_KT))
+        if value != MISSING and value_unit == 'KMH' else value
+        for value, value_unit in zip(speed, unit)))
+
+def pressure_altitude(pressure, elevation=0):
+    """Returns the integer column of pressure altitudes, in feet, for a QNH
+    column in hectopascals, of an aerodrome at an elevation in feet, either a
+    number or a column of the same length, 0 gives the pressure altitude of
+    the mean sea level.
+    """
+    if _is_numpy(pressure):
+        missing = pressure == MISSING
+        pressure = numpy.where(missing, _STANDARD_PRESSURE, pressure)
+        altitude = _PRESSURE_FEET * (1 - numpy.power(
+            pressure / _STANDARD_PRESSURE, _PRESSURE_EXPONENT))
+        altitude = numpy.rint(altitude + elevation).astype('i')
+        altitude[missing] = MISSING
+        return altitude
+
+    if isinstance(elevation, (int, float)):
+        elevation = (elevation,) * len(pressure)
+    return array('i', (
+        MISSING if value == MISSING else int(round(
+            _PRESSURE_FEET * (1 - (value / _STANDARD_PRESSURE) **
+                              _PRESSURE_EXPONENT) + value_elevation))
+        for value, value_elevation in zip(pressure, elevation)))
+
+def flight_category(visibility, ceiling, cavok):
+    """Returns the integer column of flight categories, indexes of
+    CATEGORIES, for visibility, ceiling and cavok columns, the worst of the
+    visibility and ceiling categories, MISSING without visibility nor CAVOK.
+
+    Categories are the common VFR, MVFR, IFR and LIFR limits, converted to
+    metres, a missing ceiling is no ceiling at all.
+    """
+    if _is_numpy(visibility):
+        cavok = cavok.astype(bool)
+        visibility = numpy.where(cavok, CAVOK_VISIBILITY, visibility)
+        category = numpy.full(len(visibility), LIFR, dtype='h')
+        clear = ceiling == MISSING
+        for better, lowest, farthest in zip(
+                range(IFR, VFR - 1, -1), _CATEGORY_CEILING[::-1],
+                _CATEGORY_VISIBILITY[::-1]):
+            category[(clear | (ceiling >= lowest)) &
+                     (visibility >= farthest)] = better
+        category[(visibility == MISSING) & ~cavok] = MISSING
+        return category
+
+    column = array('h')
+    append = column.append
+    for value, value_ceiling, value_cavok in zip(visibility, ceiling, cavok):
+        if value_cavok:
+            value = CAVOK_VISIBILITY
+        elif value == MISSING:
+            append(MISSING)
+            continue
+        category = VFR
+        for lowest, farthest in zip(_CATEGORY_CEILING,
+                                    _CATEGORY_VISIBILITY):
+            if value >= farthest and (value_ceiling == MISSING or
+                                      value_ceiling >= lowest):
+                break
+            category += 1
+        append(category)
+    return column
@@ -0,0 +1,261 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Aviation Weather
+
+Copyright (C) 2018  Pedro Rodrigues <prodrigues1990@gmail.com>
+
+This file is part of Aviation Weather.
+
+Aviation Weather is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, version 2 of the License.
+
+Aviation Weather is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Aviation Weather.  If not, see <http://www.gnu.org/licenses/>.
+
+Station and observation time index of raw METAR and SPECI text archives
+
+    >>> import os, tempfile
+    >>> from avweather.index import ArchiveIndex
+    >>> path = os.path.join(tempfile.mkdtemp(), 'metars.txt')
+    >>> with open(path, 'w') as archive:
+    ...     count = archive.write('METAR LPPT 031200Z NIL=\\n')
+    >>> index = ArchiveIndex(path)
+    >>> index.update()
+    1
+    >>> list(index.reports('LPPT', (3, 0), (9, 23)))
+    ['METAR LPPT 031200Z NIL']
+
+Reports are split as in metar.iter_file, each one is keyed by the location
+and observation day and hour scan_header reads, the same ptype, plocation and
+ptime would parse. Reports missing either are not indexed.
+
+The index is kept in a file next to the archive, update indexes only the
+bytes appended since the last update, the last report indexed is scanned
+again as it may continue past the old end of the archive. An archive that
+shrank, or whose first or last indexed bytes changed, is indexed again.
+"""
+from array import array
+from bisect import bisect_left, bisect_right
+import mmap
+import os
+import struct
+import sys
+import zlib
+
+from . import _archive
+from .metar import scan_header
+
+MAGIC = b'AVWI'
+VERSION = 1
+
+HEADER = struct.Struct('<4sHHQQIIII')
+
+# bytes of the archive checked against the index, from the start and before
+# the last report indexed
+_SIGNATURE = 4096
+
+# entry keys pack the day, the hour and the start offset of a report
+_DAY = 48
+_HOUR = 40
+_START = (1 << _HOUR) - 1
+_NONE = 0xffffffff
+
+def _key(day, hour, start=0):
+    """Returns the entry key of a report"""
+    return day << _DAY | hour << _HOUR | start
+
+class ArchiveIndex(object):
+    """Byte ranges of the reports of an archive per location, day and hour.
+
+    The index is kept at path, the archive path with '.idx' appended by
+    default, and loaded when present, update brings it up to date.
+    """
+
+    def __init__(self, archive, path=None):
+        self.archive = archive
+        self.path = path or archive + '.idx'
+        self._clear()
+        if os.path.exists(self.path):
+            self._load()
+
+    def _clear(self):
+        """Empties the index"""
+        # location to (keys, lengths) arrays, sorted by key
+        self._entries = {}
+        # offset and (location, key) of the last report indexed, or None
+        self._resume = 0
+        self._last = None
+        self._head = self._tail = 0
+
+    def __len__(self):
+        return sum(len(keys) for keys, _ in self._entries.values())
+
+    def locations(self):
+        """Returns the list of locations indexed"""
+        return list(self._entries)
+
+    def update(self):
+        """Indexes the reports appended to the archive, or the whole archive
+        when it was otherwise changed, and saves the index, returns the
+        number of reports added to the index.
+        """
+        before = len(self)
+        with open(self.archive, 'rb') as archive:
+            size = os.fstat(archive.fileno()).st_size
+            if size == 0:
+                self._clear()
+            else:
+                with mmap.mmap(archive.fileno(), 0,
+                               access=mmap.ACCESS_READ) as buf:
+                    if not self._unchanged(buf):
+                        self._clear()
+                    self._drop_last()
+                    self._scan(buf)
+        self._save()
+        return len(self) - before
+
+    def _signature(self, buf):
+        """Returns the (head, tail) checksums of the archive bytes indexed"""
+        resume = self._resume
+        return (zlib.crc32(buf[:min(resume, _SIGNATURE)]),
+                zlib.crc32(buf[max(0, resume - _SIGNATURE):resume]))
+
+    def _unchanged(self, buf):
+        """True when the indexed bytes of the archive look unchanged"""
+        return (self._resume <= len(buf) and
+                self._signature(buf) == (self._head, self._tail))
+
+    def _drop_last(self):
+        """Removes the last report indexed, scanned again"""
+        if self._last is None:
+            return
+        location, key = self._last
+        keys, lengths = self._entries[location]
+        index = bisect_left(keys, key)
+        del keys[index]
+        del lengths[index]
+        if not keys:
+            del self._entries[location]
+        self._last = None
+
+    def _scan(self, buf):
+        """Indexes the reports of buf from the resume offset"""
+        added = {}
+        resume = self._resume
+        for start, end, text in _archive.reports(buf, resume):
+            resume = start
+            self._last = None
+            _, location, time = scan_header(text)
+            if location is None or time is None:
+                continue
+            key = _key(time.day, time.hour, start)
+            keys, lengths = added.setdefault(location, ([], []))
+            keys.append(key)
+            lengths.append(end - start)
+            self._last = location, key
+
+        for location, (keys, lengths) in added.items():
+            old_keys, old_lengths = self._entries.get(location, ((), ()))
+            pairs = sorted(zip(list(old_keys) + keys,
+                               list(old_lengths) + lengths))
+            self._entries[location] = (array('Q', [p[0] for p in pairs]),
+                                       array('I', [p[1] for p in pairs]))
+        self._resume = resume
+        self._head, self._tail = self._signature(buf)
+
+    def ranges(self, location, first=None, last=None):
+        """Returns the list of (start, end) byte ranges, in archive order, of
+        the reports of location observed from first to last, both (day, hour)
+        and included, or unbounded when None. A first after last wraps
+        around the end of the month.
+        """
+        if location not in self._entries:
+            return []
+        keys, lengths = self._entries[location]
+        low = 0 if first is None else bisect_left(keys, _key(*first))
+        high = (len(keys) if last is None else
+                bisect_right(keys, _key(*last) | _START))
+        if low <= high:
+            indexes = range(low, high)
+        else:
+            indexes = list(range(low, len(keys))) + list(range(high))
+        return sorted((keys[index] & _START,
+                       (keys[index] & _START) + lengths[index])
+                      for index in indexes)
+
+    def reports(self, location, first=None, last=None):
+        """Yields the text of the reports of location observed from first to
+        last, see ranges, reading only their byte ranges of the memory mapped
+        archive.
+        """
+        ranges = self.ranges(location, first, last)
+        if not ranges:
+            return
+        with open(self.archive, 'rb') as archive:
+            with mmap.mmap(archive.fileno(), 0,
+                           access=mmap.ACCESS_READ) as buf:
+                for start, end in ranges:
+                    for _, _, text in _archive.reports(buf, start, end):
+                        yield text
+
+    def _save(self):
+        """Writes the index file"""
+        locations = sorted(self._entries)
+        last = _NONE
+        last_key = 0
+        if self._last is not None:
+            last = locations.index(self._last[0])
+            last_key = self._last[1]
+        with open(self.path, 'wb') as output:
+            output.write(HEADER.pack(MAGIC, VERSION, 0, self._resume,
+                                     last_key, last, self._head, self._tail,
+                                     len(locations)))
+            for location in locations:
+                keys, lengths = self._entries[location]
+                encoded = location.encode('utf-8')
+                output.write(struct.pack('<HI', len(encoded), len(keys)))
+                output.write(encoded)
+                for column in (keys, lengths):
+                    if sys.byteorder == 'big':
+                        column = array(column.typecode, column)
+                        column.byteswap()
+                    column.tofile(output)
+
+    def _load(self):
+        """Reads the index file"""
+        with open(self.path, 'rb') as source:
+            buf = source.read()
+        if len(buf) < HEADER.size or buf[:4] != MAGIC:
+            raise ValueError('Not an avweather index file %s' % self.path)
+        (_, version, _, self._resume, last_key, last, self._head, self._tail,
+         count) = HEADER.unpack_from(buf)
+        if version != VERSION:
+            raise ValueError('Unsupported avweather index version %d' %
+                             version)
+        pos = HEADER.size
+        locations = []
+        for _ in range(count):
+            length, entries = struct.unpack_from('<HI', buf, pos)
+            pos += 6
+            location = buf[pos:pos + length].decode('utf-8')
+            pos += length
+            columns = []
+            for typecode in ('Q', 'I'):
+                column = array(typecode)
+                size = entries * column.itemsize
+                column.frombytes(buf[pos:pos + size])
+                if sys.byteorder == 'big':
+                    column.byteswap()
+                pos += size
+                columns.append(column)
+            self._entries[location] = tuple(columns)
+            locations.append(location)
+        if last != _NONE:
+            self._last = locations[last], last_key
@@ -0,0 +1,150 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Aviation Weather
+
+Copyright (C) 2018  Pedro Rodrigues <prodrigues1990@gmail.com>
+
+This file is part of Aviation Weather.
+
+Aviation Weather is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, version 2 of the License.
+
+Aviation Weather is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Aviation Weather.  If not, see <http://www.gnu.org/licenses/>.
+
+Opt-in per group parser instrumentation of metar.parse
+
+    >>> from avweather import instrument, metar
+    >>> with instrument.instrumented() as recorder:
+    ...     result = metar.parse('METAR LPPT 011200Z 34010KT CAVOK')
+    >>> recorder.snapshot()['pwind'].calls
+    1
+
+While instrumented the match function of every group parser in GROUPS is
+replaced by a timing wrapper, calls from both engines and from composite
+parsers, such as psky calling pvis, are recorded, the nanoseconds of a
+composite include those of the parsers it calls. A match is a call that
+consumed text, a miss leaves the remaining text for the next parser and
+eventually for Metar.unmatched, and an error is a call that raised, as psky
+does for a missing visibility. The 'fast' engine decodes most groups itself,
+only the groups it delegates to a parser are recorded.
+
+Nothing is wrapped, and nothing is paid, outside of instrumented blocks. The
+wrappers are process wide, blocks may nest or run in several threads, every
+active recorder sees every call.
+"""
+from collections import namedtuple
+from contextlib import contextmanager
+import threading
+import time
+
+from . import _metar_parsers as _p
+
+GROUPS = (
+    'ptype', 'plocation', 'ptime', 'preporttype', 'pwind', 'pvis', 'prvr',
+    'pintensity', 'ppercipitation', 'pobscuration', 'potherphenomena',
+    'pclouds', 'pverticalvis', 'pskyclear', 'psky', 'ptemperature',
+    'ppressure', 'precentweather', 'pwindshear', 'psea', 'psupplementary',
+)
+
+GroupStats = namedtuple('GroupStats',
+                        'calls nanoseconds matches misses errors')
+
+class Recorder(object):
+    """Accumulates GroupStats per group parser name, callback, if any, is
+    called with (name, nanoseconds, matched) for every parser call.
+    """
+
+    def __init__(self, callback=None):
+        self.callback = callback
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    def record(self, name, nanoseconds, matched, error=False):
+        """Records a parser call, error for a call that raised"""
+        with self._lock:
+            calls, total, matches, misses, errors = self._stats.get(
+                name, (0, 0, 0, 0, 0))
+            if error:
+                errors += 1
+            elif matched:
+                matches += 1
+            else:
+                misses += 1
+            self._stats[name] = (calls + 1, total + nanoseconds,
+                                 matches, misses, errors)
+        if self.callback is not None:
+            self.callback(name, nanoseconds, matched)
+
+    def snapshot(self):
+        """Returns a dict of GroupStats per parser name called so far"""
+        with self._lock:
+            return {name: GroupStats(*stats)
+                    for name, stats in self._stats.items()}
+
+    def reset(self):
+        """Clears the recorded stats"""
+        with self._lock:
+            self._stats.clear()
+
+_recorders = []
+_originals = {}
+_lock = threading.Lock()
+
+@contextmanager
+def instrumented(recorder=None):
+    """Records group parser calls into recorder, a new Recorder by default,
+    for the duration of the block, yields the recorder.
+    """
+    if recorder is None:
+        recorder = Recorder()
+    with _lock:
+        if not _recorders:
+            _install()
+        _recorders.append(recorder)
+    try:
+        yield recorder
+    finally:
+        with _lock:
+            _recorders.remove(recorder)
+            if not _recorders:
+                _uninstall()
+
+def _install():
+    """Wraps the match function of every group parser"""
+    for name in GROUPS:
+        parser = getattr(_p, name)
+        _originals[name] = parser.match
+        parser.match = _timed(name, parser.match)
+
+def _uninstall():
+    """Restores the match function of every group parser"""
+    for name, match in _originals.items():
+        getattr(_p, name).match = match
+    _originals.clear()
+
+def _timed(name, match):
+    """Returns match recording its calls in the active recorders"""
+    clock = time.perf_counter
+
+    def timed(buf, pos=0):
+        """Returns the recorded match"""
+        start = clock()
+        end = None
+        try:
+            item, end = match(buf, pos)
+        finally:
+            nanoseconds = int((clock() - start) * 1e9)
+            matched = end is not None and end != pos
+            for recorder in tuple(_recorders):
+                recorder.record(name, nanoseconds, matched, end is None)
+        return item, end
+
+    return timed
@@ -19,39 +19,436 @@ GNU General Public License for more details.
 You should have received a copy of the GNU General Public License
 along with Aviation Weather.  If not, see <http://www.gnu.org/licenses/>.
 """
-from collections import namedtuple
+from collections import namedtuple, OrderedDict
+from itertools import islice
+import multiprocessing
+import re
+
+from . import _archive
+from . import _columns
 from . import _metar_parsers as _p
+from . import _metar_tokens
+from .records import (
+    Header, Metar, MetarObsTime, ParseFailure, ParseResult, Report)
+
+ENGINES = ('regex', 'fast')
+ERRORS = ('raise', 'skip', 'collect', 'diagnose')
+MISSING = _columns.MISSING
+
+# group parsers of the regex pipeline, in order
+_GROUPS = ('ptype', 'plocation', 'ptime', 'preporttype', 'pwind', 'psky',
+           'ptemperature', 'ppressure', 'psupplementary')
+
+# group parsers of the report, those a LazyReport decodes on access
+_REPORT_GROUPS = _GROUPS[4:]
+
+# ptype, plocation and ptime patterns, each optional, in a single pass
+_HEADER = re.compile(r"""
+    (?:\s*(METAR\sCOR\b|SPECI\sCOR\b|METAR|SPECI))?
+    (?:\s*([A-Z][A-Z0-9]{3}))?
+    (?:\s*([0-9]{2})([0-9]{2})([0-9]{2})Z)?
+""", re.I | re.X)
 
-def parse(string):
+def parse(string, engine='regex', lazy=False, upper=True):
     """Parses a METAR or SPECI text report into python primitives.
 
     Implementation based on Annex 3 to the Convetion on International Civil
     Aviation, as published by ICAO, 16th Edition July 2007.
+
+    The 'regex' engine tries every group parser in turn, the 'fast' engine
+    splits the report into tokens once and decodes only the groups present,
+    falling back to the 'regex' engine for any report it can not decode
+    exactly as the latter would. Both return the same results.
+
+    With lazy, the report is only split into its wind, sky, temperature,
+    pressure and supplementary spans, the returned Metar report is a
+    LazyReport decoding each of them on first access, see LazyReport.
+
+    string is a str, or ASCII bytes, bytearray or memoryview, decoded in a
+    single copy. With upper False the report is taken as already upper
+    cased, as WMO feeds are, and is not copied again to upper case it.
+    """
+    parser = _parser(engine)
+    if lazy:
+        parser = _parse_lazy
+    return parser(_text(string, upper))
+
+def parse_result(string, engine='regex', upper=True):
+    """Parses a METAR or SPECI text report into a ParseResult, never raising
+    for malformed reports.
+
+    metar is the Metar parse returns, or the partial Metar parsed up to a
+    missing required field, its later groups None. offset is where parsing
+    stopped in the stripped and upper cased report, that is where unmatched
+    starts. parser is the name of the group parser that failed, the first
+    one after the last group parsed, or None when the report was parsed to
+    its end or to a trend or remarks group, NOSIG, TEMPO, BECMG or RMK, or
+    when no group is left after NIL or the supplementary groups. error is
+    the message parse would raise, or None. string and upper as in parse.
+    """
+    return _parser(engine, 'diagnose')(_text(string, upper))
+
+def scan_header(string):
+    """Returns the Header (metartype, location, time) of a METAR or SPECI
+    text report, as parse would, with None for each field not found.
+
+    Only the header is read, with a single regular expression match, and the
+    rest of the report is never looked at, scan_header does not raise on
+    malformed reports. string as in parse, matched in any case.
+    """
+    metartype, location, day, hour, minute = _HEADER.match(
+        _text(string, False)).groups()
+    if metartype is not None:
+        metartype = metartype.upper()
+    if location is not None:
+        location = location.upper()
+    time = None
+    if day is not None:
+        time = MetarObsTime(int(day), int(hour), int(minute))
+    return Header(metartype, location, time)
+
+def scan_headers(strings):
+    """Yields the Header of every METAR or SPECI text report in strings, see
+    scan_header"""
+    for string in strings:
+        yield scan_header(string)
+
+def parse_many(strings, errors='raise', engine='regex', workers=None,
+               chunksize=1000, upper=True):
+    """Parses an iterable of METAR or SPECI text reports, returns the list of
+    results in input order.
+
+    errors sets what to do with reports missing required fields, 'raise' the
+    ValueError, 'skip' the report, or 'collect' a ParseFailure in its place.
+
+    'diagnose' returns a ParseResult for every report instead, see
+    parse_result.
+
+    With workers, chunks of chunksize reports are parsed by a pool of that
+    many processes, each chunk of results is sent back as a single list.
+
+    strings, engine and upper as in parse.
+    """
+    # pylint: disable=too-many-arguments
+    _check_errors(errors)
+    if workers is None:
+        return list(_iparse(strings, errors, _parser(engine, errors),
+                            upper=upper))
+    results = []
+    for chunk in parse_chunks(strings, errors, engine, workers, chunksize,
+                              upper):
+        results.extend(chunk)
+    return results
+
+def parse_chunks(strings, errors='raise', engine='regex', workers=None,
+                 chunksize=1000, upper=True):
+    """Parses an iterable of METAR or SPECI text reports, yields the list of
+    results of every chunk of chunksize reports, in input order, so that
+    results can be written out while later chunks are still being parsed.
+
+    Arguments as in parse_many.
+    """
+    # pylint: disable=too-many-arguments
+    _check_errors(errors)
+    return _imap_chunks(_parse_chunk, strings, workers, chunksize, errors,
+                        engine, upper)
+
+def parse_columns(strings, errors='raise', engine='regex', use_numpy=None,
+                  upper=True):
+    """Parses an iterable of METAR or SPECI text reports into a dict of
+    columns, one row per report in input order.
+
+    Columns are location, day, hour, minute, wind_direction, wind_variable,
+    wind_speed, wind_gust, wind_unit, cavok, visibility, ceiling, air,
+    dewpoint and pressure, ceiling is the lowest broken or overcast layer or
+    vertical visibility in hundreds of feet. Integer columns are
+    array.array, or numpy arrays when numpy is installed and use_numpy is
+    not False, holding MISSING for missing fields. Locations and wind units
+    are lists, or numpy object arrays.
+
+    errors is either 'raise' or 'skip', strings and upper as in parse_many.
+    """
+    if errors not in ('raise', 'skip'):
+        raise ValueError("errors must be 'raise' or 'skip' for columns")
+    return _columns.build(
+        _iparse(strings, errors, _parser(engine), upper=upper), use_numpy)
+
+def iter_file(path, errors='raise', engine='regex'):
+    """Yields the parsed reports of a raw METAR or SPECI text archive.
+
+    The file is memory mapped and read a report at a time, reports end at '='
+    terminators, blank lines or lines opening a new report, and may wrap
+    across lines. errors and engine as in parse_many.
+    """
+    _check_errors(errors)
+    reports = (text for _, _, text in _archive.file_reports(path))
+    return _iparse(reports, errors, _parser(engine, errors))
+
+CacheInfo = namedtuple('CacheInfo', 'hits misses evictions size maxsize')
+
+class ParseCache(object):
+    """Bounded LRU cache in front of parse, keyed by the report text with
+    whitespace collapsed and, unless parsed with upper False, upper cased.
+
+    On a miss the report is parsed as parse would, parse results are made of
+    tuples only, cache hits share the same immutable result. Reports that
+    differ only in whitespace share the result of the first one parsed,
+    whose unmatched text keeps that report's spacing.
+    """
+
+    def __init__(self, maxsize=4096, engine='regex'):
+        if not isinstance(maxsize, int) or maxsize < 1:
+            raise ValueError('maxsize must be a positive integer.')
+        self.maxsize = maxsize
+        self.hits = self.misses = self.evictions = 0
+        self._parser = _parser(engine)
+        self._results = OrderedDict()
+
+    def parse(self, string, upper=True):
+        """Returns the cached parse result for string, parsing on a miss,
+        string and upper as in parse"""
+        text = _text(string, upper)
+        key = ' '.join(text.split())
+        results = self._results
+        try:
+            result = results[key]
+        except KeyError:
+            pass
+        else:
+            self.hits += 1
+            results.move_to_end(key)
+            return result
+
+        self.misses += 1
+        result = self._parser(text)
+        results[key] = result
+        if len(results) > self.maxsize:
+            results.popitem(last=False)
+            self.evictions += 1
+        return result
+
+    def info(self):
+        """Returns the CacheInfo counters"""
+        return CacheInfo(self.hits, self.misses, self.evictions,
+                         len(self._results), self.maxsize)
+
+    def clear(self):
+        """Empties the cache and resets its counters"""
+        self._results.clear()
+        self.hits = self.misses = self.evictions = 0
+
+class LazyReport(object):
+    """Report decoding its wind, sky, temperature, pressure and supplementary
+    groups on first access, decoded groups are kept.
+
+    Required fields are checked when splitting the report, a LazyReport
+    decodes the same values, and compares equal to the same Report, as the
+    'regex' engine. decode returns that Report.
     """
-    metartuple = namedtuple(
-        'Metar',
-        'metartype location time reporttype report unmatched')
-    reporttuple = namedtuple(
-        'Report',
-        'wind sky temperature pressure supplementary remarks')
+    __slots__ = ('_string', '_starts', '_decoded')
+
+    _PENDING = object()
+
+    def __init__(self, string, starts):
+        self._string = string
+        self._starts = starts
+        self._decoded = [self._PENDING] * len(starts)
+
+    def _group(self, index):
+        """Returns the decoded group at index"""
+        value = self._decoded[index]
+        if value is self._PENDING:
+            parser = getattr(_p, _REPORT_GROUPS[index])
+            value, _ = parser.match(self._string, self._starts[index])
+            self._decoded[index] = value
+        return value
+
+    wind = property(lambda self: self._group(0))
+    sky = property(lambda self: self._group(1))
+    temperature = property(lambda self: self._group(2))
+    pressure = property(lambda self: self._group(3))
+    supplementary = property(lambda self: self._group(4))
+    remarks = None
+
+    def decode(self):
+        """Returns the Report with every group decoded"""
+        return Report(*[self._group(index)
+                        for index in range(len(self._starts))] + [None])
+
+    def __eq__(self, other):
+        if isinstance(other, LazyReport):
+            other = other.decode()
+        return self.decode() == other
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash(self.decode())
+
+    def __repr__(self):
+        return 'Lazy' + repr(self.decode())
+
+    def __reduce__(self):
+        return LazyReport, (self._string, self._starts)
+
+def _check_errors(errors, policies=ERRORS):
+    """Raises ValueError for an errors policy not in policies"""
+    if errors not in policies:
+        raise ValueError('Unknown errors %r, expected one of %s' %
+                         (errors, ', '.join(policies)))
 
-    metartype, string = _p.ptype(string.strip().upper())
-    location, string = _p.plocation(string)
-    time, string = _p.ptime(string)
-    reporttype, string = _p.preporttype(string)
+def _chunks(strings, chunksize):
+    """Yields (start, chunk) for consecutive lists of chunksize strings"""
+    strings = iter(strings)
+    start = 0
+    chunk = list(islice(strings, chunksize))
+    while chunk:
+        yield start, chunk
+        start += len(chunk)
+        chunk = list(islice(strings, chunksize))
+
+def _imap_chunks(func, strings, workers, chunksize, *args):
+    """Yields func((start, chunk) + args) for consecutive chunks of chunksize
+    strings, in input order, called by a pool of workers processes, or in
+    this process when workers is None"""
+    if not isinstance(chunksize, int) or chunksize < 1:
+        raise ValueError('chunksize must be a positive integer.')
+    tasks = ((start, chunk) + args
+             for start, chunk in _chunks(strings, chunksize))
+    if workers is None:
+        for task in tasks:
+            yield func(task)
+        return
+    with multiprocessing.Pool(workers) as pool:
+        for results in pool.imap(func, tasks):
+            yield results
+
+def _parse_chunk(task):
+    """Returns the list of parse results of a chunk, in a worker process"""
+    start, strings, errors, engine, upper = task
+    return list(_iparse(strings, errors, _parser(engine, errors), start,
+                        upper))
+
+def _text(string, upper=True):
+    """Returns the stripped, and with upper upper cased, str of a str or
+    ASCII bytes-like report"""
+    if not isinstance(string, str):
+        string = str(string, 'ascii', 'replace')
+    if upper:
+        return string.strip().upper()
+    return string.strip()
+
+def _iparse(strings, errors, parser, start=0, upper=True):
+    """Yields the parse results of strings, see parse_many"""
+    for index, string in enumerate(strings, start):
+        try:
+            yield parser(_text(string, upper))
+        except ValueError as error:
+            if errors == 'raise':
+                raise
+            if errors == 'collect':
+                yield ParseFailure(index, string, str(error))
+
+def _parser(engine, errors='raise'):
+    """Returns the parse function of an engine, returning ParseResult for
+    the 'diagnose' errors"""
+    if engine == 'regex':
+        return _parse_result if errors == 'diagnose' else _parse
+    if engine == 'fast':
+        return _parse_result_fast if errors == 'diagnose' else _parse_fast
+    raise ValueError('Unknown engine %r, expected one of %s' %
+                     (engine, ', '.join(ENGINES)))
+
+def _parse_result(string):
+    """Parses a stripped and upper cased report into a ParseResult with the
+    regex pipeline"""
+    values = [None] * len(_GROUPS)
+    pos = 0
+    parser = error = None
+    for index, name in enumerate(_GROUPS):
+        if index == 4 and values[3] == 'NIL':
+            break
+        try:
+            value, end = getattr(_p, name).match(string, pos)
+        except ValueError as exc:
+            parser = name
+            error = str(exc)
+            break
+        values[index] = value
+        if end != pos:
+            pos = end
+            parser = None
+        elif parser is None:
+            parser = name
+
+    unmatched = string[pos:]
+    if error is None and not _unexpected(unmatched):
+        parser = None
+    report = None
+    if values[3] != 'NIL':
+        report = Report(*(values[4:] + [None]))
+    return ParseResult(Metar(*(values[:4] + [report, unmatched])), pos,
+                       parser, error)
+
+def _parse_result_fast(string):
+    """Parses a stripped and upper cased report into a ParseResult with the
+    tokenizer, falling back to the regex pipeline"""
+    metar = _metar_tokens.parse(string)
+    if metar is None or _unexpected(metar.unmatched):
+        return _parse_result(string)
+    return ParseResult(metar, len(string) - len(metar.unmatched), None, None)
+
+def _unexpected(unmatched):
+    """True for unmatched text other than trend or remarks groups"""
+    token = unmatched.split(None, 1)[:1]
+    return bool(token) and token[0] not in _metar_tokens.TERMINATORS
+
+def _parse_lazy(string):
+    """Splits a stripped and upper cased report into a Metar of a
+    LazyReport"""
+    metartype, pos = _p.ptype.match(string)
+    location, pos = _p.plocation.match(string, pos)
+    time, pos = _p.ptime.match(string, pos)
+    reporttype, pos = _p.preporttype.match(string, pos)
 
     report = None
     if reporttype != 'NIL':
-        wind, string = _p.pwind(string)
-        sky, string = _p.psky(string)
-        temperature, string = _p.ptemperature(string)
-        pressure, string = _p.ppressure(string)
-        supplementary, string = _p.psupplementary(string)
-        report = reporttuple(wind,
-                             sky,
-                             temperature,
-                             pressure,
-                             supplementary,
-                             None)
-
-    return metartuple(metartype, location, time, reporttype, report, string)
+        starts = []
+        for name in _REPORT_GROUPS:
+            starts.append(pos)
+            pos = getattr(_p, name).span(string, pos)
+        report = LazyReport(string, tuple(starts))
+
+    return Metar(metartype, location, time, reporttype, report, string[pos:])
+
+def _parse_fast(string):
+    """Parses a stripped and upper cased report with the tokenizer, falling
+    back to the regex pipeline"""
+    metar = _metar_tokens.parse(string)
+    if metar is None:
+        return _parse(string)
+    return metar
+
+def _parse(string):
+    """Parses a stripped and upper cased report with the regex pipeline"""
+    metartype, pos = _p.ptype.match(string)
+    location, pos = _p.plocation.match(string, pos)
+    time, pos = _p.ptime.match(string, pos)
+    reporttype, pos = _p.preporttype.match(string, pos)
+
+    report = None
+    if reporttype != 'NIL':
+        wind, pos = _p.pwind.match(string, pos)
+        sky, pos = _p.psky.match(string, pos)
+        temperature, pos = _p.ptemperature.match(string, pos)
+        pressure, pos = _p.ppressure.match(string, pos)
+        supplementary, pos = _p.psupplementary.match(string, pos)
+        report = Report(wind,
+                        sky,
+                        temperature,
+                        pressure,
+                        supplementary,
+                        None)
+
+    return Metar(metartype, location, time, reporttype, report, string[pos:])
@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Aviation Weather
+
+Copyright (C) 2018  Pedro Rodrigues <prodrigues1990@gmail.com>
+
+This file is part of Aviation Weather.
+
+Aviation Weather is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, version 2 of the License.
+
+Aviation Weather is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Aviation Weather.  If not, see <http://www.gnu.org/licenses/>.
+"""
+from collections import namedtuple
+
+# Record types for parsed reports, defined once at import time. namedtuple
+# classes declare empty __slots__, instances carry no per object __dict__ and
+# are laid out as plain tuples.
+
+Metar = namedtuple(
+    'Metar',
+    'metartype location time reporttype report unmatched')
+
+Report = namedtuple(
+    'Report',
+    'wind sky temperature pressure supplementary remarks')
+
+MetarObsTime = namedtuple('MetarObsTime', 'day hour minute')
+
+Header = namedtuple('Header', 'metartype location time')
+
+Wind = namedtuple(
+    'Wind',
+    'direction speed gust unit variable_from variable_to')
+
+Visibility = namedtuple(
+    'Visibility',
+    'distance ndv min_distance min_direction')
+
+Rvr = namedtuple(
+    'Rvr',
+    'distance modifier variation variation_modifier tendency')
+
+Percipitation = namedtuple('Percipitation', 'intensity phenomena')
+
+OtherPhenomena = namedtuple('OtherPhenomena', 'intensity phenomena')
+
+Weather = namedtuple('Weather', 'precipitation obscuration other')
+
+Cloud = namedtuple('Cloud', 'amount height type')
+
+SkyConditions = namedtuple(
+    'SkyConditions',
+    'visibility rvr weather clouds verticalvis clear')
+
+Temperature = namedtuple('Temperature', 'air dewpoint')
+
+Sea = namedtuple('Sea', 'temperature state')
+
+SupplementaryInfo = namedtuple(
+    'SupplementaryInfo',
+    'recent_weather windshear sea rwy_state')
+
+Taf = namedtuple(
+    'Taf',
+    'taftype location time reporttype validity forecast changes unmatched')
+
+Period = namedtuple('Period', 'start end')
+
+Forecast = namedtuple(
+    'Forecast',
+    'wind cavok visibility weather nsw clouds verticalvis clear temperatures')
+
+ForecastTemperature = namedtuple('ForecastTemperature', 'kind air time')
+
+TafChange = namedtuple('TafChange', 'kind probability period forecast')
+
+ParseFailure = namedtuple('ParseFailure', 'index string error')
+
+ParseResult = namedtuple('ParseResult', 'metar offset parser error')
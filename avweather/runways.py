@@ -0,0 +1,183 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Aviation Weather
+
+Copyright (C) 2018  Pedro Rodrigues <prodrigues1990@gmail.com>
+
+This file is part of Aviation Weather.
+
+Aviation Weather is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, version 2 of the License.
+
+Aviation Weather is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Aviation Weather.  If not, see <http://www.gnu.org/licenses/>.
+
+Runway headwind and crosswind components of reported winds
+
+    >>> from avweather.metar import parse
+    >>> from avweather.runways import RunwayIndex
+    >>> index = RunwayIndex([('LPPT', '03', 23), ('LPPT', '21', 203)])
+    >>> [(runway.designator, runway.headwind, runway.crosswind)
+    ...  for runway in index.components(parse(
+    ...      'METAR LPPT 011200Z 34010KT 9999 12/10 Q1013'))]
+    [('03', 7, -7), ('21', -7, 7)]
+
+Runways are loaded once, from a CSV table of ICAO location, runway designator
+and true heading, and kept per location as a tuple of designators and arrays
+of the sine and cosine of their headings, components are then a couple of
+multiplications per runway.
+"""
+from array import array
+from collections import namedtuple
+import csv
+import math
+
+from ._units import knots
+
+Components = namedtuple(
+    'Components',
+    'designator headwind crosswind gust_headwind gust_crosswind '
+    'max_crosswind')
+
+# sine and cosine of every whole degree
+_SIN = tuple(math.sin(math.radians(degree)) for degree in range(361))
+_COS = tuple(math.cos(math.radians(degree)) for degree in range(361))
+
+def _round(value):
+    """Returns value rounded to an int, or None"""
+    return None if value is None else int(round(value))
+
+def _max_sine(start, end, sin, cos):
+    """Returns the largest absolute sine of the angle between a runway, of
+    heading sine and cosine, and the directions from start clockwise to
+    end"""
+    # angles of start and end relative to the runway, in [0, 360)
+    first = math.degrees(math.atan2(_SIN[start] * cos - _COS[start] * sin,
+                                    _COS[start] * cos + _SIN[start] * sin))
+    first %= 360
+    last = first + (end - start) % 360
+    if first <= 90 <= last or first <= 270 <= last or last >= 450:
+        return 1.0
+    return max(abs(_SIN[start] * cos - _COS[start] * sin),
+               abs(_SIN[end] * cos - _COS[end] * sin))
+
+class RunwayIndex(object):
+    """Runways by ICAO location, built from an iterable of (location,
+    designator, heading) rows, heading the true heading in degrees.
+    """
+
+    def __init__(self, rows=()):
+        # location to (designators, sines, cosines)
+        self._runways = {}
+        for location, designator, heading in rows:
+            self.add(location, designator, heading)
+
+    @classmethod
+    def load(cls, path):
+        """Returns the RunwayIndex of a CSV file of location, designator and
+        heading rows, a first row of column names is skipped"""
+        with open(path, newline='') as table:
+            rows = [row for row in csv.reader(table) if row]
+        if rows:
+            try:
+                float(rows[0][2])
+            except ValueError:
+                del rows[0]
+        return cls(rows)
+
+    def add(self, location, designator, heading):
+        """Adds, or replaces, the runway of a location"""
+        location = location.strip().upper()
+        designator = designator.strip().upper()
+        radians = math.radians(float(heading))
+        designators, sines, cosines = self._runways.get(
+            location, ((), array('d'), array('d')))
+        if designator in designators:
+            index = designators.index(designator)
+            sines[index] = math.sin(radians)
+            cosines[index] = math.cos(radians)
+        else:
+            designators += (designator,)
+            sines.append(math.sin(radians))
+            cosines.append(math.cos(radians))
+        self._runways[location] = designators, sines, cosines
+
+    def designators(self, location):
+        """Returns the tuple of runway designators of a location"""
+        return self._runways.get(location, ((),))[0]
+
+    def locations(self):
+        """Returns the locations with runways"""
+        return list(self._runways)
+
+    def __contains__(self, location):
+        return location in self._runways
+
+    def __len__(self):
+        return len(self._runways)
+
+    def components(self, metar):
+        """Returns the tuple of Components of every runway of the location of
+        a Metar, in knots and rounded, or () when the location has no runways
+        or the report no wind.
+
+        headwind is negative for a tailwind and crosswind positive from the
+        right. gust_headwind and gust_crosswind are None without a gust.
+        max_crosswind is the largest crosswind, at gust speed if any, over
+        the variable directions sector, or of any direction for a VRB wind,
+        None otherwise. Components of VRB winds are None, as are those of
+        directions, or variable directions, above 360 degrees.
+        """
+        runways = self._runways.get(metar.location)
+        report = metar.report
+        wind = report and report.wind
+        if runways is None or wind is None:
+            return ()
+        speed = knots(wind.speed, wind.unit)
+        if speed is None:
+            return ()
+        gust = knots(wind.gust, wind.unit)
+        strongest = speed if gust is None else gust
+
+        designators, sines, cosines = runways
+        direction = wind.direction
+        variable_from, variable_to = wind.variable_from, wind.variable_to
+        if (not isinstance(direction, int) or direction > 360 or
+                (variable_from is not None and
+                 max(variable_from, variable_to) > 360)):
+            # VRB, or directions out of range, are taken as variable
+            return tuple(
+                Components(designator, None, None, None, None,
+                           _round(strongest))
+                for designator in designators)
+
+        wind_sin, wind_cos = _SIN[direction], _COS[direction]
+        components = []
+        for designator, sin, cos in zip(designators, sines, cosines):
+            head = wind_cos * cos + wind_sin * sin
+            cross = wind_sin * cos - wind_cos * sin
+            max_crosswind = None
+            if variable_from is not None:
+                max_crosswind = _round(strongest * _max_sine(
+                    variable_from, variable_to, sin, cos))
+            components.append(Components(
+                designator,
+                _round(speed * head),
+                _round(speed * cross),
+                None if gust is None else _round(gust * head),
+                None if gust is None else _round(gust * cross),
+                max_crosswind))
+        return tuple(components)
+
+    def batch(self, metars):
+        """Returns the list of components of an iterable of Metar, in input
+        order, see components"""
+        components = self.components
+        return [components(metar) for metar in metars]
@@ -0,0 +1,175 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Aviation Weather
+
+Copyright (C) 2018  Pedro Rodrigues <prodrigues1990@gmail.com>
+
+This file is part of Aviation Weather.
+
+Aviation Weather is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, version 2 of the License.
+
+Aviation Weather is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Aviation Weather.  If not, see <http://www.gnu.org/licenses/>.
+
+Plain dict and JSON forms of parse results
+
+    >>> from avweather.metar import parse
+    >>> from avweather.serialize import to_dict, to_json
+    >>> metar = parse('METAR LPPT 011200Z 34010KT CAVOK 12/10 Q1013')
+    >>> to_dict(metar)['report']  # doctest: +ELLIPSIS
+    {'wind': {'direction': 340, 'speed': 10, ...}, 'sky': None, ...}
+    >>> to_json(metar)[:44]
+    b'{"metartype":"METAR","location":"LPPT","time'
+
+Records become dicts keyed by their field names and tuples become lists, as
+a recursive _asdict would give and JSON would load. Metar reports are
+converted by functions unpacking the known record layout, any other record,
+such as Taf, ParseFailure or ParseResult, by a generic walk of its fields.
+JSON is encoded with orjson when installed, with the json module otherwise.
+"""
+import json
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+from .metar import LazyReport
+from .records import Metar, Report
+
+_encode = json.JSONEncoder(separators=(',', ':')).encode
+
+def _time(time):
+    """Returns the dict of a MetarObsTime"""
+    if time is None:
+        return None
+    day, hour, minute = time
+    return {'day': day, 'hour': hour, 'minute': minute}
+
+def _wind(wind):
+    """Returns the dict of a Wind"""
+    if wind is None:
+        return None
+    direction, speed, gust, unit, variable_from, variable_to = wind
+    return {'direction': direction, 'speed': speed, 'gust': gust,
+            'unit': unit, 'variable_from': variable_from,
+            'variable_to': variable_to}
+
+def _phenomena(phenomena):
+    """Returns the dict of a Percipitation or OtherPhenomena"""
+    if phenomena is None:
+        return None
+    intensity, codes = phenomena
+    return {'intensity': intensity, 'phenomena': list(codes)}
+
+def _sky(sky):
+    """Returns the dict of a SkyConditions"""
+    if sky is None:
+        return None
+    visibility, rvr, weather, clouds, verticalvis, clear = sky
+    distance, ndv, min_distance, min_direction = visibility
+    precipitation, obscuration, other = weather
+    return {
+        'visibility': {'distance': distance, 'ndv': ndv,
+                       'min_distance': min_distance,
+                       'min_direction': min_direction},
+        'rvr': [[runway, {'distance': distance, 'modifier': modifier,
+                          'variation': variation,
+                          'variation_modifier': variation_modifier,
+                          'tendency': tendency}]
+                for runway, (distance, modifier, variation,
+                             variation_modifier, tendency) in rvr],
+        'weather': {'precipitation': _phenomena(precipitation),
+                    'obscuration': list(obscuration),
+                    'other': _phenomena(other)},
+        'clouds': [{'amount': amount, 'height': height, 'type': cloudtype}
+                   for amount, height, cloudtype in clouds],
+        'verticalvis': verticalvis,
+        'clear': clear,
+    }
+
+def _supplementary(supplementary):
+    """Returns the dict of a SupplementaryInfo"""
+    if supplementary is None:
+        return None
+    recent_weather, windshear, sea, rwy_state = supplementary
+    if isinstance(windshear, tuple):
+        windshear = list(windshear)
+    if sea is not None:
+        sea = {'temperature': sea[0], 'state': sea[1]}
+    return {'recent_weather': [_value(item) for item in recent_weather],
+            'windshear': windshear, 'sea': sea,
+            'rwy_state': _value(rwy_state)}
+
+def _report(report):
+    """Returns the dict of a Report or LazyReport"""
+    if report is None:
+        return None
+    if not isinstance(report, Report):
+        report = report.decode()
+    wind, sky, temperature, pressure, supplementary, remarks = report
+    if temperature is not None:
+        temperature = {'air': temperature[0], 'dewpoint': temperature[1]}
+    return {'wind': _wind(wind), 'sky': _sky(sky),
+            'temperature': temperature, 'pressure': pressure,
+            'supplementary': _supplementary(supplementary),
+            'remarks': _value(remarks)}
+
+def _metar(metar):
+    """Returns the dict of a Metar"""
+    metartype, location, time, reporttype, report, unmatched = metar
+    return {'metartype': metartype, 'location': location,
+            'time': _time(time), 'reporttype': reporttype,
+            'report': _report(report), 'unmatched': unmatched}
+
+def _value(value):
+    """Returns the plain form of any parsed value, walking record fields"""
+    if isinstance(value, Metar):
+        return _metar(value)
+    if isinstance(value, (Report, LazyReport)):
+        return _report(value)
+    if isinstance(value, tuple):
+        fields = getattr(value, '_fields', None)
+        if fields is None:
+            return [_value(item) for item in value]
+        return dict(zip(fields, [_value(item) for item in value]))
+    return value
+
+def to_dict(result):
+    """Returns the plain dict of a parse result, a Metar or any other
+    record, see the module documentation"""
+    if type(result) is Metar:  # pylint: disable=unidiomatic-typecheck
+        return _metar(result)
+    return _value(result)
+
+def to_json(result):
+    """Returns the UTF-8 JSON bytes of a parse result"""
+    if orjson is not None:
+        return orjson.dumps(to_dict(result))
+    return _encode(to_dict(result)).encode('utf-8')
+
+def write_ndjson(results, output, chunksize=1000):
+    """Writes an iterable of parse results to a binary file object, one JSON
+    object per line, chunksize lines per write. Returns the number of lines
+    written.
+    """
+    count = 0
+    lines = []
+    for result in results:
+        lines.append(to_json(result))
+        if len(lines) == chunksize:
+            output.write(b'\n'.join(lines) + b'\n')
+            count += len(lines)
+            lines = []
+    if lines:
+        output.write(b'\n'.join(lines) + b'\n')
+        count += len(lines)
+    return count
@@ -0,0 +1,133 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Aviation Weather
+
+Copyright (C) 2018  Pedro Rodrigues <prodrigues1990@gmail.com>
+
+This file is part of Aviation Weather.
+
+Aviation Weather is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, version 2 of the License.
+
+Aviation Weather is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Aviation Weather.  If not, see <http://www.gnu.org/licenses/>.
+"""
+from bisect import bisect_left
+from datetime import datetime, timedelta
+
+from .metar import parse
+from .records import Metar
+
+# how far ahead of now an observation time may be, for clock skew
+_SLACK = timedelta(hours=1)
+
+def observed(time, now):
+    """Returns the datetime of a (day, hour, minute) observation time, the
+    latest one not after now, in now's month or the months before it.
+    """
+    year, month = now.year, now.month
+    for _ in range(4):
+        try:
+            moment = datetime(year, month, time.day, time.hour, time.minute)
+        except ValueError:
+            # no such day in this month
+            moment = None
+        if moment is not None and moment <= now + _SLACK:
+            return moment
+        year, month = (year, month - 1) if month > 1 else (year - 1, 12)
+    raise ValueError('Invalid observation time %r' % (time,))
+
+class MetarStore(object):
+    """Latest report and short history per ICAO location.
+
+    Reports are ordered by observation time, a METAR COR or SPECI COR
+    replaces the report of the same type and time, other reports already
+    stored for a type and time are kept as they are.
+    """
+
+    def __init__(self, history=24, max_age=timedelta(hours=24),
+                 engine='regex'):
+        if not isinstance(history, int) or history < 1:
+            raise ValueError('history must be a positive integer.')
+        self.history_size = history
+        self.max_age = max_age
+        self.engine = engine
+        # location to a list of ((observed, type), Metar), oldest first
+        self._stations = {}
+
+    def insert(self, report, now=None):
+        """Stores a report, either text or a parsed Metar, observed before
+        now, defaults to the current UTC time. Returns True when stored.
+        """
+        if not isinstance(report, Metar):
+            report = parse(report, engine=self.engine)
+        if report.location is None or report.time is None:
+            raise ValueError('Missing location or time in metar %r' %
+                             (report,))
+        metartype = report.metartype or 'METAR'
+        key = (observed(report.time, now or datetime.utcnow()),
+               metartype[:5])
+
+        entries = self._stations.setdefault(report.location, [])
+        index = bisect_left(entries, (key,))
+        if index < len(entries) and entries[index][0] == key:
+            if not metartype.endswith('COR'):
+                return False
+            entries[index] = (key, report)
+            return True
+        if index == 0 and len(entries) >= self.history_size:
+            return False
+
+        entries.insert(index, (key, report))
+        if len(entries) > self.history_size:
+            del entries[0]
+        return True
+
+    def latest(self, location):
+        """Returns the latest Metar for a location, or None"""
+        entries = self._stations.get(location)
+        return entries[-1][1] if entries else None
+
+    def observed(self, location):
+        """Returns the observation datetime of the latest Metar for a
+        location, or None"""
+        entries = self._stations.get(location)
+        return entries[-1][0][0] if entries else None
+
+    def history(self, location):
+        """Returns the tuple of stored Metar for a location, oldest first"""
+        return tuple(report for _, report in self._stations.get(location, ()))
+
+    def evict(self, now=None, max_age=None):
+        """Removes reports observed more than max_age, defaults to the store
+        max_age, before now. Returns the number of reports removed.
+        """
+        oldest = ((now or datetime.utcnow()) -
+                  (self.max_age if max_age is None else max_age))
+        removed = 0
+        for location in list(self._stations):
+            entries = self._stations[location]
+            index = bisect_left(entries, ((oldest,),))
+            if index:
+                del entries[:index]
+                removed += index
+            if not entries:
+                del self._stations[location]
+        return removed
+
+    def locations(self):
+        """Returns the locations with stored reports"""
+        return list(self._stations)
+
+    def __contains__(self, location):
+        return location in self._stations
+
+    def __len__(self):
+        return len(self._stations)
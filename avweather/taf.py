@@ -0,0 +1,102 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Aviation Weather
+
+Copyright (C) 2018  Pedro Rodrigues <prodrigues1990@gmail.com>
+
+This file is part of Aviation Weather.
+
+Aviation Weather is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, version 2 of the License.
+
+Aviation Weather is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Aviation Weather.  If not, see <http://www.gnu.org/licenses/>.
+"""
+from . import _archive
+from . import _metar_parsers as _p
+from . import _taf_parsers as _t
+from .metar import _check_errors, _imap_chunks, _iparse, _text
+from .records import Taf
+
+ERRORS = ('raise', 'skip', 'collect')
+
+def parse(string, upper=True):
+    """Parses a TAF text report into python primitives.
+
+    Implementation based on Annex 3 to the Convetion on International Civil
+    Aviation, as published by ICAO, 16th Edition July 2007.
+
+    Wind, visibility, weather, clouds and CAVOK groups are decoded by the
+    same group parsers as METAR reports. reporttype is NIL for a missing
+    TAF, CNL for a cancelled one, with no forecast or changes either way,
+    and changes is a tuple of the FM, BECMG, TEMPO and PROB change groups.
+
+    string and upper as in metar.parse.
+    """
+    return _parse(_text(string, upper))
+
+def parse_many(strings, errors='raise', workers=None, chunksize=1000,
+               upper=True):
+    """Parses an iterable of TAF text reports, returns the list of results in
+    input order.
+
+    errors is one of 'raise', 'skip' or 'collect', workers, chunksize and
+    upper as in metar.parse_many.
+    """
+    _check_errors(errors, ERRORS)
+    if workers is None:
+        return list(_iparse(strings, errors, _parse, upper=upper))
+    results = []
+    for chunk in _imap_chunks(_parse_chunk, strings, workers, chunksize,
+                              errors, upper):
+        results.extend(chunk)
+    return results
+
+def iter_file(path, errors='raise'):
+    """Yields the parsed reports of a raw TAF text archive, split as in
+    metar.iter_file, errors as in parse_many.
+    """
+    _check_errors(errors, ERRORS)
+    reports = (text for _, _, text in _archive.file_reports(path))
+    return _iparse(reports, errors, _parse)
+
+def _parse_chunk(task):
+    """Returns the list of parse results of a chunk, in a worker process"""
+    start, strings, errors, upper = task
+    return list(_iparse(strings, errors, _parse, start, upper))
+
+def _parse(string):
+    """Parses a stripped and upper cased TAF report"""
+    taftype, pos = _t.ptaftype.match(string)
+    location, pos = _p.plocation.match(string, pos)
+    time, pos = _p.ptime.match(string, pos)
+    reporttype, pos = _p.preporttype.match(string, pos)
+    if reporttype == 'NIL':
+        return Taf(taftype, location, time, reporttype, None, None, None,
+                   string[pos:])
+
+    validity, pos = _t.pperiod.match(string, pos)
+    if validity is None:
+        raise ValueError('Missing required field validity in taf %s' %
+                         string[pos:])
+    cancelled, pos = _t.pcancelled.match(string, pos)
+    if cancelled is not None:
+        return Taf(taftype, location, time, cancelled, validity, None, None,
+                   string[pos:])
+
+    forecast, pos = _t.pforecast.match(string, pos)
+    changes = []
+    change, pos = _t.pchange.match(string, pos)
+    while change is not None:
+        changes.append(change)
+        change, pos = _t.pchange.match(string, pos)
+
+    return Taf(taftype, location, time, reporttype, validity, forecast,
+               tuple(changes), string[pos:])
@@ -0,0 +1,161 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Aviation Weather
+
+Copyright (C) 2018  Pedro Rodrigues <prodrigues1990@gmail.com>
+
+This file is part of Aviation Weather.
+
+Aviation Weather is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, version 2 of the License.
+
+Aviation Weather is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Aviation Weather.  If not, see <http://www.gnu.org/licenses/>.
+
+Seeded generator of realistic METAR and SPECI reports.
+
+Usage: python benchmarks/corpus.py [count] [seed] > corpus.txt
+
+Exercises every group decoded by avweather._metar_parsers: COR, NIL and
+AUTO reports, gusting and variable winds, NDV and minimum visibility, RVR,
+present weather, clouds, vertical visibility, sky clear, recent weather,
+windshear and sea groups.
+"""
+import random
+import sys
+
+LOCATIONS = (
+    'LPPT', 'LPPR', 'LPFR', 'LPMA', 'LPPD', 'LEMD', 'LEBL', 'EGLL', 'EHAM',
+    'LFPG', 'EDDF', 'LIRF', 'KJFK', 'KORD', 'CYYZ', 'RJTT', 'YSSY', 'FAOR',
+)
+RUNWAYS = ('03', '21', '17', '35', '08L', '26R', '09C', '27C')
+PRECIPITATION = ('DZ', 'RA', 'SN', 'SG', 'PL', 'FZDZ', 'FZRA', 'SHRA', 'SHSN',
+                 'SHGR', 'TSRA', 'TSSN', 'TSGR', 'UP')
+OBSCURATION = ('BR', 'FG', 'HZ', 'FU', 'DU', 'SA', 'BCFG', 'MIFG', 'PRFG',
+               'FZFG', 'BLSN', 'DRSN')
+OTHER = ('PO', 'FC', 'SS', 'DS', 'SQ')
+DIRECTIONS = ('N', 'NE', 'E', 'SE', 'S', 'SW', 'W', 'NW')
+
+def _temperature(value):
+    """Returns a METAR temperature"""
+    return '%s%02d' % ('M' if value < 0 else '', abs(value))
+
+def wind(rng):
+    """Returns the wind groups"""
+    if rng.random() < 0.02:
+        return ['/////KT']
+    unit = 'KMH' if rng.random() < 0.05 else 'KT'
+    speed = rng.randint(0, 35)
+    if speed < 3 and rng.random() < 0.5:
+        return ['VRB%02d%s' % (speed, unit)]
+    direction = rng.randrange(0, 360, 10)
+    gust = ''
+    if speed > 12 and rng.random() < 0.3:
+        gust = 'G%02d' % (speed + rng.randint(10, 25))
+    groups = ['%03d%02d%s%s' % (direction, speed, gust, unit)]
+    if speed > 3 and rng.random() < 0.2:
+        groups.append('%03dV%03d' % ((direction - 60) % 360,
+                                     (direction + 60) % 360))
+    return groups
+
+def sky(rng):
+    """Returns the visibility, RVR, weather and cloud groups"""
+    # pylint: disable=too-many-branches
+    if rng.random() < 0.2:
+        return ['CAVOK']
+    distance = rng.choice((9999, 9999, 9999, 8000, 6000, 4000, 2500, 1200,
+                           800, 350))
+    groups = ['%04d%s' % (distance, 'NDV' if rng.random() < 0.03 else '')]
+    if distance < 5000 and rng.random() < 0.3:
+        groups.append('%04d%s' % (distance // 2, rng.choice(DIRECTIONS)))
+    if distance < 1500:
+        for runway in rng.sample(RUNWAYS, rng.randint(1, 3)):
+            rvr = 'R%s/%s%04d' % (runway, rng.choice(('', 'P', 'M')),
+                                  rng.randrange(50, 2000, 50))
+            if rng.random() < 0.3:
+                rvr += 'V%04d' % rng.randrange(2000, 6000, 100)
+            groups.append(rvr + rng.choice(('', 'U', 'D', 'N')))
+
+    if distance < 9999 or rng.random() < 0.1:
+        if rng.random() < 0.7:
+            groups.append(rng.choice(('', '-', '+')) +
+                          rng.choice(PRECIPITATION))
+        if distance < 5000 and rng.random() < 0.6:
+            groups.append(rng.choice(OBSCURATION))
+        if rng.random() < 0.05:
+            groups.append(rng.choice(OTHER))
+
+    if distance < 1000 and rng.random() < 0.3:
+        groups.append('VV%s' % rng.choice(('001', '002', '005', '///')))
+    elif rng.random() < 0.1:
+        groups.append(rng.choice(('NSC', 'SKC', 'NCD')))
+    else:
+        height = rng.randint(1, 30)
+        for amount in rng.sample(('FEW', 'SCT', 'BKN', 'OVC'),
+                                 rng.randint(1, 4)):
+            cloudtype = rng.choice(('', '', '', '', 'CB', 'TCU'))
+            groups.append('%s%03d%s' % (amount, height, cloudtype))
+            height += rng.randint(5, 40)
+    return groups
+
+def supplementary(rng):
+    """Returns the recent weather, windshear and sea groups"""
+    groups = []
+    if rng.random() < 0.1:
+        groups.append('RE' + rng.choice(PRECIPITATION + ('TS',)))
+    if rng.random() < 0.05:
+        if rng.random() < 0.3:
+            groups.append('WS ALL RWYS')
+        else:
+            groups.append('WS ' + ' '.join(
+                'RWY' + runway for runway in rng.sample(RUNWAYS, 2)))
+    if rng.random() < 0.05:
+        groups.append('W%s/S%d' % (_temperature(rng.randint(-2, 25)),
+                                   rng.randint(0, 9)))
+    return groups
+
+def report(rng):
+    """Returns a random report"""
+    metartype = rng.choice(('METAR',) * 18 + ('SPECI', 'METAR COR'))
+    groups = [
+        metartype,
+        rng.choice(LOCATIONS),
+        '%02d%02d%02dZ' % (rng.randint(1, 28), rng.randint(0, 23),
+                           rng.choice((0, 20, 30, 50))),
+    ]
+    if rng.random() < 0.02:
+        return ' '.join(groups + ['NIL'])
+    if rng.random() < 0.1:
+        groups.append('AUTO')
+    groups += wind(rng)
+    groups += sky(rng)
+    air = rng.randint(-15, 35)
+    groups.append('%s/%s' % (_temperature(air),
+                             _temperature(air - rng.randint(0, 10))))
+    groups.append('Q%04d' % rng.randint(975, 1040))
+    groups += supplementary(rng)
+    if rng.random() < 0.2:
+        groups.append('NOSIG')
+    return ' '.join(groups)
+
+def generate(count, seed=0):
+    """Returns a list of count reports, the same for the same seed"""
+    rng = random.Random(seed)
+    return [report(rng) for _ in range(count)]
+
+def main(argv):
+    """Prints the generated reports"""
+    count = int(argv[1]) if len(argv) > 1 else 10000
+    seed = int(argv[2]) if len(argv) > 2 else 0
+    for line in generate(count, seed):
+        print(line)
+
+if __name__ == '__main__':
+    main(sys.argv)
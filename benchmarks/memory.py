@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Aviation Weather
+
+Copyright (C) 2018  Pedro Rodrigues <prodrigues1990@gmail.com>
+
+This file is part of Aviation Weather.
+
+Aviation Weather is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, version 2 of the License.
+
+Aviation Weather is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Aviation Weather.  If not, see <http://www.gnu.org/licenses/>.
+
+Memory held by parsed reports, over a large seeded corpus.
+
+Usage: python benchmarks/memory.py [count] [seed]
+
+For every engine, prints the bytes retained per parsed report, traced with
+tracemalloc, and the string objects held per report against the distinct
+strings among them, coded values shared through avweather._codes are
+counted once.
+"""
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+# pylint: disable=wrong-import-position
+from avweather import metar
+from benchmarks import corpus
+
+def retained(reports, engine):
+    """Returns (results, retained bytes per report) of parsing reports"""
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    results = metar.parse_many(reports, errors='skip', engine=engine)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return results, (current - before) / len(reports)
+
+def strings(results):
+    """Returns (string objects, distinct string objects) held by results,
+    the unmatched text of every report excluded"""
+    total = 0
+    distinct = set()
+    pending = [metar_[:-1] for metar_ in results]
+    while pending:
+        for value in pending.pop():
+            if isinstance(value, str):
+                total += 1
+                distinct.add(id(value))
+            elif isinstance(value, tuple):
+                pending.append(value)
+    return total, len(distinct)
+
+def main(argv):
+    """Runs the benchmark and prints its figures"""
+    count = int(argv[1]) if len(argv) > 1 else 200000
+    seed = int(argv[2]) if len(argv) > 2 else 0
+    reports = corpus.generate(count, seed)
+    print('reports: %d' % count)
+    for engine in metar.ENGINES:
+        results, per_report = retained(reports, engine)
+        total, distinct = strings(results)
+        print('%-6s retained %6.0f bytes/report, strings %5.2f/report, '
+              '%d distinct' % (engine, per_report, total / len(results),
+                               distinct))
+        del results
+
+if __name__ == '__main__':
+    main(sys.argv)
@@ -0,0 +1,63 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Aviation Weather
+
+Copyright (C) 2018  Pedro Rodrigues <prodrigues1990@gmail.com>
+
+This file is part of Aviation Weather.
+
+Aviation Weather is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, version 2 of the License.
+
+Aviation Weather is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Aviation Weather.  If not, see <http://www.gnu.org/licenses/>.
+
+Throughput of ``avweather.metar.parse_many`` from 1 to N worker processes.
+
+Usage: python benchmarks/parallel_scaling.py [max workers] [copies]
+
+Parses tests/lppt.metars.txt repeated copies times (default 200), with no
+pool and then with 1 to max workers (default the cpu count) processes.
+"""
+import multiprocessing
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from avweather.metar import parse_many  # pylint: disable=wrong-import-position
+
+CORPUS = os.path.join(
+    os.path.dirname(__file__), os.pardir, 'tests', 'lppt.metars.txt')
+
+def measure(reports, workers):
+    """Returns reports per second parsing reports with workers processes"""
+    start = time.perf_counter()
+    parse_many(reports, errors='collect', workers=workers, chunksize=2000)
+    return len(reports) / (time.perf_counter() - start)
+
+def main(argv):
+    """Runs the benchmark and prints its figures"""
+    max_workers = int(argv[1]) if len(argv) > 1 else multiprocessing.cpu_count()
+    copies = int(argv[2]) if len(argv) > 2 else 200
+    with open(CORPUS) as corpus:
+        reports = [line.strip() for line in corpus if line.strip()] * copies
+
+    baseline = measure(reports, None)
+    print('reports: %d, cpus: %d' % (len(reports), multiprocessing.cpu_count()))
+    print('no pool      %8.0f reports/s' % baseline)
+    for workers in range(1, max_workers + 1):
+        rate = measure(reports, workers)
+        print('%2d workers   %8.0f reports/s  %.2fx' %
+              (workers, rate, rate / baseline))
+
+if __name__ == '__main__':
+    main(sys.argv)
@@ -0,0 +1,85 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Aviation Weather
+
+Copyright (C) 2018  Pedro Rodrigues <prodrigues1990@gmail.com>
+
+This file is part of Aviation Weather.
+
+Aviation Weather is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, version 2 of the License.
+
+Aviation Weather is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Aviation Weather.  If not, see <http://www.gnu.org/licenses/>.
+
+Time and allocations per ``avweather.metar.parse`` call.
+
+Usage: python benchmarks/parse_allocations.py [corpus]
+
+The corpus defaults to tests/lppt.metars.txt, one report per line.
+"""
+import os
+import sys
+import timeit
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from avweather.metar import parse  # pylint: disable=wrong-import-position
+
+DEFAULT_CORPUS = os.path.join(
+    os.path.dirname(__file__), os.pardir, 'tests', 'lppt.metars.txt')
+
+def load(path):
+    """Returns the parseable reports in a corpus file"""
+    reports = []
+    with open(path) as corpus:
+        for line in corpus:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                parse(line)
+            except ValueError:
+                continue
+            reports.append(line)
+    return reports
+
+def allocations(reports):
+    """Returns (allocated blocks, peak bytes, retained bytes) per report"""
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    start = tracemalloc.take_snapshot()
+    results = [parse(report) for report in reports]
+    end = tracemalloc.take_snapshot()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    blocks = sum(stat.count_diff for stat in end.compare_to(start, 'filename'))
+    count = len(results)
+    return blocks / count, (peak - before) / count, (current - before) / count
+
+def main(argv):
+    """Runs the benchmark and prints its figures"""
+    reports = load(argv[1] if len(argv) > 1 else DEFAULT_CORPUS)
+    repeat = 5
+    seconds = min(timeit.repeat(
+        lambda: [parse(report) for report in reports],
+        number=1, repeat=repeat))
+    blocks, peak, retained = allocations(reports)
+
+    print('reports:            %d' % len(reports))
+    print('time per parse:     %.1f us' % (seconds / len(reports) * 1e6))
+    print('blocks per parse:   %.1f' % blocks)
+    print('peak per parse:     %.0f bytes' % peak)
+    print('retained per parse: %.0f bytes' % retained)
+
+if __name__ == '__main__':
+    main(sys.argv)
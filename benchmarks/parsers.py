@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Aviation Weather
+
+Copyright (C) 2018  Pedro Rodrigues <prodrigues1990@gmail.com>
+
+This file is part of Aviation Weather.
+
+Aviation Weather is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, version 2 of the License.
+
+Aviation Weather is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Aviation Weather.  If not, see <http://www.gnu.org/licenses/>.
+
+Microbenchmarks of every group parser in ``avweather._metar_parsers``.
+
+Usage: python benchmarks/parsers.py [repeat]
+
+Times parser.match on a representative group, in nanoseconds per call.
+"""
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+# pylint: disable=wrong-import-position
+from avweather import _metar_parsers as _p
+
+# (parser name, text matched)
+SAMPLES = (
+    ('ptype', 'METAR LPPT'),
+    ('plocation', 'LPPT 191800Z'),
+    ('ptime', '191800Z 35015KT'),
+    ('preporttype', 'AUTO 35015KT'),
+    ('pwind', '35015G28KT 320V030 9999'),
+    ('pvis', '4000 1500SW R03/0800'),
+    ('prvr', 'R03/0800V1200U R21/P2000 +RA'),
+    ('pintensity', '+RA BR'),
+    ('ppercipitation', '+SHRA BR'),
+    ('pobscuration', 'BCFG BR FEW010'),
+    ('potherphenomena', 'VCSH FEW010'),
+    ('pclouds', 'FEW010 SCT025CB BKN040 12/10'),
+    ('pverticalvis', 'VV002 12/10'),
+    ('pskyclear', 'NSC 12/10'),
+    ('psky', '4000 1500SW R03/0800U +SHRA BR FEW010 SCT025CB 12/10'),
+    ('ptemperature', 'M02/M05 Q1013'),
+    ('ppressure', 'Q1013 NOSIG'),
+    ('precentweather', 'RETSRA WS RWY03'),
+    ('pwindshear', 'WS RWY03 RWY21 W15/S3'),
+    ('psea', 'W15/S3 NOSIG'),
+    ('psupplementary', 'RERA WS ALL RWYS W15/S3 NOSIG'),
+)
+
+def run(repeat=5, number=20000):
+    """Returns {parser name: nanoseconds per call}, best of repeat"""
+    results = {}
+    for name, text in SAMPLES:
+        match = getattr(_p, name).match
+        # pylint: disable=cell-var-from-loop
+        seconds = min(timeit.repeat(lambda: match(text, 0),
+                                    number=number, repeat=repeat))
+        results[name] = seconds / number * 1e9
+    return results
+
+def main(argv):
+    """Runs the benchmark and prints its figures"""
+    repeat = int(argv[1]) if len(argv) > 1 else 5
+    for name, nanoseconds in sorted(run(repeat).items()):
+        print('%-16s %8.0f ns' % (name, nanoseconds))
+
+if __name__ == '__main__':
+    main(sys.argv)
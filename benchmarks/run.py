@@ -0,0 +1,162 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Aviation Weather
+
+Copyright (C) 2018  Pedro Rodrigues <prodrigues1990@gmail.com>
+
+This file is part of Aviation Weather.
+
+Aviation Weather is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, version 2 of the License.
+
+Aviation Weather is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Aviation Weather.  If not, see <http://www.gnu.org/licenses/>.
+
+Benchmark suite, results are stored as JSON to compare between commits.
+
+Usage: python benchmarks/run.py [-o results.json] [--compare base.json]
+
+Runs the group parser microbenchmarks, see benchmarks/parsers.py, and the
+end to end throughput and memory figures of ``avweather.metar`` over a
+seeded synthetic corpus, see benchmarks/corpus.py.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import timeit
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+# pylint: disable=wrong-import-position
+from avweather import metar
+from benchmarks import corpus, parsers
+
+def revision():
+    """Returns the git commit of the working tree or None"""
+    try:
+        output = subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            stderr=subprocess.DEVNULL)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return output.decode('ascii').strip()
+
+def throughput(func, reports, repeat):
+    """Returns reports per second of func(reports), best of repeat"""
+    seconds = min(timeit.repeat(lambda: func(reports),
+                                number=1, repeat=repeat))
+    return len(reports) / seconds
+
+def memory(func, reports):
+    """Returns (peak bytes, retained bytes) per report of func(reports)"""
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    results = func(reports)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del results
+    count = len(reports)
+    return (peak - before) / count, (current - before) / count
+
+def _parse_all(engine):
+    """Returns a function parsing a list of reports one by one"""
+    def parse_all(reports):
+        """Returns the list of parsed reports"""
+        return [metar.parse(report, engine=engine) for report in reports]
+    return parse_all
+
+def end_to_end(reports, repeat):
+    """Returns {case: figures} for the avweather.metar entry points"""
+    cases = {}
+    for engine in metar.ENGINES:
+        cases['parse[%s]' % engine] = _parse_all(engine)
+        cases['parse_many[%s]' % engine] = (
+            lambda reports, engine=engine: metar.parse_many(
+                reports, errors='collect', engine=engine))
+        cases['parse_columns[%s]' % engine] = (
+            lambda reports, engine=engine: metar.parse_columns(
+                reports, engine=engine, use_numpy=False))
+
+    results = {}
+    for name, func in sorted(cases.items()):
+        rate = throughput(func, reports, repeat)
+        peak, retained = memory(func, reports)
+        results[name] = {
+            'reports_per_second': rate,
+            'us_per_report': 1e6 / rate,
+            'peak_bytes_per_report': peak,
+            'retained_bytes_per_report': retained,
+        }
+    return results
+
+def run(count=10000, seed=0, repeat=5):
+    """Returns the suite results as a JSON serializable dict"""
+    reports = corpus.generate(count, seed)
+    return {
+        'revision': revision(),
+        'time': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'corpus': {'count': count, 'seed': seed},
+        'parsers_ns_per_call': parsers.run(repeat),
+        'end_to_end': end_to_end(reports, repeat),
+    }
+
+def compare(base, results):
+    """Returns the lines comparing results to the base results, ratios above
+    1.0 are slower or larger than base"""
+    lines = []
+    for name, nanoseconds in sorted(results['parsers_ns_per_call'].items()):
+        before = base.get('parsers_ns_per_call', {}).get(name)
+        if before:
+            lines.append('%-44s %8.0f ns  %5.2fx' %
+                         (name, nanoseconds, nanoseconds / before))
+    for name, figures in sorted(results['end_to_end'].items()):
+        before = base.get('end_to_end', {}).get(name)
+        if not before:
+            continue
+        for key in ('us_per_report', 'peak_bytes_per_report'):
+            lines.append('%-44s %8.1f     %5.2fx' % (
+                '%s %s' % (name, key), figures[key],
+                figures[key] / before[key] if before[key] else 0))
+    return lines
+
+def main(argv):
+    """Runs the suite, writes its JSON and compares it to a base run"""
+    parser = argparse.ArgumentParser(prog=argv[0],
+                                     description='Runs the benchmark suite')
+    parser.add_argument('-o', '--output', help='JSON results file, or stdout')
+    parser.add_argument('--compare', help='JSON results of a base run')
+    parser.add_argument('--count', type=int, default=10000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args(argv[1:])
+
+    results = run(args.count, args.seed, args.repeat)
+    if args.output:
+        with open(args.output, 'w') as output:
+            json.dump(results, output, indent=2, sort_keys=True)
+    else:
+        json.dump(results, sys.stdout, indent=2, sort_keys=True)
+        print()
+    if args.compare:
+        with open(args.compare) as base:
+            base = json.load(base)
+        for line in compare(base, results):
+            print(line, file=sys.stderr)
+
+if __name__ == '__main__':
+    main(sys.argv)
@@ -36,14 +36,17 @@ setup(
     author_email = 'prodrigues1990@gmail.com',
     license = 'GPLv2',
     url = 'https://github.com/pedro2555/avweather',
+    python_requires = '>=3.6',
     install_requires = [],
+    entry_points = {
+        'console_scripts': ['avweather = avweather.__main__:main'],
+    },
     classifiers = [
         'Development Status :: 2 - Pre-Alpha',
         'Intended Audience :: Developers',
         'License :: OSI Approved :: GNU General Public License v2 (GPLv2)',
         'Natural Language :: English',
         'Programming Language :: Python :: 3',
-        'Programming Language :: Python :: 3.5',
         'Programming Language :: Python :: 3.6',
     ],
     test_suite = 'tests',
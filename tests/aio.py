@@ -0,0 +1,155 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Aviation Weather
+
+Copyright (C) 2018  Pedro Rodrigues <prodrigues1990@gmail.com>
+
+This file is part of Aviation Weather.
+
+Aviation Weather is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, version 2 of the License.
+
+Aviation Weather is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Aviation Weather.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import asyncio
+import os
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from avweather import taf
+from avweather.aio import parse_stream, parse_taf_stream
+from avweather.metar import parse_many
+from avweather.records import ParseFailure
+
+CORPUS = os.path.join(os.path.dirname(__file__), 'lppt.metars.txt')
+
+def _lines():
+    """Returns the lines of the test corpus, and a report missing visibility
+    """
+    with open(CORPUS, 'rb') as corpus:
+        return corpus.readlines() + [
+            b'METAR LPPT 191800Z 35015KT FEW040TCU 11/06 Q1016\n']
+
+async def _collect(stream):
+    """Returns the list of items of an async iterable"""
+    return [item async for item in stream]
+
+class AioTests(unittest.TestCase):
+
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        self.expected = parse_many(
+            [line.decode().strip() for line in _lines()], errors='collect')
+
+    def tearDown(self):
+        self.loop.close()
+        asyncio.set_event_loop(None)
+
+    def feed(self, **kwargs):
+        """Returns the reports parsed from a local TCP feed of the corpus"""
+        async def serve(_, writer):
+            for line in _lines():
+                writer.write(line)
+                await writer.drain()
+            writer.close()
+
+        async def ingest():
+            server = await asyncio.start_server(serve, '127.0.0.1', 0)
+            port = server.sockets[0].getsockname()[1]
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            try:
+                return await _collect(parse_stream(reader, **kwargs))
+            finally:
+                writer.close()
+                server.close()
+                await server.wait_closed()
+
+        return self.loop.run_until_complete(ingest())
+
+    def test_parse_stream_tcp(self):
+        test = self.feed(errors='collect', engine='fast')
+
+        self.assertEqual(test, self.expected)
+        self.assertIsInstance(test[-1], ParseFailure)
+        self.assertEqual(test[-1].index, len(test) - 1)
+
+    def test_parse_stream_tcp_executor(self):
+        with ThreadPoolExecutor(2) as executor:
+            test = self.feed(errors='collect', executor=executor, batch_size=7)
+
+        self.assertEqual(test, self.expected)
+
+    def test_parse_stream_raise(self):
+        with self.assertRaises(ValueError):
+            self.feed()
+
+    def test_parse_stream_lines(self):
+        async def lines():
+            yield 'METAR LPPT 010130Z 34003KT 9999\n'
+            yield ' SCT022 10/07 Q1018=\n'
+            yield 'METAR A000 010000Z NIL'
+
+        test = self.loop.run_until_complete(_collect(parse_stream(lines())))
+
+        self.assertEqual([metar.location for metar in test], ['LPPT', 'A000'])
+        self.assertEqual(test[0].report.pressure, 1018)
+
+    def test_parse_stream_backpressure(self):
+        read = []
+
+        async def lines():
+            for line in _lines():
+                read.append(line)
+                yield line
+
+        async def first():
+            stream = parse_stream(lines(), maxsize=4, batch_size=2)
+            await stream.__anext__()
+            await asyncio.sleep(0.01)
+            count = len(read)
+            await stream.aclose()
+            return count
+
+        count = self.loop.run_until_complete(first())
+
+        # reports queued, batched, and one being split
+        self.assertLessEqual(count, 4 + 2 + 2)
+
+    def test_parse_stream_source_error(self):
+        async def lines():
+            yield 'METAR A000 010000Z NIL\n'
+            raise IOError('feed lost')
+
+        with self.assertRaisesRegex(IOError, 'feed lost'):
+            self.loop.run_until_complete(_collect(parse_stream(lines())))
+
+    def test_parse_taf_stream(self):
+        reports = ('TAF LPPT 121100Z 1212/1318 32012KT 9999 FEW020 '
+                   'BECMG 1218/1220 VRB03KT',
+                   'TAF KJFK 121130Z 1212/1318 18010KT 6000 -RA OVC008',
+                   'TAF LPPT 121100Z 32012KT')
+
+        async def lines():
+            yield reports[0][:40] + '\n'
+            yield '      ' + reports[0][40:] + '=\n'
+            for report in reports[1:]:
+                yield report.encode('ascii') + b'=\n'
+
+        test = self.loop.run_until_complete(_collect(
+            parse_taf_stream(lines(), errors='collect')))
+
+        self.assertEqual(test[:2], [taf.parse(reports[0]),
+                                    taf.parse(reports[1])])
+        self.assertIsInstance(test[2], ParseFailure)
+        with self.assertRaises(ValueError):
+            self.loop.run_until_complete(_collect(
+                parse_taf_stream(lines(), errors='diagnose')))
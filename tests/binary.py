@@ -0,0 +1,96 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Aviation Weather
+
+Copyright (C) 2018  Pedro Rodrigues <prodrigues1990@gmail.com>
+
+This file is part of Aviation Weather.
+
+Aviation Weather is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, version 2 of the License.
+
+Aviation Weather is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Aviation Weather.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from avweather import binary
+from avweather.metar import parse
+from benchmarks import corpus
+
+from .metar import CORPUS
+
+def _parsed(strings):
+    """Returns the parse results of the parseable strings"""
+    metars = []
+    for string in strings:
+        try:
+            metars.append(parse(string))
+        except ValueError:
+            pass
+    return metars
+
+class BinaryTests(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'metars.bin')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_round_trip(self):
+        metars = _parsed(CORPUS + tuple(corpus.generate(2000, seed=2)))
+        self.assertEqual(binary.dump(metars, self.path), len(metars))
+        loaded = binary.load(self.path)
+        self.assertEqual(loaded, metars)
+        self.assertEqual([repr(metar) for metar in loaded],
+                         [repr(metar) for metar in metars])
+
+    def test_reader(self):
+        metars = _parsed(CORPUS[:20])
+        with binary.Writer(self.path) as writer:
+            for metar in metars:
+                writer.write(metar)
+            writer.write(parse(CORPUS[0], lazy=True))
+        with binary.Reader(self.path) as reader:
+            self.assertEqual(len(reader), 21)
+            self.assertEqual(reader[5], metars[5])
+            self.assertEqual(reader[-1], metars[0])
+            self.assertEqual(list(reader)[:20], metars)
+            with self.assertRaises(IndexError):
+                reader[21]  # pylint: disable=pointless-statement
+
+    def test_empty(self):
+        self.assertEqual(binary.dump([], self.path), 0)
+        self.assertEqual(binary.load(self.path), [])
+
+    def test_invalid(self):
+        with open(self.path, 'wb') as output:
+            output.write(b'METAR LPPT 011200Z NIL\n' * 4)
+        with self.assertRaisesRegexp(ValueError, 'Not an avweather'):
+            binary.Reader(self.path)
+
+        binary.dump([parse(CORPUS[0])], self.path)
+        with open(self.path, 'r+b') as output:
+            output.seek(4)
+            output.write(b'\x09\x00')
+        with self.assertRaisesRegexp(ValueError, 'Unsupported'):
+            binary.Reader(self.path)
+
+    def test_size(self):
+        metars = _parsed(corpus.generate(500, seed=3))
+        binary.dump(metars, self.path)
+        encoded = sum(len(json.dumps(metar)) for metar in metars)
+        self.assertLess(os.path.getsize(self.path), encoded / 2)
@@ -0,0 +1,107 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Aviation Weather
+
+Copyright (C) 2018  Pedro Rodrigues <prodrigues1990@gmail.com>
+
+This file is part of Aviation Weather.
+
+Aviation Weather is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, version 2 of the License.
+
+Aviation Weather is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Aviation Weather.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import unittest
+from ddt import ddt
+from ddt import data
+from ddt import unpack
+
+from avweather.changes import ChangeDetector, Thresholds, state
+from avweather.metar import parse
+
+BASE = 'METAR LPPT 011200Z 34015KT 9999 FEW010 BKN030 12/10 Q1013'
+
+@ddt
+class ChangeDetectorTests(unittest.TestCase):
+
+    def changes(self, *reports, **kwargs):
+        detector = ChangeDetector(**kwargs)
+        changes = []
+        for report in reports:
+            changes.extend(detector.feed(parse(report)))
+        return [(change.kind, change.old, change.new) for change in changes]
+
+    @unpack
+    @data(
+        ('METAR LPPT 011230Z 34015KT 9999 FEW010 BKN030 12/10 Q1013', []),
+        ('METAR LPPT 011230Z 10015KT 9999 FEW010 BKN030 12/10 Q1013',
+         [('wind_direction', 340, 100)]),
+        ('METAR LPPT 011230Z 30015KT 9999 FEW010 BKN030 12/10 Q1013', []),
+        ('METAR LPPT 011230Z 34025KT 9999 FEW010 BKN030 12/10 Q1013',
+         [('wind_speed', 15, 25)]),
+        ('METAR LPPT 011230Z 34046KMH 9999 FEW010 BKN030 12/10 Q1013',
+         [('wind_speed', 15, 25)]),
+        ('METAR LPPT 011230Z VRB03KT 9999 FEW010 BKN030 12/10 Q1013',
+         [('wind_speed', 15, 3)]),
+        ('METAR LPPT 011230Z 34015KT 4000 FEW010 BKN030 12/10 Q1013',
+         [('visibility', 10000, 4000)]),
+        ('METAR LPPT 011230Z 34015KT 6000 FEW010 BKN030 12/10 Q1013', []),
+        ('METAR LPPT 011230Z 34015KT 9999 FEW010 BKN008 12/10 Q1013',
+         [('ceiling', 30, 8)]),
+        ('METAR LPPT 011230Z 34015KT 9999 FEW010 SCT030 12/10 Q1013', []),
+        ('METAR LPPT 011230Z 34015KT 0500 FG VV002 12/10 Q1013',
+         [('visibility', 10000, 500), ('ceiling', 30, 2)]),
+        ('METAR LPPT 011230Z 34015KT 9999 -RA FEW010 BKN030 12/10 Q1013',
+         [('precipitation', False, True)]),
+        ('METAR LPPT 011230Z 34015KT 9999 TSRA FEW010 BKN030 12/10 Q1013',
+         [('precipitation', False, True), ('thunderstorm', False, True)]),
+        ('METAR LPPT 011230Z 34015KT 9999 TS FEW010 BKN030 12/10 Q1013',
+         [('thunderstorm', False, True)]),
+        ('METAR LPPT 011230Z 34015KT CAVOK 12/10 Q1013', []),
+        ('METAR LPPT 011230Z NIL', []),
+    )
+    def test_changes(self, report, expected):
+        self.assertEqual(self.changes(BASE, report), expected)
+
+    def test_end(self):
+        self.assertEqual(
+            self.changes('METAR LPPT 011200Z 34015KT 9999 +TSRA 12/10 Q1013',
+                         BASE),
+            [('precipitation', True, False), ('thunderstorm', True, False)])
+        self.assertEqual(
+            self.changes('METAR LPPT 011200Z 34015KT 9999 BKN008 12/10 Q1013',
+                         'METAR LPPT 011200Z 34015KT CAVOK 12/10 Q1013'),
+            [('ceiling', 8, None)])
+
+    def test_locations(self):
+        self.assertEqual(
+            self.changes(BASE, BASE.replace('LPPT', 'LPPR').replace(
+                '9999', '2000'), BASE),
+            [])
+
+    def test_thresholds(self):
+        thresholds = Thresholds(30, 5, 5, (5000,), ())
+        self.assertEqual(
+            self.changes(BASE,
+                         BASE.replace('34015KT', '30020KT'),
+                         BASE.replace('BKN030', 'BKN005'),
+                         thresholds=thresholds),
+            [('wind_direction', 340, 300), ('wind_speed', 15, 20),
+             ('wind_direction', 300, 340), ('wind_speed', 20, 15)])
+
+    def test_state(self):
+        self.assertEqual(state(parse(BASE)), (340, 15, 10000, 30, False,
+                                              False))
+        detector = ChangeDetector()
+        detector.feed(parse(BASE))
+        self.assertEqual(len(detector), 1)
+        detector.reset()
+        self.assertEqual(len(detector), 0)
@@ -0,0 +1,144 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Aviation Weather
+
+Copyright (C) 2018  Pedro Rodrigues <prodrigues1990@gmail.com>
+
+This file is part of Aviation Weather.
+
+Aviation Weather is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, version 2 of the License.
+
+Aviation Weather is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Aviation Weather.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import csv
+import gzip
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from unittest import mock
+from ddt import ddt
+from ddt import data
+
+from avweather.__main__ import FIELDS, main
+
+ARCHIVE = (
+    b'METAR LPPT 011200Z 34010KT 9999 FEW020 BKN030 12/10 Q1013=\n'
+    b'METAR LPPR 011200Z\n'
+    b'      VRB02KT CAVOK 15/08 Q1020=\n'
+    b'METAR LPFR 011200Z 34010KT FEW020 12/10 Q1013=\n'
+)
+
+@ddt
+class MainTests(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.output = os.path.join(self.directory.name, 'output')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def archive(self, name, content=ARCHIVE):
+        path = os.path.join(self.directory.name, name)
+        opener = gzip.open if name.endswith('.gz') else open
+        with opener(path, 'wb') as archive:
+            archive.write(content)
+        return path
+
+    def read(self):
+        with open(self.output) as output:
+            return output.read()
+
+    @data('reports.txt', 'reports.gz')
+    def test_ndjson(self, name):
+        status = main([self.archive(name), '-o', self.output])
+
+        self.assertEqual(status, 0)
+        test = [json.loads(line) for line in self.read().splitlines()]
+        self.assertEqual([row['location'] for row in test], ['LPPT', 'LPPR'])
+        self.assertEqual(sorted(test[0]), sorted(FIELDS))
+        self.assertEqual(test[0]['ceiling'], 30)
+        self.assertEqual(test[1]['cavok'], True)
+        self.assertEqual(test[1]['visibility'], None)
+
+    @data(None, '2')
+    def test_csv_fields(self, workers):
+        argv = [self.archive('reports.txt'), self.archive('more.gz'),
+                '-o', self.output, '-f', 'csv', '--fields',
+                'location,wind_speed,pressure', '--chunksize', '1']
+        if workers is not None:
+            argv += ['--workers', workers]
+
+        main(argv)
+
+        test = list(csv.reader(io.StringIO(self.read())))
+        self.assertEqual(test, [['location', 'wind_speed', 'pressure'],
+                                ['LPPT', '10', '1013'],
+                                ['LPPR', '2', '1020'],
+                                ['LPPT', '10', '1013'],
+                                ['LPPR', '2', '1020']])
+
+    def test_stdin(self):
+        stdin = mock.Mock(buffer=io.BytesIO(gzip.compress(ARCHIVE)))
+        with mock.patch('sys.stdin', stdin):
+            main(['-o', self.output, '--fields', 'location'])
+
+        self.assertEqual(self.read().splitlines(),
+                         ['{"location":"LPPT"}', '{"location":"LPPR"}'])
+
+    def test_stats(self):
+        with mock.patch('sys.stderr', io.StringIO()) as stderr:
+            main([self.archive('reports.txt'), '-o', self.output,
+                  '--stats'])
+
+        test = stderr.getvalue()
+        self.assertIn('reports:  3\n', test)
+        self.assertIn('failures: 1\n', test)
+        self.assertIn('reports/s', test)
+        self.assertIn('psky', test)
+
+    def test_fields_unknown(self):
+        with mock.patch('sys.stderr', io.StringIO()):
+            with self.assertRaises(SystemExit):
+                main(['--fields', 'location,remarks'])
+
+    def test_missing_file(self):
+        missing = os.path.join(self.directory.name, 'missing.txt')
+        with mock.patch('sys.stderr', io.StringIO()) as stderr:
+            self.assertEqual(main([missing, '-o', self.output]), 1)
+
+        self.assertIn('No such file or directory', stderr.getvalue())
+        self.assertIn(missing, stderr.getvalue())
+
+    def test_module_missing_file(self):
+        process = subprocess.run(
+            [sys.executable, '-m', 'avweather', '/nonexistent'],
+            stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+            cwd=os.path.join(os.path.dirname(__file__), os.pardir))
+
+        self.assertEqual(process.returncode, 1)
+        self.assertEqual(process.stdout, b'')
+        self.assertNotIn(b'Traceback', process.stderr)
+
+    def test_module(self):
+        process = subprocess.run(
+            [sys.executable, '-m', 'avweather', '--fields', 'location'],
+            input=ARCHIVE, stdout=subprocess.PIPE,
+            cwd=os.path.join(os.path.dirname(__file__), os.pardir))
+
+        self.assertEqual(process.returncode, 0)
+        self.assertEqual(process.stdout.splitlines(),
+                         [b'{"location":"LPPT"}', b'{"location":"LPPR"}'])
@@ -0,0 +1,113 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Aviation Weather
+
+Copyright (C) 2018  Pedro Rodrigues <prodrigues1990@gmail.com>
+
+This file is part of Aviation Weather.
+
+Aviation Weather is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, version 2 of the License.
+
+Aviation Weather is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Aviation Weather.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import math
+import unittest
+from ddt import ddt
+from ddt import data
+from ddt import unpack
+
+from avweather.derived import (
+    IFR, LIFR, MVFR, VFR, derive, flight_category, knots, pressure_altitude,
+    relative_humidity, spread)
+from avweather.metar import MISSING, parse_columns
+from avweather._columns import numpy
+
+STRINGS = (
+    'METAR LPPT 011200Z 34010KT 9999 FEW020 12/10 Q1013',
+    'METAR LPPT 011200Z 34020G37KMH 5000 -RA BKN012 12/12 Q0995',
+    'METAR LPPT 011200Z 34010KT 2000 BR OVC006 M05/M07 Q1030',
+    'METAR LPPT 011200Z 34010KT 0800 FG VV002 08/08 Q1013',
+    'METAR LPPR 011200Z VRB01KT CAVOK 20/05 Q1020',
+    'METAR LPPT 011200Z 34010KT 9999 SCT010 BKN030 12/10 Q1013',
+    'METAR LPPT 011200Z NIL',
+)
+
+@ddt
+class DerivedTests(unittest.TestCase):
+
+    def columns(self, strings, use_numpy, **kwargs):
+        """Returns parse_columns of strings, skipping numpy columns without
+        numpy installed"""
+        if use_numpy and numpy is None:
+            self.skipTest('numpy is not installed')
+        return parse_columns(strings, use_numpy=use_numpy, **kwargs)
+
+    @data(True, False)
+    def test_derive(self, use_numpy):
+        columns = self.columns(STRINGS, use_numpy)
+
+        test = derive(columns)
+
+        self.assertEqual(list(test['spread']),
+                         [2, 0, 2, 0, 15, 2, MISSING])
+        self.assertEqual(list(test['wind_speed_kt']),
+                         [10, 11, 10, 10, 1, 10, MISSING])
+        self.assertEqual(list(test['wind_gust_kt']),
+                         [MISSING, 20, MISSING, MISSING, MISSING, MISSING,
+                          MISSING])
+        self.assertEqual(list(test['pressure_altitude']),
+                         [7, 502, -454, 7, -184, 7, MISSING])
+        self.assertEqual(list(test['flight_category']),
+                         [VFR, MVFR, IFR, LIFR, VFR, MVFR, MISSING])
+        humidity = list(test['relative_humidity'])
+        self.assertAlmostEqual(humidity[0], 87.6, 1)
+        self.assertAlmostEqual(humidity[1], 100)
+        self.assertTrue(math.isnan(humidity[6]))
+
+    @data(True, False)
+    def test_derive_engines(self, use_numpy):
+        fast = derive(self.columns(STRINGS, use_numpy, engine='fast'))
+        regex = derive(self.columns(STRINGS, use_numpy))
+
+        self.assertEqual(list(fast['flight_category']),
+                         list(regex['flight_category']))
+
+    @data(True, False)
+    def test_pressure_altitude_elevation(self, use_numpy):
+        columns = self.columns(STRINGS[:2], use_numpy)
+
+        test = pressure_altitude(columns['pressure'], 374)
+
+        self.assertEqual(list(test), [381, 876])
+
+    @unpack
+    @data(
+        (10000, MISSING, 0, VFR),
+        (8000, MISSING, 0, MVFR),
+        (10000, 31, 0, VFR),
+        (10000, 30, 0, MVFR),
+        (10000, 10, 0, MVFR),
+        (10000, 9, 0, IFR),
+        (1600, MISSING, 0, LIFR),
+        (10000, 4, 0, LIFR),
+        (MISSING, MISSING, 1, VFR),
+        (MISSING, MISSING, 0, MISSING),
+    )
+    def test_flight_category(self, visibility, ceiling, cavok, expected):
+        test = flight_category([visibility], [ceiling], [cavok])
+
+        self.assertEqual(list(test), [expected])
+
+    def test_pure_python(self):
+        self.assertEqual(list(spread([12, MISSING], [10, 3])), [2, MISSING])
+        self.assertEqual(list(knots([37, 10], ['KMH', 'KT'])), [20, 10])
+        self.assertAlmostEqual(relative_humidity([10], [10])[0], 100)
@@ -0,0 +1,44 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Aviation Weather
+
+Copyright (C) 2018  Pedro Rodrigues <prodrigues1990@gmail.com>
+
+This file is part of Aviation Weather.
+
+Aviation Weather is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, version 2 of the License.
+
+Aviation Weather is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Aviation Weather.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import doctest
+import unittest
+from ddt import ddt
+from ddt import data
+
+from avweather import _parsers
+from avweather import binary
+from avweather import changes
+from avweather import derived
+from avweather import index
+from avweather import instrument
+from avweather import runways
+from avweather import serialize
+
+@ddt
+class DocTests(unittest.TestCase):
+
+    @data(_parsers, instrument, binary, index, changes, derived, runways, serialize)
+    def test_examples(self, module):
+        failed, attempted = doctest.testmod(module)
+
+        self.assertEqual(failed, 0)
+        self.assertGreater(attempted, 0)
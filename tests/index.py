@@ -0,0 +1,140 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Aviation Weather
+
+Copyright (C) 2018  Pedro Rodrigues <prodrigues1990@gmail.com>
+
+This file is part of Aviation Weather.
+
+Aviation Weather is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, version 2 of the License.
+
+Aviation Weather is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Aviation Weather.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import os
+import shutil
+import tempfile
+import unittest
+
+from avweather import _archive
+from avweather.index import ArchiveIndex
+from avweather.metar import scan_header
+
+REPORTS = [
+    'METAR LPPT 011200Z 34010KT CAVOK 12/10 Q1013',
+    'METAR LPPR 011200Z 34010KT CAVOK 12/10 Q1013',
+    'METAR LPPT 011230Z 34010KT 9999\n    FEW010 12/10 Q1013=',
+    'SPECI LPPT 021700Z 34010KT CAVOK 12/10 Q1013',
+    '\ngarbage without a header\n',
+    'METAR\nLPPT 050000Z NIL=',
+    'METAR LPPT 300600Z 34010KT CAVOK 12/10 Q1013',
+]
+
+def _texts(path):
+    """Returns (location, day, hour, text) of every report in an archive"""
+    texts = []
+    for _, _, text in _archive.file_reports(path):
+        _, location, time = scan_header(text)
+        if location is not None and time is not None:
+            texts.append((location, time.day, time.hour, text))
+    return texts
+
+class ArchiveIndexTests(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.archive = os.path.join(self.directory, 'metars.txt')
+        self.write(REPORTS)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def write(self, reports, mode='w'):
+        with open(self.archive, mode) as archive:
+            archive.write('\n'.join(reports) + '\n')
+
+    def assertIndexed(self, index):
+        texts = _texts(self.archive)
+        self.assertEqual(len(index), len(texts))
+        for location in set(text[0] for text in texts):
+            self.assertEqual(
+                list(index.reports(location)),
+                [text for loc, _, _, text in texts if loc == location])
+
+    def test_update(self):
+        index = ArchiveIndex(self.archive)
+        self.assertEqual(index.update(), 6)
+        self.assertEqual(sorted(index.locations()), ['LPPR', 'LPPT'])
+        self.assertIndexed(index)
+        self.assertEqual(index.update(), 0)
+        self.assertIndexed(index)
+
+    def test_query(self):
+        index = ArchiveIndex(self.archive)
+        index.update()
+        self.assertEqual(list(index.reports('LPPT', (1, 12), (1, 12))),
+                         [REPORTS[0], 'METAR LPPT 011230Z 34010KT 9999 '
+                                      'FEW010 12/10 Q1013'])
+        self.assertEqual(list(index.reports('LPPT', (2, 0), (5, 23))),
+                         [REPORTS[3], 'METAR LPPT 050000Z NIL'])
+        self.assertEqual(len(index.ranges('LPPT', (30, 0), (1, 23))), 3)
+        self.assertEqual(len(index.ranges('LPPT', None, (1, 23))), 2)
+        self.assertEqual(index.ranges('LPFR'), [])
+        start, end = index.ranges('LPPR')[0]
+        with open(self.archive, 'rb') as archive:
+            archive.seek(start)
+            self.assertEqual(archive.read(end - start).decode(), REPORTS[1])
+
+    def test_location_cor(self):
+        self.write(['METAR CORA 011200Z NIL', 'METAR COR CORA 011200Z NIL'])
+        index = ArchiveIndex(self.archive)
+        self.assertEqual(index.update(), 2)
+        self.assertEqual(list(index.reports('CORA')),
+                         ['METAR CORA 011200Z NIL',
+                          'METAR COR CORA 011200Z NIL'])
+
+    def test_append(self):
+        index = ArchiveIndex(self.archive)
+        index.update()
+        self.write(['METAR LPFR 061200Z 34010KT CAVOK 12/10 Q1013'], 'a')
+        self.assertEqual(index.update(), 1)
+        self.assertIndexed(index)
+
+        # the last report continues in the appended text
+        with open(self.archive, 'a') as archive:
+            archive.write('  RERA\n')
+        self.assertEqual(index.update(), 0)
+        self.assertEqual(list(index.reports('LPFR')),
+                         ['METAR LPFR 061200Z 34010KT CAVOK 12/10 Q1013 '
+                          'RERA'])
+        self.assertIndexed(index)
+
+        reloaded = ArchiveIndex(self.archive)
+        self.assertEqual(len(reloaded), len(index))
+        self.write(['METAR LPMA 071200Z 34010KT CAVOK 12/10 Q1013'], 'a')
+        self.assertEqual(reloaded.update(), 1)
+        self.assertIndexed(reloaded)
+
+    def test_rewrite(self):
+        index = ArchiveIndex(self.archive)
+        index.update()
+        self.write(REPORTS[:2])
+        self.assertEqual(index.update(), -4)
+        self.assertIndexed(index)
+        self.write([])
+        index.update()
+        self.assertEqual(len(index), 0)
+
+    def test_invalid(self):
+        with open(self.archive + '.idx', 'wb') as output:
+            output.write(b'not an index')
+        with self.assertRaisesRegexp(ValueError, 'Not an avweather index'):
+            ArchiveIndex(self.archive)
@@ -0,0 +1,103 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Aviation Weather
+
+Copyright (C) 2018  Pedro Rodrigues <prodrigues1990@gmail.com>
+
+This file is part of Aviation Weather.
+
+Aviation Weather is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, version 2 of the License.
+
+Aviation Weather is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Aviation Weather.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import unittest
+
+from avweather import _metar_parsers as _p
+from avweather.instrument import GROUPS, GroupStats, Recorder, instrumented
+from avweather.metar import parse, parse_result
+
+METAR = 'METAR LPPT 011200Z 34010KT 9999 FEW010 12/10 Q1013 XXX'
+
+class InstrumentTests(unittest.TestCase):
+
+    def test_snapshot(self):
+        with instrumented() as recorder:
+            parse(METAR)
+            parse(METAR)
+        stats = recorder.snapshot()
+        self.assertEqual(stats['pwind'][:1], (2,))
+        self.assertEqual(stats['pwind'].matches, 2)
+        self.assertEqual(stats['pvis'].matches, 2)
+        self.assertEqual(stats['precentweather'].misses, 2)
+        self.assertEqual(stats['psupplementary'],
+                         GroupStats(2, stats['psupplementary'].nanoseconds,
+                                    0, 2, 0))
+        self.assertGreater(stats['psky'].nanoseconds,
+                           stats['pvis'].nanoseconds)
+        self.assertLessEqual(set(stats), set(GROUPS))
+
+    def test_reset(self):
+        with instrumented() as recorder:
+            parse(METAR)
+            recorder.reset()
+            self.assertEqual(recorder.snapshot(), {})
+            parse(METAR)
+        self.assertEqual(recorder.snapshot()['ptype'].calls, 1)
+
+    def test_disabled(self):
+        match = _p.pwind.match
+        recorder = Recorder()
+        with instrumented(recorder):
+            self.assertIsNot(_p.pwind.match, match)
+        self.assertIs(_p.pwind.match, match)
+        parse(METAR)
+        self.assertEqual(recorder.snapshot(), {})
+
+    def test_nested(self):
+        match = _p.pwind.match
+        with instrumented() as outer:
+            with instrumented() as inner:
+                parse(METAR)
+            parse(METAR)
+            self.assertIsNot(_p.pwind.match, match)
+        self.assertIs(_p.pwind.match, match)
+        self.assertEqual(inner.snapshot()['pwind'].calls, 1)
+        self.assertEqual(outer.snapshot()['pwind'].calls, 2)
+
+    def test_error(self):
+        string = 'METAR LPPT 011200Z 34010KT FEW010 12/10 Q1013'
+        with instrumented() as recorder:
+            with self.assertRaisesRegexp(ValueError, 'visibility'):
+                parse(string)
+            self.assertEqual(parse_result(string).parser, 'psky')
+        stats = recorder.snapshot()
+        self.assertEqual(stats['psky'],
+                         GroupStats(2, stats['psky'].nanoseconds, 0, 0, 2))
+        self.assertEqual(stats['pvis'].misses, 2)
+        self.assertNotIn('ptemperature', stats)
+
+    def test_callback(self):
+        calls = []
+        with instrumented(Recorder(lambda *call: calls.append(call))):
+            parse('METAR LPPT 011200Z 34010KT CAVOK')
+        self.assertEqual([(name, matched) for name, _, matched in calls][:3],
+                         [('ptype', True), ('plocation', True),
+                          ('ptime', True)])
+        self.assertTrue(all(ns >= 0 for _, ns, _ in calls))
+
+    def test_fast(self):
+        with instrumented() as recorder:
+            parse('METAR LPPT 011200Z 34010KT 0800 R03/0600U FEW010 12/10 '
+                  'Q1013', engine='fast')
+        stats = recorder.snapshot()
+        self.assertEqual(stats['prvr'].matches, 1)
+        self.assertNotIn('ptype', stats)
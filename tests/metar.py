@@ -19,16 +19,62 @@ GNU General Public License for more details.
 You should have received a copy of the GNU General Public License
 along with Aviation Weather.  If not, see <http://www.gnu.org/licenses/>.
 """
+import os
+import pickle
+import re
+import tempfile
 import unittest
 from ddt import ddt
 from ddt import data
 from ddt import unpack
 
-from avweather.metar import parse
+from avweather.metar import parse, parse_many, parse_columns, iter_file
+from avweather.metar import parse_chunks
+from avweather.metar import MISSING, LazyReport, ParseCache
+from avweather.metar import scan_header, scan_headers, parse_result
+from avweather.instrument import instrumented
 from avweather._metar_parsers import *
+from avweather import records
+from benchmarks import corpus
 
 from . import parser_test
 
+def _corpus():
+    """Returns the reports in lppt.metars.txt"""
+    path = os.path.join(os.path.dirname(__file__), 'lppt.metars.txt')
+    with open(path) as corpus:
+        return tuple(line.strip() for line in corpus if line.strip())
+
+CORPUS = _corpus() + (
+    'METAR A000 010000Z NIL',
+    'METAR COR A000 010000Z NIL',
+    'METAR CORA 010000Z NIL',
+    'METAR LPPT 010000Z NIL TRAILING',
+    'METAR LPPT 010000Z AUTO 00001KT CAVOK 03/M04 Q1013',
+    'METAR LPPT 270130Z 34012KT 9999 FEW011 12/10 Q1013',
+    'METAR LPPT 191800Z 35015KT FEW040TCU 11/06 Q1016',
+    'METAR LPPT 011200Z 34010KT 12/10 Q1013',
+    'METAR LPPT 011200Z 34010KT',
+    'METAR LPPT 011200Z 34010G25KT 290V350 9999 1000NE R03/0600U '
+    'R21/M0050VP1500N -RA BR FEW010 SCT020CB BKN030 OVC040 12/10 Q1013 '
+    'RERA WS RWY03 RWY21L W15/S2 NOSIG',
+    'METAR LPPT 011200Z 34010KT 9999 -RA VCSH BR FEW010 12/10 Q1013',
+    'METAR LPPT 011200Z 34010KT 9999 FEW010 FEW010 FEW010 FEW010 FEW010 '
+    '12/10 Q1013',
+    'METAR LPPT 011200Z 34010KT  290V350 9999 12/10 Q1013',
+    'METAR LPPT 011200Z 34010KT 290V3500 9999 12/10 Q1013',
+    'METAR LPPT 011200Z 34010KT CAVOK FEW010 12/10 Q1013',
+    'METAR LPPT 011200Z 34010KT 35010KT 9999 12/10 Q1013',
+    'METAR LPPT 011200Z 34010KT 9999NDV 1000NX 12/10 Q1013',
+    'METAR LPPT 011200Z 34010KT 0800 +TSRA FG VV002 M01/M02 Q0998 WS ALL RWYS',
+    'METAR LPPT 011200Z AUTO /////KT 9999 NCD 12/10 Q1013 WM01/S3',
+    'SPECI LPPT 011200Z VRB02KMH 9999 NSC M02/M05 Q1013 RE',
+    'SPECI LPPT 011200Z 34010KT 9999 SKC 12/10 Q1013  XYZ',
+    'SPECI KJFK 011200Z 34010G25KT 1600 R04R/P6000 FZFG VV001 M01/M02 '
+    'A2992 RMK AO2',
+    'metar lppt 011200z 34010kt 9999 few010 12/10 q1013',
+)
+
 @ddt
 class MetarTests(unittest.TestCase):
 
@@ -46,6 +92,419 @@ class MetarTests(unittest.TestCase):
             self.assertIs(test.report, None)
         self.assertEqual(test.unmatched, '')
 
+    @data(*CORPUS)
+    def test_p_engine_fast(self, string):
+        try:
+            expected = parse(string, engine='regex')
+        except ValueError as error:
+            with self.assertRaisesRegexp(ValueError, re.escape(str(error))):
+                parse(string, engine='fast')
+        else:
+            self.assertEqual(parse(string, engine='fast'), expected)
+
+    @data(*CORPUS)
+    def test_p_lazy(self, string):
+        try:
+            expected = parse(string)
+        except ValueError as error:
+            with self.assertRaisesRegexp(ValueError, re.escape(str(error))):
+                parse(string, lazy=True)
+        else:
+            metar = parse(string, lazy=True)
+            self.assertEqual(metar, expected)
+            if metar.report is not None:
+                self.assertIsInstance(metar.report, LazyReport)
+                self.assertEqual(metar.report.decode(), expected.report)
+                self.assertEqual(pickle.loads(pickle.dumps(metar)), expected)
+
+    def test_p_lazy_access(self):
+        string = 'METAR LPPT 011200Z 34010KT 9999 FEW010 12/10 Q1013 RERA'
+        with instrumented() as recorder:
+            metar = parse(string, lazy=True)
+            self.assertEqual(metar.report.pressure, 1013)
+            self.assertEqual(metar.report.pressure, 1013)
+        self.assertEqual(sorted(recorder.snapshot()),
+                         ['plocation', 'ppressure', 'preporttype', 'ptime',
+                          'ptype'])
+        self.assertEqual(recorder.snapshot()['ppressure'].calls, 1)
+        self.assertEqual(metar.report.supplementary.recent_weather,
+                         (('RA',),))
+        self.assertEqual(metar.report.remarks, None)
+
+    @data(*CORPUS)
+    def test_scan_header(self, string):
+        buf = string.strip().upper()
+        metartype, pos = ptype.match(buf)
+        location, pos = plocation.match(buf, pos)
+        time, pos = ptime.match(buf, pos)
+        self.assertEqual(scan_header(string), (metartype, location, time))
+
+    @data('', '   ', 'METAR', 'METAR COR', 'speci lppt 0112', '=',
+          'METAR LPPT 011200Z \x00\xff garbage', '010203Z METAR')
+    def test_scan_header_malformed(self, string):
+        header = scan_header(string)
+        self.assertEqual(len(header), 3)
+
+    def test_scan_headers(self):
+        headers = list(scan_headers(['METAR LPPT 011200Z NIL',
+                                     ' speci cor lppr 020304Z 34010KT']))
+        self.assertEqual(headers[0].location, 'LPPT')
+        self.assertEqual(headers[1],
+                         ('SPECI COR', 'LPPR', records.MetarObsTime(2, 3, 4)))
+        self.assertEqual(list(scan_headers([])), [])
+
+    @data(bytes, bytearray, memoryview)
+    def test_scan_header_bytes(self, kind):
+        for string in CORPUS[:50]:
+            self.assertEqual(scan_header(kind(string.encode('ascii'))),
+                             scan_header(string))
+        self.assertEqual(list(scan_headers([kind(b'speci lppt 020304Z')])),
+                         [('SPECI', 'LPPT', records.MetarObsTime(2, 3, 4))])
+
+    def test_p_generated_corpus(self):
+        for string in corpus.generate(500, seed=1):
+            expected = parse(string, engine='regex')
+            self.assertIn(expected.unmatched.strip(), ('', 'NOSIG'), string)
+            self.assertEqual(parse(string, engine='fast'), expected)
+
+    @data(*CORPUS)
+    def test_parse_result(self, string):
+        result = parse_result(string)
+        buf = string.strip().upper()
+        self.assertEqual(result.offset,
+                         len(buf) - len(result.metar.unmatched))
+        self.assertEqual(parse_result(string, engine='fast'), result)
+        try:
+            expected = parse(string)
+        except ValueError as error:
+            self.assertEqual(result.error, str(error))
+            self.assertEqual(result.parser, 'psky')
+        else:
+            self.assertEqual(result.metar, expected)
+            self.assertIsNone(result.error)
+            if expected.unmatched.split()[:1] in ([], ['NOSIG'], ['RMK'],
+                                                 ['TEMPO'], ['BECMG']):
+                self.assertIsNone(result.parser)
+
+    @unpack
+    @data(
+        ('METAR LPPT 011200Z 34010KT 9999 12/10 Q1013 NOSIG', None),
+        ('METAR LPPT 011200Z NIL', None),
+        ('METAR LPPT 011200Z 34010KT 9999 XX 12/10 Q1013', 'ptemperature'),
+        ('METAR LPPT 011200Z 34010KT 9999 12/10 Q1013 XX', 'psupplementary'),
+        ('METAR LPPT 011200Z NIL XX', None),
+        ('METAR LPPT 011200Z 34010KT 12/10 Q1013', 'psky'),
+    )
+    def test_parse_result_parser(self, string, parser):
+        result = parse_result(string)
+        self.assertEqual(result.parser, parser)
+        if parser == 'psky':
+            self.assertEqual(result.offset, 26)
+            self.assertEqual(result.metar.report.wind.speed, 10)
+            self.assertIsNone(result.metar.report.temperature)
+            self.assertRegex(result.error, 'Missing required field')
+
+    def test_parse_many_diagnose(self):
+        strings = (
+            'METAR LPPT 270130Z 34012KT 9999 FEW011 12/10 Q1013',
+            'METAR LPPT 191800Z 35015KT FEW040TCU 11/06 Q1016',
+        )
+        test = parse_many(strings, errors='diagnose')
+        self.assertEqual(test, [parse_result(string) for string in strings])
+        self.assertEqual(parse_many(strings, errors='diagnose', workers=1),
+                         test)
+        self.assertEqual(list(iter_file(os.path.join(
+            os.path.dirname(__file__), 'lppt.metars.txt'),
+                                        errors='diagnose'))[:3],
+                         [parse_result(string) for string in CORPUS[:3]])
+
+    def test_p_engine_unknown(self):
+        with self.assertRaisesRegexp(ValueError, 'Unknown engine'):
+            parse('METAR A000 010000Z NIL', engine='other')
+
+    @data('regex', 'fast')
+    def test_parse_many(self, engine):
+        test = parse_many(CORPUS[:10], engine=engine)
+
+        self.assertEqual(test, [parse(string) for string in CORPUS[:10]])
+
+    @data(
+        ('skip', 2),
+        ('collect', 3),
+    )
+    @unpack
+    def test_parse_many_errors(self, errors, lenght):
+        strings = (
+            'METAR LPPT 270130Z 34012KT 9999 FEW011 12/10 Q1013',
+            'METAR LPPT 191800Z 35015KT FEW040TCU 11/06 Q1016',
+            'METAR A000 010000Z NIL',
+        )
+        test = parse_many(strings, errors=errors)
+
+        self.assertEqual(len(test), lenght)
+        self.assertEqual(test[0].location, 'LPPT')
+        self.assertEqual(test[-1].location, 'A000')
+        if errors == 'collect':
+            self.assertIsInstance(test[1], records.ParseFailure)
+            self.assertEqual(test[1].index, 1)
+            self.assertEqual(test[1].string, strings[1])
+            self.assertRegex(test[1].error, 'Missing required field')
+
+    @data(
+        (1, 7),
+        (2, 1000),
+    )
+    @unpack
+    def test_parse_many_workers(self, workers, chunksize):
+        test = parse_many(CORPUS, errors='collect', workers=workers,
+                          chunksize=chunksize)
+
+        self.assertEqual(test, parse_many(CORPUS, errors='collect'))
+
+    def test_parse_many_workers_raise(self):
+        strings = CORPUS[:3] + (
+            'METAR LPPT 191800Z 35015KT FEW040TCU 11/06 Q1016',)
+        with self.assertRaises(ValueError):
+            parse_many(strings, workers=2, chunksize=2)
+
+    def test_parse_many_raise(self):
+        with self.assertRaises(ValueError):
+            parse_many(['METAR LPPT 191800Z 35015KT FEW040TCU 11/06 Q1016'])
+
+    def test_parse_many_errors_unknown(self):
+        with self.assertRaisesRegexp(ValueError, 'Unknown errors'):
+            parse_many([], errors='ignore')
+
+    @data((None, 'regex'), (2, 'fast'))
+    @unpack
+    def test_parse_chunks(self, workers, engine):
+        test = list(parse_chunks(CORPUS, errors='collect', engine=engine,
+                                 workers=workers, chunksize=100))
+
+        self.assertEqual([len(chunk) for chunk in test[:-1]],
+                         [100] * (len(test) - 1))
+        self.assertEqual([result for chunk in test for result in chunk],
+                         parse_many(CORPUS, errors='collect'))
+        with self.assertRaisesRegexp(ValueError, 'Unknown errors'):
+            parse_chunks([], errors='ignore')
+
+    @data(False, None)
+    def test_parse_columns(self, use_numpy):
+        strings = (
+            'METAR LPPT 270130Z 34012G25KT 9999 FEW011 12/M10 Q1013',
+            'METAR LPPT 191800Z 35015KT FEW040TCU 11/06 Q1016',
+            'METAR LPPR 010000Z AUTO VRB01KMH CAVOK 03/M04 Q1013',
+            'METAR A000 010000Z NIL',
+        )
+        test = parse_columns(strings, errors='skip', use_numpy=use_numpy)
+
+        self.assertEqual(list(test['location']), ['LPPT', 'LPPR', 'A000'])
+        self.assertEqual(list(test['day']), [27, 1, 1])
+        self.assertEqual(list(test['minute']), [30, 0, 0])
+        self.assertEqual(list(test['wind_direction']), [340, MISSING, MISSING])
+        self.assertEqual(list(test['wind_variable']), [0, 1, 0])
+        self.assertEqual(list(test['wind_speed']), [12, 1, MISSING])
+        self.assertEqual(list(test['wind_gust']), [25, MISSING, MISSING])
+        self.assertEqual(list(test['wind_unit']), ['KT', 'KMH', None])
+        self.assertEqual(list(test['cavok']), [0, 1, 0])
+        self.assertEqual(list(test['visibility']), [10000, MISSING, MISSING])
+        self.assertEqual(list(test['ceiling']), [MISSING, MISSING, MISSING])
+        self.assertEqual(list(test['air']), [12, 3, MISSING])
+        self.assertEqual(list(test['dewpoint']), [-10, -4, MISSING])
+        self.assertEqual(list(test['pressure']), [1013, 1013, MISSING])
+
+    def test_parse_columns_errors(self):
+        with self.assertRaises(ValueError):
+            parse_columns(['METAR LPPT 191800Z 35015KT FEW040TCU 11/06 Q1016'])
+        with self.assertRaises(ValueError):
+            parse_columns([], errors='collect')
+
+    @unpack
+    @data(*[(engine, kind) for engine in ('regex', 'fast')
+            for kind in (bytes, bytearray, memoryview)])
+    def test_parse_bytes(self, engine, kind):
+        for string in CORPUS[:200]:
+            encoded = kind(string.encode('ascii'))
+            try:
+                expected = parse(string, engine=engine)
+            except ValueError:
+                with self.assertRaises(ValueError):
+                    parse(encoded, engine=engine)
+                continue
+
+            self.assertEqual(parse(encoded, engine=engine), expected)
+            self.assertEqual(parse(encoded, engine=engine, upper=False),
+                             expected)
+
+    def test_parse_upper(self):
+        string = ' metar lppt 011200z 34010kt cavok 12/10 q1013 '
+
+        self.assertEqual(parse(string.encode('ascii')), parse(string.upper()))
+        self.assertEqual(parse(string, upper=False).location, 'lppt')
+        self.assertEqual(parse_result(string, upper=False).metar.location,
+                         'lppt')
+
+    @data(None, 2)
+    def test_parse_many_bytes(self, workers):
+        strings = [string.encode('ascii') for string in CORPUS[:50]]
+
+        test = parse_many(strings, errors='skip', workers=workers,
+                          chunksize=7, upper=False)
+
+        self.assertEqual(test, parse_many(CORPUS[:50], errors='skip'))
+        columns = parse_columns(strings, errors='skip', use_numpy=False,
+                                upper=False)
+        self.assertEqual(list(columns['location']),
+                         [metar.location for metar in test])
+
+    @data('regex', 'fast')
+    def test_parse_shared_codes(self, engine):
+        string = ('METAR COR LPPT 270130Z VRB//KT 1200 R03/P1500U +SHRA '
+                  'FEW011CB BKN020 12/M10 Q1013 WS RWY03')
+        first = parse(string, engine=engine)
+        second = parse(' '.join(string.split()), engine=engine)
+
+        self.assertIs(first.metartype, second.metartype)
+        self.assertIs(first.location, second.location)
+        for wind, other in zip(first.report.wind, second.report.wind):
+            if isinstance(wind, str):
+                self.assertIs(wind, other)
+        rvr, = first.report.sky.rvr
+        other, = second.report.sky.rvr
+        self.assertIs(rvr[0], other[0])
+        self.assertIs(rvr[1].modifier, other[1].modifier)
+        self.assertIs(rvr[1].tendency, other[1].tendency)
+        precipitation = first.report.sky.weather.precipitation
+        other = second.report.sky.weather.precipitation
+        self.assertIs(precipitation.intensity, other.intensity)
+        self.assertIs(precipitation.phenomena[0], other.phenomena[0])
+        for cloud, other in zip(first.report.sky.clouds,
+                                second.report.sky.clouds):
+            self.assertIs(cloud.amount, other.amount)
+            self.assertIs(cloud.type, other.type)
+        self.assertIs(first.report.supplementary.windshear[0],
+                      second.report.supplementary.windshear[0])
+
+    def test_parsecache(self):
+        cache = ParseCache(maxsize=2)
+        string = 'METAR LPPT 270130Z 34012KT 9999 FEW011 12/10 Q1013'
+
+        test = cache.parse(string)
+        self.assertEqual(test, parse(string))
+        self.assertIs(cache.parse(' %s ' % string.lower()), test)
+        self.assertEqual(cache.info(), (1, 1, 0, 1, 2))
+
+        cache.parse('METAR A000 010000Z NIL')
+        cache.parse('METAR A001 010000Z NIL')
+        self.assertEqual(cache.info(), (1, 3, 1, 2, 2))
+        self.assertIsNot(cache.parse(string), test)
+
+        cache.clear()
+        self.assertEqual(cache.info(), (0, 0, 0, 0, 2))
+
+    @data('regex', 'fast')
+    def test_parsecache_unmatched(self, engine):
+        cache = ParseCache(engine=engine)
+        string = 'METAR LPPT 270130Z 34012KT 9999 FEW011 12/10 Q1013 RMK  A  B'
+
+        test = cache.parse(string)
+        self.assertEqual(test, parse(string))
+        self.assertEqual(test.unmatched, ' RMK  A  B')
+        self.assertIs(cache.parse(' '.join(string.split())), test)
+
+    def test_parsecache_bytes(self):
+        cache = ParseCache()
+        string = 'METAR LPPT 270130Z 34012KT 9999 FEW011 12/10 Q1013'
+
+        test = cache.parse(string.encode('ascii'))
+        self.assertEqual(test, parse(string))
+        self.assertIs(cache.parse(bytearray(string.lower(), 'ascii')), test)
+        self.assertIs(cache.parse(memoryview(string.encode('ascii')),
+                                  upper=False), test)
+        self.assertEqual(cache.parse(string.lower(), upper=False).location,
+                         'lppt')
+        self.assertEqual(cache.info(), (2, 2, 0, 2, 4096))
+
+    def test_parsecache_lru(self):
+        cache = ParseCache(maxsize=2)
+        cache.parse('METAR A000 010000Z NIL')
+        cache.parse('METAR A001 010000Z NIL')
+        cache.parse('METAR A000 010000Z NIL')
+        cache.parse('METAR A002 010000Z NIL')
+
+        cache.parse('METAR A000 010000Z NIL')
+        self.assertEqual(cache.info().hits, 2)
+        cache.parse('METAR A001 010000Z NIL')
+        self.assertEqual(cache.info().hits, 2)
+
+    def test_parsecache_errors(self):
+        cache = ParseCache()
+        with self.assertRaises(ValueError):
+            cache.parse('METAR LPPT 191800Z 35015KT FEW040TCU 11/06 Q1016')
+        self.assertEqual(cache.info().size, 0)
+
+    def test_iter_file(self):
+        archive = (
+            b'METAR LPPT 010130Z 34003KT 9999\n'
+            b'  SCT022 10/07 Q1018=\n'
+            b'METAR LPPT 010100Z 32004KT 9999 FEW020 10/07 Q1018= '
+            b'METAR LPPO 010100Z NIL=\n'
+            b'\n'
+            b'LPPR 010100Z 32004KT 9999\n'
+            b'FEW020 10/07 Q1018\n'
+            b'METAR\n'
+            b'LPFR 010100Z 32004KT 9999 FEW020 10/07 Q1018\n'
+            b'\n'
+            b'SPECI LPPT 010130Z 34003KT 9999 SCT022 10/07 Q1018\n'
+        )
+        with tempfile.NamedTemporaryFile(suffix='.txt') as path:
+            path.write(archive)
+            path.flush()
+            test = list(iter_file(path.name))
+
+        self.assertEqual(test, [parse(string) for string in (
+            'METAR LPPT 010130Z 34003KT 9999 SCT022 10/07 Q1018',
+            'METAR LPPT 010100Z 32004KT 9999 FEW020 10/07 Q1018',
+            'METAR LPPO 010100Z NIL',
+            'LPPR 010100Z 32004KT 9999 FEW020 10/07 Q1018',
+            'METAR LPFR 010100Z 32004KT 9999 FEW020 10/07 Q1018',
+            'SPECI LPPT 010130Z 34003KT 9999 SCT022 10/07 Q1018',
+        )])
+
+    def test_iter_file_corpus(self):
+        path = os.path.join(os.path.dirname(__file__), 'lppt.metars.txt')
+        test = list(iter_file(path, errors='collect', engine='fast'))
+
+        self.assertEqual(test, parse_many(_corpus(), errors='collect'))
+
+    def test_iter_file_empty(self):
+        with tempfile.NamedTemporaryFile() as path:
+            self.assertEqual(list(iter_file(path.name)), [])
+
+    @unpack
+    @data(
+        ('METAR CORA 010000Z NIL', 'METAR', 'CORA'),
+        ('SPECI COR1 010000Z NIL', 'SPECI', 'COR1'),
+        ('METAR COR CORA 010000Z NIL', 'METAR COR', 'CORA'),
+    )
+    def test_p_location_cor(self, string, metartype, location):
+        for engine in ('regex', 'fast'):
+            test = parse(string, engine=engine)
+            self.assertEqual((test.metartype, test.location),
+                             (metartype, location))
+            self.assertEqual(test.reporttype, 'NIL')
+        self.assertEqual(scan_header(string),
+                         (metartype, location, records.MetarObsTime(1, 0, 0)))
+
+    def test_p_records(self):
+        test = parse('METAR LPPT 270130Z 34012KT 9999 FEW011 12/10 Q1013')
+
+        self.assertIs(type(test), records.Metar)
+        self.assertIs(type(test.report), records.Report)
+        self.assertIs(type(test.report.wind), records.Wind)
+        self.assertIs(type(test.report.sky.clouds[0]), records.Cloud)
+        self.assertFalse(hasattr(test, '__dict__'))
+
     @data(
         (
             'METAR LPPT 191800Z 35015KT FEW040TCU 11/06 Q1016',
@@ -60,10 +519,12 @@ class MetarTests(unittest.TestCase):
     @data(
         'METAR',
         'SPECI',
+        'METAR COR',
+        'SPECI COR',
     )
     @parser_test(ptype)
     def test_ptype(self, test):
-        self.assertIn(test, ('METAR', 'SPECI'))
+        self.assertIn(test, ('METAR', 'SPECI', 'METAR COR', 'SPECI COR'))
 
     @data(
         'A000',
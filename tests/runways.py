@@ -0,0 +1,122 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Aviation Weather
+
+Copyright (C) 2018  Pedro Rodrigues <prodrigues1990@gmail.com>
+
+This file is part of Aviation Weather.
+
+Aviation Weather is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, version 2 of the License.
+
+Aviation Weather is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Aviation Weather.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import os
+import tempfile
+import unittest
+from ddt import ddt
+from ddt import data
+from ddt import unpack
+
+from avweather.metar import parse
+from avweather.runways import Components, RunwayIndex
+
+RUNWAYS = (
+    ('LPPT', '03', 30),
+    ('LPPT', '21', 210),
+    ('LPPR', '17', 170),
+    ('LPPR', '35', 350),
+)
+
+@ddt
+class RunwayIndexTests(unittest.TestCase):
+
+    def setUp(self):
+        self.index = RunwayIndex(RUNWAYS)
+
+    @unpack
+    @data(
+        ('03010KT', ('03', 10, 0, None, None, None)),
+        ('21010KT', ('03', -10, 0, None, None, None)),
+        ('12020KT', ('03', 0, 20, None, None, None)),
+        ('30020KT', ('03', 0, -20, None, None, None)),
+        ('34010G20KT', ('03', 6, -8, 13, -15, None)),
+        ('34037KMH', ('03', 13, -15, None, None, None)),
+        ('09010KT 060V120', ('03', 5, 9, None, None, 10)),
+        ('34010G20KT 300V020', ('03', 6, -8, 13, -15, 20)),
+        ('03010KT 360V060', ('03', 10, 0, None, None, 5)),
+        ('VRB03KT', ('03', None, None, None, None, 3)),
+        ('99010KT', ('03', None, None, None, None, 10)),
+        ('99010G20KT', ('03', None, None, None, None, 20)),
+        ('03010KT 360V990', ('03', None, None, None, None, 10)),
+    )
+    def test_components(self, wind, expected):
+        metar = parse('METAR LPPT 011200Z %s 9999 12/10 Q1013' % wind)
+
+        test = self.index.components(metar)
+
+        self.assertEqual(test[0], Components(*expected))
+        self.assertEqual(len(test), 2)
+
+    @data(
+        'METAR EGLL 011200Z 34010KT 9999 12/10 Q1013',
+        'METAR LPPT 011200Z NIL',
+        'METAR LPPT 011200Z /////KT 9999 12/10 Q1013',
+    )
+    def test_components_none(self, string):
+        self.assertEqual(self.index.components(parse(string)), ())
+
+    def test_batch(self):
+        metars = [parse('METAR LPPT 011200Z 03010KT 9999 12/10 Q1013'),
+                  parse('METAR LPPR 011200Z 17010KT 9999 12/10 Q1013'),
+                  parse('METAR EGLL 011200Z 34010KT 9999 12/10 Q1013')]
+
+        test = self.index.batch(metars)
+
+        self.assertEqual([[(runway.designator, runway.headwind)
+                           for runway in components] for components in test],
+                         [[('03', 10), ('21', -10)],
+                          [('17', 10), ('35', -10)],
+                          []])
+
+    def test_batch_invalid_direction(self):
+        metars = [parse('METAR LPPT 011200Z 99010KT 9999 12/10 Q1013'),
+                  parse('METAR LPPT 011200Z 03010KT 9999 12/10 Q1013')]
+
+        test = self.index.batch(metars)
+
+        self.assertEqual([runway.headwind for runway in test[0]],
+                         [None, None])
+        self.assertEqual([runway.headwind for runway in test[1]], [10, -10])
+
+    def test_add(self):
+        self.index.add('lppt', '03', 210)
+        self.index.add('LPPT', '17', 170)
+
+        self.assertEqual(self.index.designators('LPPT'), ('03', '21', '17'))
+        test = self.index.components(
+            parse('METAR LPPT 011200Z 03010KT 9999 12/10 Q1013'))
+        self.assertEqual(test[0].headwind, -10)
+
+    def test_load(self):
+        with tempfile.NamedTemporaryFile('w', delete=False) as table:
+            table.write('icao,designator,heading\n'
+                        'LPPT,03,23\nLPPT,21,203.0\n\nLPPR,17,173\n')
+        try:
+            test = RunwayIndex.load(table.name)
+        finally:
+            os.remove(table.name)
+
+        self.assertEqual(len(test), 2)
+        self.assertIn('LPPR', test)
+        self.assertEqual(sorted(test.locations()), ['LPPR', 'LPPT'])
+        self.assertEqual(test.designators('LPPT'), ('03', '21'))
+        self.assertEqual(test.designators('EGLL'), ())
@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Aviation Weather
+
+Copyright (C) 2018  Pedro Rodrigues <prodrigues1990@gmail.com>
+
+This file is part of Aviation Weather.
+
+Aviation Weather is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, version 2 of the License.
+
+Aviation Weather is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Aviation Weather.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import io
+import json
+import unittest
+from unittest import mock
+
+from avweather import metar, serialize, taf
+from avweather.serialize import to_dict, to_json, write_ndjson
+from benchmarks import corpus
+
+REPORTS = metar.parse_many(corpus.generate(2000), errors='skip')
+
+def _asdict(value):
+    """Returns the plain form of value with recursive _asdict calls"""
+    if isinstance(value, tuple):
+        if hasattr(value, '_asdict'):
+            return dict((key, _asdict(item))
+                        for key, item in value._asdict().items())
+        return [_asdict(item) for item in value]
+    return value
+
+class SerializeTests(unittest.TestCase):
+
+    def test_to_dict(self):
+        for report in REPORTS:
+            self.assertEqual(to_dict(report), _asdict(report))
+
+    def test_to_dict_lazy(self):
+        string = ('METAR LPPT 011200Z 34010G25KT 300V020 4000 R03/1200U '
+                  '+SHRA BR FEW010 BKN020CB 12/10 Q1013 RERA WS RWY03 W15/S3')
+        lazy = metar.parse(string, lazy=True)
+
+        self.assertEqual(to_dict(lazy), _asdict(metar.parse(string)))
+
+    def test_to_dict_records(self):
+        failure = metar.parse_many(['METAR LPPT 011200Z 34010KT 12/10'],
+                                   errors='collect')[0]
+        result = metar.parse_result('METAR LPPT 011200Z 34010KT CAVOK')
+        forecast = taf.parse('TAF LPPT 121100Z 1212/1318 32012KT 9999 '
+                             'FEW020 BECMG 1218/1220 VRB03KT')
+
+        for record in (failure, result, forecast):
+            self.assertEqual(to_dict(record), _asdict(record))
+
+    def test_to_json(self):
+        for report in REPORTS[:200]:
+            test = to_json(report)
+
+            self.assertIsInstance(test, bytes)
+            self.assertEqual(json.loads(test.decode('utf-8')),
+                             _asdict(report))
+
+    def test_to_json_orjson(self):
+        orjson = mock.Mock()
+        orjson.dumps.return_value = b'{}'
+        with mock.patch.object(serialize, 'orjson', orjson):
+            self.assertEqual(to_json(REPORTS[0]), b'{}')
+        orjson.dumps.assert_called_once_with(to_dict(REPORTS[0]))
+
+    def test_write_ndjson(self):
+        output = io.BytesIO()
+
+        count = write_ndjson(iter(REPORTS[:25]), output, chunksize=10)
+
+        self.assertEqual(count, 25)
+        lines = output.getvalue().decode('utf-8').splitlines()
+        self.assertEqual([json.loads(line) for line in lines],
+                         [_asdict(report) for report in REPORTS[:25]])
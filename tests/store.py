@@ -0,0 +1,114 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Aviation Weather
+
+Copyright (C) 2018  Pedro Rodrigues <prodrigues1990@gmail.com>
+
+This file is part of Aviation Weather.
+
+Aviation Weather is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, version 2 of the License.
+
+Aviation Weather is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Aviation Weather.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import unittest
+from datetime import datetime, timedelta
+
+from avweather.metar import parse
+from avweather.store import MetarStore, observed
+from avweather.records import MetarObsTime
+
+NOW = datetime(2018, 3, 1, 12, 0)
+
+class MetarStoreTests(unittest.TestCase):
+
+    def test_observed(self):
+        self.assertEqual(observed(MetarObsTime(1, 11, 30), NOW),
+                         datetime(2018, 3, 1, 11, 30))
+        self.assertEqual(observed(MetarObsTime(28, 23, 30), NOW),
+                         datetime(2018, 2, 28, 23, 30))
+        self.assertEqual(observed(MetarObsTime(30, 23, 30), NOW),
+                         datetime(2018, 1, 30, 23, 30))
+        with self.assertRaises(ValueError):
+            observed(MetarObsTime(1, 25, 0), NOW)
+
+    def test_latest(self):
+        store = MetarStore()
+        store.insert('METAR LPPT 010030Z 34003KT 9999 FEW022 10/07 Q1018', NOW)
+        store.insert(parse('METAR LPPT 281200Z 34003KT CAVOK 10/07 Q1018'),
+                     NOW)
+        store.insert('METAR LPPR 010000Z 34003KT 9999 FEW022 10/07 Q1018', NOW)
+
+        self.assertEqual(store.latest('LPPT').time, (1, 0, 30))
+        self.assertEqual(store.observed('LPPT'), datetime(2018, 3, 1, 0, 30))
+        self.assertEqual([metar.time.day for metar in store.history('LPPT')],
+                         [28, 1])
+        self.assertEqual(store.latest('LPPR').time, (1, 0, 0))
+        self.assertIsNone(store.latest('LPFR'))
+        self.assertEqual(sorted(store.locations()), ['LPPR', 'LPPT'])
+        self.assertEqual(len(store), 2)
+
+    def test_cor(self):
+        store = MetarStore()
+        self.assertTrue(store.insert(
+            'METAR LPPT 010030Z 34003KT 9999 FEW022 10/07 Q1018', NOW))
+        self.assertFalse(store.insert(
+            'METAR LPPT 010030Z 34003KT 9999 FEW022 11/07 Q1018', NOW))
+        self.assertEqual(store.latest('LPPT').report.temperature.air, 10)
+
+        self.assertTrue(store.insert(
+            'METAR COR LPPT 010030Z 34003KT 9999 FEW022 12/07 Q1018', NOW))
+        self.assertEqual(store.latest('LPPT').metartype, 'METAR COR')
+        self.assertEqual(store.latest('LPPT').report.temperature.air, 12)
+        self.assertEqual(len(store.history('LPPT')), 1)
+
+        self.assertTrue(store.insert(
+            'SPECI LPPT 010030Z 34003KT 9999 FEW022 13/07 Q1018', NOW))
+        self.assertEqual(store.latest('LPPT').metartype, 'SPECI')
+        self.assertEqual(len(store.history('LPPT')), 2)
+
+    def test_history_size(self):
+        store = MetarStore(history=2)
+        for minute in (0, 30, 10):
+            store.insert('METAR LPPT 0100%02dZ 34003KT CAVOK 10/07 Q1018' %
+                         minute, NOW)
+
+        self.assertEqual([metar.time.minute
+                          for metar in store.history('LPPT')], [10, 30])
+
+    def test_history_size_older(self):
+        store = MetarStore(history=2)
+        for minute in (10, 30):
+            self.assertTrue(store.insert(
+                'METAR LPPT 0100%02dZ 34003KT CAVOK 10/07 Q1018' % minute,
+                NOW))
+
+        self.assertFalse(store.insert(
+            'METAR LPPT 010000Z 34003KT CAVOK 10/07 Q1018', NOW))
+        self.assertEqual([metar.time.minute
+                          for metar in store.history('LPPT')], [10, 30])
+
+    def test_evict(self):
+        store = MetarStore(max_age=timedelta(hours=1))
+        store.insert('METAR LPPT 010030Z 34003KT CAVOK 10/07 Q1018', NOW)
+        store.insert('METAR LPPT 011130Z 34003KT CAVOK 10/07 Q1018', NOW)
+        store.insert('METAR LPPR 010000Z 34003KT CAVOK 10/07 Q1018', NOW)
+
+        self.assertEqual(store.evict(NOW), 2)
+        self.assertNotIn('LPPR', store)
+        self.assertEqual(len(store.history('LPPT')), 1)
+        self.assertEqual(store.evict(NOW, max_age=timedelta(0)), 1)
+        self.assertEqual(len(store), 0)
+
+    def test_insert_errors(self):
+        store = MetarStore()
+        with self.assertRaises(ValueError):
+            store.insert('METAR LPPT 34003KT CAVOK 10/07 Q1018', NOW)
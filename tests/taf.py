@@ -0,0 +1,182 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Aviation Weather
+
+Copyright (C) 2018  Pedro Rodrigues <prodrigues1990@gmail.com>
+
+This file is part of Aviation Weather.
+
+Aviation Weather is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, version 2 of the License.
+
+Aviation Weather is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Aviation Weather.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import os
+import tempfile
+import unittest
+from ddt import ddt
+from ddt import data
+from ddt import unpack
+
+from avweather import taf
+from avweather.records import (
+    Cloud, Forecast, ForecastTemperature, MetarObsTime, ParseFailure,
+    Percipitation, Period, TafChange, Visibility, Weather, Wind)
+
+LPPT = ('TAF LPPT 121100Z 1212/1318 32012KT 9999 FEW020 TX22/1215Z '
+        'TN12/1306Z BECMG 1218/1220 VRB03KT TEMPO 1300/1306 4000 BR '
+        'PROB30 TEMPO 1306/1309 -SHRA BKN010CB FM131200 30015G25KT CAVOK')
+
+KJFK = ('TAF KJFK 121130Z 1212/1318 18010KT 6000 -RA OVC008 '
+        'PROB40 1214/1216 2000 TSRA BECMG 1216/1218 9999 NSW SCT020')
+
+def _forecast(**fields):
+    """Returns a Forecast with every field missing but the ones given"""
+    values = dict(wind=None, cavok=False, visibility=None, weather=None,
+                  nsw=False, clouds=(), verticalvis=None, clear=None,
+                  temperatures=())
+    values.update(fields)
+    return Forecast(**values)
+
+def _period(start, end):
+    """Returns a Period of two ddhh strings"""
+    return Period(MetarObsTime(int(start[:2]), int(start[2:]), 0),
+                  MetarObsTime(int(end[:2]), int(end[2:]), 0))
+
+@ddt
+class TafTests(unittest.TestCase):
+
+    def test_parse(self):
+        test = taf.parse(LPPT)
+
+        self.assertEqual(test.taftype, 'TAF')
+        self.assertEqual(test.location, 'LPPT')
+        self.assertEqual(test.time, MetarObsTime(12, 11, 0))
+        self.assertEqual(test.reporttype, None)
+        self.assertEqual(test.validity, _period('1212', '1318'))
+        self.assertEqual(test.forecast, _forecast(
+            wind=Wind(320, 12, None, 'KT', None, None),
+            visibility=Visibility(10000, False, None, None),
+            clouds=(Cloud('FEW', 20, None),),
+            temperatures=(
+                ForecastTemperature('TX', 22, MetarObsTime(12, 15, 0)),
+                ForecastTemperature('TN', 12, MetarObsTime(13, 6, 0)))))
+        self.assertEqual(test.changes, (
+            TafChange('BECMG', None, _period('1218', '1220'), _forecast(
+                wind=Wind('VRB', 3, None, 'KT', None, None))),
+            TafChange('TEMPO', None, _period('1300', '1306'), _forecast(
+                visibility=Visibility(4000, False, None, None),
+                weather=Weather(None, ('BR',), None))),
+            TafChange('TEMPO', 30, _period('1306', '1309'), _forecast(
+                weather=Weather(Percipitation('-', ('SHRA',)), (), None),
+                clouds=(Cloud('BKN', 10, 'CB'),))),
+            TafChange('FM', None, Period(MetarObsTime(13, 12, 0), None),
+                      _forecast(wind=Wind(300, 15, 25, 'KT', None, None),
+                                cavok=True))))
+        self.assertEqual(test.unmatched, '')
+
+    def test_parse_bytes(self):
+        test = taf.parse(memoryview(LPPT.lower().encode('ascii')))
+
+        self.assertEqual(test, taf.parse(LPPT))
+        self.assertEqual(taf.parse(LPPT.encode('ascii'), upper=False), test)
+        self.assertEqual(
+            taf.parse_many([KJFK.encode('ascii')], upper=False, workers=1),
+            [taf.parse(KJFK)])
+
+    def test_parse_prob_nsw(self):
+        test = taf.parse(KJFK)
+
+        self.assertEqual(test.changes[0].kind, 'PROB')
+        self.assertEqual(test.changes[0].probability, 40)
+        self.assertEqual(test.changes[0].forecast.weather,
+                         Weather(Percipitation('', ('TSRA',)), (), None))
+        self.assertEqual(test.changes[1].kind, 'BECMG')
+        self.assertTrue(test.changes[1].forecast.nsw)
+        self.assertEqual(test.changes[1].forecast.clouds,
+                         (Cloud('SCT', 20, None),))
+
+    @unpack
+    @data(
+        ('TAF AMD LPPT 121100Z 1212/1318 CNL', 'TAF AMD', 'CNL'),
+        ('TAF COR LPPT 121100Z NIL', 'TAF COR', 'NIL'),
+        ('taf lppt 121100z nil', 'TAF', 'NIL'),
+        ('TAF CORA 121100Z NIL', 'TAF', 'NIL'),
+        ('TAF AMD AMDX 121100Z 1212/1318 CNL', 'TAF AMD', 'CNL'),
+    )
+    def test_parse_no_forecast(self, string, taftype, reporttype):
+        test = taf.parse(string)
+
+        self.assertEqual(test.taftype, taftype)
+        self.assertEqual(test.reporttype, reporttype)
+        self.assertEqual(test.forecast, None)
+        self.assertEqual(test.changes, None)
+        self.assertEqual(test.unmatched, '')
+
+    def test_parse_negative_temperature(self):
+        test = taf.parse('TAF UUEE 121100Z 1212/1312 VRB02KT 9999 SKC '
+                         'TXM02/1212Z TNM10/1303Z')
+
+        self.assertEqual(test.forecast.clear, 'SKC')
+        self.assertEqual(test.forecast.temperatures, (
+            ForecastTemperature('TX', -2, MetarObsTime(12, 12, 0)),
+            ForecastTemperature('TN', -10, MetarObsTime(13, 3, 0))))
+
+    def test_parse_unmatched(self):
+        test = taf.parse(KJFK + ' XYZ')
+
+        self.assertEqual(len(test.changes), 2)
+        self.assertEqual(test.unmatched.strip(), 'XYZ')
+
+    def test_parse_missing_validity(self):
+        with self.assertRaisesRegexp(ValueError, 'validity'):
+            taf.parse('TAF LPPT 121100Z 32012KT 9999 FEW020')
+
+    @data('raise', 'skip', 'collect')
+    def test_parse_many(self, errors):
+        strings = [LPPT, 'TAF LPPT 121100Z 32012KT', KJFK]
+        if errors == 'raise':
+            with self.assertRaises(ValueError):
+                taf.parse_many(strings, errors)
+            return
+
+        test = taf.parse_many(strings, errors)
+
+        expected = [taf.parse(LPPT), taf.parse(KJFK)]
+        if errors == 'collect':
+            self.assertIsInstance(test[1], ParseFailure)
+            self.assertEqual(test[1].index, 1)
+            del test[1]
+        self.assertEqual(test, expected)
+
+    def test_parse_many_workers(self):
+        strings = [LPPT, KJFK] * 5
+
+        test = taf.parse_many(strings, workers=2, chunksize=3)
+
+        self.assertEqual(test, taf.parse_many(strings))
+
+    def test_parse_many_diagnose(self):
+        with self.assertRaises(ValueError):
+            taf.parse_many([LPPT], 'diagnose')
+
+    def test_iter_file(self):
+        wrap = LPPT.index(' BECMG')
+        text = (LPPT[:wrap] + '\n      ' + LPPT[wrap:] + '=\n' +
+                'TAF\nKJFK' + KJFK[8:] + '=\n')
+        with tempfile.NamedTemporaryFile('w', delete=False) as archive:
+            archive.write(text)
+        try:
+            test = list(taf.iter_file(archive.name))
+        finally:
+            os.remove(archive.name)
+
+        self.assertEqual(test, [taf.parse(LPPT), taf.parse(KJFK)])